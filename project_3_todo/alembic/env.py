@@ -5,20 +5,32 @@ from sqlalchemy import pool
 
 from alembic import context
 
+from app.core.config import SQLALCHEMY_DATABASE_URL
+from app.core.database import Base
+import app.models  # noqa: F401  (đăng ký các model vào Base.metadata)
+from app.models.todo_search import include_object
+
 # this is the Alembic Config object, which provides
 # access to the values within the .ini file in use.
 config = context.config
 
 # Interpret the config file for Python logging.
 # This line sets up loggers basically.
-if config.config_file_name is not None:
+# Không cấu hình lại logging khi được gọi từ app (giữ logger của uvicorn)
+if config.config_file_name is not None and config.attributes.get(
+    "configure_logger", True
+):
     fileConfig(config.config_file_name)
 
 # add your model's MetaData object here
 # for 'autogenerate' support
 # from myapp import mymodel
 # target_metadata = mymodel.Base.metadata
-target_metadata = None
+target_metadata = Base.metadata
+
+
+# URL lấy từ app config (DATABASE_URL); có thể ghi đè qua config.attributes
+database_url = config.attributes.get("url") or SQLALCHEMY_DATABASE_URL
 
 # other values from the config, defined by the needs of env.py,
 # can be acquired:
@@ -38,12 +50,13 @@ def run_migrations_offline() -> None:
     script output.
 
     """
-    url = config.get_main_option("sqlalchemy.url")
     context.configure(
-        url=url,
+        url=database_url,
         target_metadata=target_metadata,
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
+        render_as_batch=True,
+        include_object=include_object,
     )
 
     with context.begin_transaction():
@@ -57,19 +70,33 @@ def run_migrations_online() -> None:
     and associate a connection with the context.
 
     """
+    # Cho phép truyền sẵn connection (vd: lúc startup hoặc trong test)
+    connection = config.attributes.get("connection")
+    if connection is not None:
+        do_run_migrations(connection)
+        return
+
     connectable = engine_from_config(
-        config.get_section(config.config_ini_section, {}),
+        {"sqlalchemy.url": database_url},
         prefix="sqlalchemy.",
         poolclass=pool.NullPool,
     )
 
     with connectable.connect() as connection:
-        context.configure(
-            connection=connection, target_metadata=target_metadata
-        )
+        do_run_migrations(connection)
+
 
-        with context.begin_transaction():
-            context.run_migrations()
+def do_run_migrations(connection) -> None:
+    # render_as_batch: SQLite không hỗ trợ đầy đủ ALTER TABLE
+    context.configure(
+        connection=connection,
+        target_metadata=target_metadata,
+        render_as_batch=True,
+        include_object=include_object,
+    )
+
+    with context.begin_transaction():
+        context.run_migrations()
 
 
 if context.is_offline_mode():
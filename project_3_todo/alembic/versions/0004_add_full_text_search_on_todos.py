@@ -0,0 +1,79 @@
+"""add full-text search on todos
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-18 09:12:40.118204
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "0004"
+down_revision: Union[str, Sequence[str], None] = "0003"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# DDL được chép nguyên văn vào revision: migration đã phát hành không được
+# thay đổi theo app/models/todo_search.py
+SQLITE_CREATE = [
+    """CREATE VIRTUAL TABLE IF NOT EXISTS todos_fts USING fts5(
+        title, description, owner_id,
+        content='todos', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2'
+    )""",
+    """CREATE TRIGGER IF NOT EXISTS todos_fts_ai AFTER INSERT ON todos BEGIN
+        INSERT INTO todos_fts(rowid, title, description, owner_id)
+        VALUES (new.id, new.title, new.description, new.owner_id);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS todos_fts_ad AFTER DELETE ON todos BEGIN
+        INSERT INTO todos_fts(todos_fts, rowid, title, description, owner_id)
+        VALUES ('delete', old.id, old.title, old.description, old.owner_id);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS todos_fts_au AFTER UPDATE ON todos BEGIN
+        INSERT INTO todos_fts(todos_fts, rowid, title, description, owner_id)
+        VALUES ('delete', old.id, old.title, old.description, old.owner_id);
+        INSERT INTO todos_fts(rowid, title, description, owner_id)
+        VALUES (new.id, new.title, new.description, new.owner_id);
+    END""",
+    "INSERT INTO todos_fts(todos_fts) VALUES ('rebuild')",
+]
+
+SQLITE_DROP = [
+    "DROP TRIGGER IF EXISTS todos_fts_ai",
+    "DROP TRIGGER IF EXISTS todos_fts_ad",
+    "DROP TRIGGER IF EXISTS todos_fts_au",
+    "DROP TABLE IF EXISTS todos_fts",
+]
+
+POSTGRES_CREATE = [
+    """ALTER TABLE todos ADD COLUMN IF NOT EXISTS search_vector tsvector
+        GENERATED ALWAYS AS (
+            to_tsvector('simple', coalesce(title, '') || ' ' || coalesce(description, ''))
+        ) STORED""",
+    """CREATE INDEX IF NOT EXISTS ix_todos_search_vector
+        ON todos USING gin (search_vector)""",
+]
+
+POSTGRES_DROP = [
+    "DROP INDEX IF EXISTS ix_todos_search_vector",
+    "ALTER TABLE todos DROP COLUMN IF EXISTS search_vector",
+]
+
+
+def _execute(statements: dict[str, list[str]]) -> None:
+    connection = op.get_bind()
+    for statement in statements.get(connection.dialect.name, []):
+        connection.exec_driver_sql(statement)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    _execute({"sqlite": SQLITE_CREATE, "postgresql": POSTGRES_CREATE})
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    _execute({"sqlite": SQLITE_DROP, "postgresql": POSTGRES_DROP})
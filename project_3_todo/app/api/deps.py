@@ -2,22 +2,41 @@
 Dependencies for API routes
 """
 
-from typing import Annotated
+from typing import Annotated, Literal
 
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, Header, HTTPException, Request, Response, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import JWTError, jwt
 from sqlalchemy.orm import Session
 
-from app.core.config import ALGORITHM, SECRET_KEY
+from app.core.config import (
+    ALGORITHM,
+    RATE_LIMIT_MAX_KEYS,
+    READ_YOUR_WRITES_COOKIE,
+    READ_YOUR_WRITES_SECONDS,
+    SECRET_KEY,
+)
 
 # Import từ app structure
-from app.core.database import get_db
+from app.core.database import get_db, session_scope
+from app.core.idempotency import (
+    IDEMPOTENCY_HEADER,
+    IDEMPOTENCY_KEY_MAX_LENGTH,
+    REPLAYED_HEADER,
+    encode_response,
+    idempotency_store,
+    request_fingerprint,
+)
+from app.core.rate_limit import GCRARateLimiter
+from app.core.read_routing import cookie_is_sticky, read_your_writes
+from app.core.token_cache import token_cache
 from app.models.todo import Todos
 from app.models.user import Users
 
 # OAuth2 scheme for token authentication
 oauth2_bearer = OAuth2PasswordBearer(tokenUrl="auth/token")
+# Không bắt buộc token: dùng cho read/write routing
+oauth2_bearer_optional = OAuth2PasswordBearer(tokenUrl="auth/token", auto_error=False)
 
 
 # =============================================================================
@@ -25,16 +44,18 @@ oauth2_bearer = OAuth2PasswordBearer(tokenUrl="auth/token")
 # =============================================================================
 
 
-async def get_current_user(
-    token: Annotated[str, Depends(oauth2_bearer)],
-    db: Annotated[Session, Depends(get_db)],
-):
+def decode_access_token(token: str) -> dict:
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
 
+    # Token đã verify trước đó và chưa hết hạn => bỏ qua jwt.decode
+    cached_user = token_cache.get(token)
+    if cached_user is not None:
+        return dict(cached_user)
+
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
         username: str = payload.get("sub")
@@ -43,11 +64,19 @@ async def get_current_user(
 
         if username is None or user_id is None or user_role is None:
             raise credentials_exception
-        return {"username": username, "id": user_id, "role": user_role}
+        current_user = {"username": username, "id": user_id, "role": user_role}
+        # Chỉ cache token hợp lệ; entry hết hạn đúng tại exp của token
+        token_cache.set(token, current_user, payload.get("exp"))
+        return dict(current_user)
     except JWTError:
         raise credentials_exception
 
 
+async def get_current_user(token: Annotated[str, Depends(oauth2_bearer)]):
+    # Chỉ decode / đọc cache token: không mở session DB
+    return decode_access_token(token)
+
+
 async def get_current_active_user(
     current_user: Annotated[Users, Depends(get_current_user)],
 ):
@@ -61,6 +90,55 @@ async def get_current_active_user(
     return current_user
 
 
+# =============================================================================
+# READ / WRITE SPLIT DEPENDENCIES
+# =============================================================================
+
+
+def _optional_user_id(token: str | None) -> int | None:
+    if token is None:
+        return None
+    try:
+        return decode_access_token(token)["id"]
+    except HTTPException:
+        return None
+
+
+async def get_read_session(
+    request: Request,
+    token: Annotated[str | None, Depends(oauth2_bearer_optional)],
+):
+    """
+    Session chỉ đọc: replica, trừ khi user vừa ghi (read-your-writes)
+    """
+    sticky = read_your_writes.is_sticky(_optional_user_id(token)) or cookie_is_sticky(
+        request.cookies
+    )
+    async with session_scope(replica=not sticky) as db:
+        yield db
+
+
+async def get_write_session(
+    response: Response,
+    token: Annotated[str | None, Depends(oauth2_bearer_optional)],
+):
+    """
+    Session trên primary; đánh dấu để các lần đọc ngay sau đó về primary
+    """
+    user_id = _optional_user_id(token)
+    if user_id is not None:
+        sticky_until = read_your_writes.mark_write(user_id)
+        response.set_cookie(
+            READ_YOUR_WRITES_COOKIE,
+            str(int(sticky_until) + 1),
+            max_age=int(READ_YOUR_WRITES_SECONDS) + 1,
+            httponly=True,
+            samesite="lax",
+        )
+    async with session_scope() as db:
+        yield db
+
+
 # =============================================================================
 # AUTHORIZATION DEPENDENCIES
 # =============================================================================
@@ -158,46 +236,117 @@ def get_pagination_params(skip: int = 0, limit: int = 100):
     return {"skip": skip, "limit": limit}
 
 
+def get_cursor_pagination_params(
+    cursor: str | None = None,
+    limit: int = 100,
+    order_by: Literal["id", "priority"] = "id",
+):
+    """
+    Cursor (keyset) pagination parameters
+    """
+    if limit < 1 or limit > 1000:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Limit must be between 1 and 1000",
+        )
+    return {"cursor": cursor, "limit": limit, "order_by": order_by}
+
+
 # =============================================================================
 # RATE LIMITING DEPENDENCIES (Optional)
 # =============================================================================
 
-import time
-from collections import defaultdict
-
-from fastapi import Request
 
-# Simple in-memory rate limiting (for production, use Redis)
-request_counts = defaultdict(list)
+def _route_key(request: Request) -> str:
+    # Dùng template (vd: /todos/todo/{todo_id}) thay vì path thực tế
+    route = request.scope.get("route")
+    return getattr(route, "path", request.url.path)
 
 
-def rate_limit(max_requests: int = 100, window_seconds: int = 60):
-    """
-    Rate limiting dependency
+def rate_limit(max_requests: int = 100, window_seconds: int = 60, per_user=False):
     """
+    Rate limiting dependency (GCRA, O(1) state per key)
 
-    def check_rate_limit(request: Request):
-        client_ip = request.client.host
-        current_time = time.time()
-
-        # Clean old requests
-        request_counts[client_ip] = [
-            req_time
-            for req_time in request_counts[client_ip]
-            if current_time - req_time < window_seconds
-        ]
+    Key = route + IP, hoặc route + user id nếu per_user=True.
+    """
+    limiter = GCRARateLimiter(max_requests, window_seconds, RATE_LIMIT_MAX_KEYS)
 
-        # Check if limit exceeded
-        if len(request_counts[client_ip]) >= max_requests:
+    def enforce(key: str, response: Response):
+        result = limiter.hit(key)
+        if not result.allowed:
             raise HTTPException(
                 status_code=status.HTTP_429_TOO_MANY_REQUESTS,
                 detail=f"Rate limit exceeded. Max {max_requests} requests per {window_seconds} seconds.",
+                headers=result.headers(),
             )
+        response.headers.update(result.headers())
+
+    def check_rate_limit(request: Request, response: Response):
+        client_ip = request.client.host if request.client else "unknown"
+        enforce(f"{_route_key(request)}:ip:{client_ip}", response)
 
-        # Add current request
-        request_counts[client_ip].append(current_time)
+    def check_user_rate_limit(
+        request: Request,
+        response: Response,
+        current_user: Annotated[dict, Depends(get_current_user)],
+    ):
+        enforce(f"{_route_key(request)}:user:{current_user['id']}", response)
 
-    return check_rate_limit
+    check_rate_limit.limiter = limiter
+    check_user_rate_limit.limiter = limiter
+    return check_user_rate_limit if per_user else check_rate_limit
+
+
+# =============================================================================
+# IDEMPOTENCY DEPENDENCIES
+# =============================================================================
+
+
+class IdempotentCall:
+    """
+    Bọc thao tác ghi của route: không có Idempotency-Key => chạy bình thường;
+    có key => chạy một lần, các lần retry nhận lại response đã lưu.
+    """
+
+    def __init__(self, request: Request, response: Response, user_id: int, key):
+        self.request = request
+        self.response = response
+        self.user_id = user_id
+        self.key = key
+
+    async def run(self, call):
+        if self.key is None:
+            return await call()
+        request = self.request
+        route = request.scope["route"]
+        fingerprint = request_fingerprint(
+            request.method, route.path, request.url.query, await request.body()
+        )
+        body, replayed = await idempotency_store.run(
+            f"idempotency:{self.user_id}:{self.key}",
+            fingerprint,
+            call,
+            lambda result: encode_response(route.response_model, result),
+        )
+        if replayed:
+            self.response.headers[REPLAYED_HEADER] = "true"
+        return body
+
+
+async def get_idempotency(
+    request: Request,
+    response: Response,
+    current_user: Annotated[dict, Depends(get_current_user)],
+    idempotency_key: Annotated[
+        str | None,
+        Header(
+            alias=IDEMPOTENCY_HEADER,
+            min_length=1,
+            max_length=IDEMPOTENCY_KEY_MAX_LENGTH,
+        ),
+    ] = None,
+):
+    return IdempotentCall(request, response, current_user["id"], idempotency_key)
 
 
 # =============================================================================
@@ -206,11 +355,15 @@ def rate_limit(max_requests: int = 100, window_seconds: int = 60):
 
 __all__ = [
     "get_current_user",
+    "get_read_session",
+    "get_write_session",
     "get_current_active_user",
     "get_current_admin_user",
     "require_role",
     "validate_todo_exists",
     "validate_user_exists",
     "get_pagination_params",
+    "get_cursor_pagination_params",
     "rate_limit",
+    "get_idempotency",
 ]
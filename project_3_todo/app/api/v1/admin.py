@@ -1,26 +1,53 @@
 # chỉ xử lý input/output HTTP.
-from typing import Annotated
+from typing import Annotated, Literal
 
 from fastapi import APIRouter, Depends, HTTPException, Path, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 
-from app.core.database import get_db
-from app.services import admin_service
-from app.api.deps import get_current_user
+from app.schemas.todo import TodoPage, TodoStatsResponse
+from app.services import admin_service, async_admin_service
+from app.api.deps import (
+    get_current_user,
+    get_cursor_pagination_params,
+    get_read_session,
+    get_write_session,
+)
 
 router = APIRouter(prefix="/admin", tags=["admin"])
 
-DBDependency = Annotated[Session, Depends(get_db)]
+ReadDBDependency = Annotated[Session, Depends(get_read_session)]
+WriteDBDependency = Annotated[Session, Depends(get_write_session)]
 user_dependency = Annotated[dict, Depends(get_current_user)]
+pagination_dependency = Annotated[dict, Depends(get_cursor_pagination_params)]
 
 
-@router.get("/todo", status_code=status.HTTP_200_OK)
-async def read_all_todos_admin(user: user_dependency, db: DBDependency):
-    return admin_service.get_all_todos_as_admin(user, db)
+@router.get("/todo", status_code=status.HTTP_200_OK, response_model=TodoPage)
+async def read_all_todos_admin(
+    user: user_dependency, db: ReadDBDependency, page: pagination_dependency
+):
+    return await async_admin_service.get_todos_page_as_admin(user, db, **page)
+
+
+@router.get("/stats", status_code=status.HTTP_200_OK, response_model=TodoStatsResponse)
+async def read_todo_stats_admin(user: user_dependency, db: ReadDBDependency):
+    return await async_admin_service.get_todo_stats_as_admin(user, db)
+
+
+@router.get("/todo/export", status_code=status.HTTP_200_OK)
+async def export_todos_admin(
+    user: user_dependency, format: Literal["ndjson", "csv"] = "ndjson"
+):
+    # Stream từng batch, bộ nhớ không tăng theo số dòng
+    return StreamingResponse(
+        async_admin_service.stream_todos_as_admin(user, format),
+        media_type=admin_service.EXPORT_MEDIA_TYPES[format],
+        headers={"Content-Disposition": f"attachment; filename=todos.{format}"},
+    )
 
 
 @router.delete("/todo/{todo_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_todo_admin(
-    user: user_dependency, db: DBDependency, todo_id: int = Path(gt=0)
+    user: user_dependency, db: WriteDBDependency, todo_id: int = Path(gt=0)
 ):
-    admin_service.delete_todo_as_admin(user, todo_id, db)
+    await async_admin_service.delete_todo_as_admin(user, todo_id, db)
@@ -5,9 +5,15 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordRequestForm
 from sqlalchemy.orm import Session
 
-from app.core.database import get_db
-from app.schemas import CreateUserRequest, Token
-from app.services.auth_service import (
+from app.api.deps import get_read_session
+from app.core.database import get_session
+from app.schemas import (
+    CreateUserRequest,
+    CreateUserResponse,
+    Token,
+    UserListResponse,
+)
+from app.services.async_auth_service import (
     authenticate_user_and_get_token,
     get_all_users,
     register_user,
@@ -17,20 +23,24 @@ from app.services.auth_service import (
 router = APIRouter(prefix="/auth", tags=["auth"])
 
 
-@router.get("/users", status_code=status.HTTP_200_OK)
-def read_all_users(db: Session = Depends(get_db)):
-    return {"users": get_all_users(db)}
+@router.get("/users", status_code=status.HTTP_200_OK, response_model=UserListResponse)
+async def read_all_users(db: Session = Depends(get_read_session)):
+    return {"users": await get_all_users(db)}
 
 
-@router.post("", status_code=status.HTTP_201_CREATED)
-def create_user(create_user_request: CreateUserRequest, db: Session = Depends(get_db)):
-    user = register_user(create_user_request, db)
+@router.post("", status_code=status.HTTP_201_CREATED, response_model=CreateUserResponse)
+async def create_user(
+    create_user_request: CreateUserRequest, db: Session = Depends(get_session)
+):
+    user = await register_user(create_user_request, db)
     return {"message": "User created", "user": user}
 
 
 @router.post("/token", response_model=Token)
 async def login_for_access_token(
     form_data: Annotated[OAuth2PasswordRequestForm, Depends()],
-    db: Annotated[Session, Depends(get_db)],
+    db: Annotated[Session, Depends(get_session)],
 ):
-    return authenticate_user_and_get_token(form_data.username, form_data.password, db)
+    return await authenticate_user_and_get_token(
+        form_data.username, form_data.password, db
+    )
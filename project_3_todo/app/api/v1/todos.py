@@ -1,17 +1,62 @@
-from typing import Annotated
+from typing import Annotated, Literal
 
-from fastapi import APIRouter, Depends, HTTPException, Path, status
+import asyncio
+import os
+
+from fastapi import (
+    APIRouter,
+    BackgroundTasks,
+    Body,
+    Depends,
+    Header,
+    HTTPException,
+    Path,
+    Query,
+    Request,
+    Response,
+    WebSocket,
+    WebSocketDisconnect,
+    status,
+)
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 
-from app.core.database import get_db
-from app.schemas.todo import TodoRequest
-from app.services import todo_service
-from app.api.deps import get_current_user
+from app.core.config import EVENT_HEARTBEAT_SECONDS
+from app.core.database import ReplicaBehind, is_replica_session, session_scope
+from app.core.etag import etag_digest, etag_matches, make_etag
+from app.core.events import DROPPED, event_broker, sse_stream
+from app.schemas.todo import (
+    BULK_MAX_ITEMS,
+    TodoBulkItemResult,
+    TodoBulkUpdateItem,
+    TodoChangesPage,
+    TodoImportResponse,
+    TodoPage,
+    TodoRequest,
+    TodoResponse,
+)
+from app.services import (
+    async_todo_import_service,
+    async_todo_service,
+    todo_import_service,
+)
+from app.services.todo_service import search_terms, todo_channel
+from app.api.deps import (
+    IdempotentCall,
+    decode_access_token,
+    get_current_user,
+    get_cursor_pagination_params,
+    get_idempotency,
+    get_read_session,
+    get_write_session,
+)
 
 router = APIRouter(prefix="/todos", tags=["todos"])
 
 
-DBDependency = Annotated[Session, Depends(get_db)]
+# Đọc: replica (trừ khi vừa ghi), ghi: primary
+ReadDBDependency = Annotated[Session, Depends(get_read_session)]
+WriteDBDependency = Annotated[Session, Depends(get_write_session)]
 
 
 """
@@ -19,21 +64,227 @@ dict : là kiểu dữ liệu trả về mong muốn,
        chứa thông tin người dùng hiện tại, được lấy từ token JWT.
 """
 user_dependency = Annotated[dict, Depends(get_current_user)]
+pagination_dependency = Annotated[dict, Depends(get_cursor_pagination_params)]
+# Header Idempotency-Key (tùy chọn): retry không tạo bản ghi trùng
+idempotency_dependency = Annotated[IdempotentCall, Depends(get_idempotency)]
+
+
+if_none_match_header = Annotated[str | None, Header()]
+
 
+async def _primary_version(db, user_id: int) -> int:
+    if not is_replica_session(db):
+        return await async_todo_service.get_todos_version(db, user_id)
+    async with session_scope() as primary:
+        return await async_todo_service.get_todos_version(primary, user_id)
+
+
+async def read_with_etag(
+    db, user_id: int, response: Response, if_none_match: str | None, parts, read
+):
+    """
+    ETag dựa trên version của owner (luôn đọc trên primary): nếu client đã có bản
+    mới nhất thì trả 304 mà không cần đọc / serialize dòng todo nào.
+    read(session, version): đọc body (cache theo đúng version của ETag); cache
+    miss mà replica chưa bắt kịp version đó (ReplicaBehind) thì đọc trên
+    primary, để body luôn khớp với ETag.
+    """
+    version = await _primary_version(db, user_id)
+    etag = make_etag("todos", user_id, version, *parts)
+    if etag_matches(if_none_match, etag):
+        return Response(
+            status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag}
+        )
+    response.headers["ETag"] = etag
+    try:
+        return await read(db, version)
+    except ReplicaBehind:
+        async with session_scope() as primary:
+            return await read(primary, version)
 
-@router.get("/", status_code=status.HTTP_200_OK)
-async def read_all(db: DBDependency, user: user_dependency):
-    return todo_service.get_all_todos(db, user["id"])
 
+def bulk_body(item_type):
+    return Annotated[list[item_type], Body(min_length=1, max_length=BULK_MAX_ITEMS)]
 
-@router.get("/todo/{todo_id}", status_code=status.HTTP_200_OK)
-async def read_todo(db: DBDependency, user: user_dependency, todo_id: int = Path(gt=0)):
-    return todo_service.get_todo_by_id(db, user["id"], todo_id)
 
+@router.get("/", status_code=status.HTTP_200_OK, response_model=TodoPage)
+async def read_all(
+    db: ReadDBDependency,
+    user: user_dependency,
+    page: pagination_dependency,
+    response: Response,
+    if_none_match: if_none_match_header = None,
+):
+    return await read_with_etag(
+        db,
+        user["id"],
+        response,
+        if_none_match,
+        (),
+        lambda s, version: async_todo_service.get_todos_page(
+            s, user["id"], **page, version=version
+        ),
+    )
+
+
+@router.get("/search", status_code=status.HTTP_200_OK, response_model=TodoPage)
+async def search_todos(
+    db: ReadDBDependency,
+    user: user_dependency,
+    page: pagination_dependency,
+    response: Response,
+    q: str = Query(min_length=1, max_length=200),
+    if_none_match: if_none_match_header = None,
+):
+    # Kết quả sắp theo độ liên quan; order_by của pagination không áp dụng
+    return await read_with_etag(
+        db,
+        user["id"],
+        response,
+        if_none_match,
+        (
+            "search",
+            etag_digest(" ".join(search_terms(q)), page["limit"], page["cursor"]),
+        ),
+        lambda s, version: async_todo_service.search_todos(
+            s, user["id"], q, page["limit"], page["cursor"], version
+        ),
+    )
+
+
+@router.get("/changes", status_code=status.HTTP_200_OK, response_model=TodoChangesPage)
+async def read_changes(
+    db: ReadDBDependency,
+    user: user_dependency,
+    since: str | None = None,
+    limit: int = Query(default=500, ge=1, le=1000),
+):
+    # Delta sync: chỉ trả các todo thay đổi sau cursor since
+    return await async_todo_service.get_todo_changes(db, user["id"], since, limit)
+
+
+@router.post(
+    "/imports", status_code=status.HTTP_202_ACCEPTED, response_model=TodoImportResponse
+)
+async def create_import(
+    request: Request,
+    response: Response,
+    background_tasks: BackgroundTasks,
+    db: WriteDBDependency,
+    user: user_dependency,
+    format: Literal["jsonl", "csv"] | None = None,
+):
+    """
+    Body là nội dung file (JSONL: mỗi dòng một todo; CSV: có dòng header).
+    File được ghi ra đĩa theo stream rồi import ở background;
+    theo dõi tiến độ qua GET /todos/imports/{id}.
+    """
+    import_format = todo_import_service.resolve_import_format(
+        format, request.headers.get("content-type")
+    )
+    path, size = await todo_import_service.spool_upload(request.stream())
+    try:
+        job = await async_todo_import_service.create_import(
+            db, user["id"], import_format, size
+        )
+    except BaseException:
+        os.unlink(path)
+        raise
+    background_tasks.add_task(todo_import_service.run_import, job["id"], path)
+    response.headers["Location"] = f"/todos/imports/{job['id']}"
+    return job
+
+
+@router.get(
+    "/imports/{import_id}",
+    status_code=status.HTTP_200_OK,
+    response_model=TodoImportResponse,
+)
+async def read_import(
+    db: ReadDBDependency,
+    user: user_dependency,
+    import_id: int = Path(gt=0),
+    errors_after: int = Query(default=0, ge=0),
+    errors_limit: int = Query(default=100, ge=0, le=1000),
+):
+    return await async_todo_import_service.get_import(
+        db, user["id"], import_id, errors_after, errors_limit
+    )
 
-@router.post("/todo", status_code=status.HTTP_201_CREATED)
+
+@router.get("/stream", status_code=status.HTTP_200_OK)
+async def stream_todo_events(user: user_dependency):
+    # Thay cho polling GET /todos/: event created / updated / deleted của owner
+    subscription = event_broker.subscribe(todo_channel(user["id"]))
+    return StreamingResponse(
+        sse_stream(subscription, EVENT_HEARTBEAT_SECONDS),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.websocket("/ws")
+async def todo_events_websocket(websocket: WebSocket, token: str | None = None):
+    # Trình duyệt không gửi được header Authorization cho WebSocket => ?token=
+    try:
+        user = decode_access_token(token or "")
+    except HTTPException:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
+
+    await websocket.accept()
+    subscription = event_broker.subscribe(todo_channel(user["id"]))
+    # Client đóng kết nối => receive() kết thúc, dừng gửi
+    disconnected = asyncio.create_task(websocket.receive())
+    try:
+        while True:
+            next_event = asyncio.create_task(subscription.get())
+            done, _ = await asyncio.wait(
+                {next_event, disconnected}, return_when=asyncio.FIRST_COMPLETED
+            )
+            if disconnected in done:
+                next_event.cancel()
+                return
+            event = next_event.result()
+            await websocket.send_json(event)
+            if event is DROPPED:
+                await websocket.close()
+                return
+    except WebSocketDisconnect:
+        pass
+    finally:
+        disconnected.cancel()
+        subscription.close()
+
+
+@router.get(
+    "/todo/{todo_id}", status_code=status.HTTP_200_OK, response_model=TodoResponse
+)
+async def read_todo(
+    db: ReadDBDependency,
+    user: user_dependency,
+    response: Response,
+    todo_id: int = Path(gt=0),
+    if_none_match: if_none_match_header = None,
+):
+    return await read_with_etag(
+        db,
+        user["id"],
+        response,
+        if_none_match,
+        (todo_id,),
+        lambda s, version: async_todo_service.get_todo_by_id(
+            s, user["id"], todo_id, version
+        ),
+    )
+
+
+@router.post("/todo", status_code=status.HTTP_201_CREATED, response_model=TodoResponse)
 async def create_todo(
-    db: DBDependency, todo_request: TodoRequest, user: user_dependency
+    db: WriteDBDependency,
+    todo_request: TodoRequest,
+    user: user_dependency,
+    idempotency: idempotency_dependency,
 ):
     # if user is None:
     #     raise HTTPException(status_code=401, detail="Authentication failed")
@@ -44,21 +295,65 @@ async def create_todo(
     # if not todo_request.title:
     #     raise HTTPException(status_code=400, detail="Title is required")
     #  => pydantic sẽ tự động kiểm tra dữ liệu đầu vào
-    return todo_service.create_todo(db, user["id"], todo_request)
+    return await idempotency.run(
+        lambda: async_todo_service.create_todo(db, user["id"], todo_request)
+    )
 
 
 @router.put("/todo/{todo_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def update_todo(
-    db: DBDependency,
+    db: WriteDBDependency,
     user: user_dependency,
     todo_id: int = Path(gt=0),
     todo_request: TodoRequest = Depends(),
 ):
-    todo_service.update_todo(db, user["id"], todo_id, todo_request)
+    await async_todo_service.update_todo(db, user["id"], todo_id, todo_request)
 
 
 @router.delete("/todo/{todo_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_todo(
-    db: DBDependency, user: user_dependency, todo_id: int = Path(gt=0)
+    db: WriteDBDependency, user: user_dependency, todo_id: int = Path(gt=0)
+):
+    await async_todo_service.delete_todo(db, user["id"], todo_id)
+
+
+@router.post(
+    "/bulk", status_code=status.HTTP_201_CREATED, response_model=list[TodoResponse]
+)
+async def bulk_create_todos(
+    db: WriteDBDependency,
+    user: user_dependency,
+    todo_requests: bulk_body(TodoRequest),
+    idempotency: idempotency_dependency,
+):
+    return await idempotency.run(
+        lambda: async_todo_service.bulk_create_todos(db, user["id"], todo_requests)
+    )
+
+
+@router.put(
+    "/bulk", status_code=status.HTTP_200_OK, response_model=list[TodoBulkItemResult]
+)
+async def bulk_update_todos(
+    db: WriteDBDependency,
+    user: user_dependency,
+    todo_requests: bulk_body(TodoBulkUpdateItem),
+    idempotency: idempotency_dependency,
+):
+    return await idempotency.run(
+        lambda: async_todo_service.bulk_update_todos(db, user["id"], todo_requests)
+    )
+
+
+@router.delete(
+    "/bulk", status_code=status.HTTP_200_OK, response_model=list[TodoBulkItemResult]
+)
+async def bulk_delete_todos(
+    db: WriteDBDependency,
+    user: user_dependency,
+    todo_ids: bulk_body(int),
+    idempotency: idempotency_dependency,
 ):
-    todo_service.delete_todo(db, user["id"], todo_id)
+    return await idempotency.run(
+        lambda: async_todo_service.bulk_delete_todos(db, user["id"], todo_ids)
+    )
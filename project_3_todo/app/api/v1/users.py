@@ -3,25 +3,39 @@ from typing import Annotated
 from fastapi import APIRouter, Depends, status
 from sqlalchemy.orm import Session
 
-from app.core.database import get_db
-from app.schemas import UserVerification
-from app.services import user_service
-from app.api.deps import get_current_user
+from app.schemas import UserResponse, UserVerification
+from app.services import async_user_service
+from app.api.deps import (
+    IdempotentCall,
+    get_current_user,
+    get_idempotency,
+    get_read_session,
+    get_write_session,
+)
 
 router = APIRouter(prefix="/user", tags=["user"])
 
 
-DBDependency = Annotated[Session, Depends(get_db)]
+ReadDBDependency = Annotated[Session, Depends(get_read_session)]
+WriteDBDependency = Annotated[Session, Depends(get_write_session)]
 user_dependency = Annotated[dict, Depends(get_current_user)]
+idempotency_dependency = Annotated[IdempotentCall, Depends(get_idempotency)]
 
 
-@router.get("/", status_code=status.HTTP_200_OK)
-async def get_user(user: user_dependency, db: DBDependency):
-    return user_service.get_user_by_id(user["id"], db)
+@router.get("/", status_code=status.HTTP_200_OK, response_model=UserResponse)
+async def get_user(user: user_dependency, db: ReadDBDependency):
+    return await async_user_service.get_user_by_id(user["id"], db)
 
 
 @router.put("/password", status_code=status.HTTP_204_NO_CONTENT)
 async def change_password(
-    user: user_dependency, db: DBDependency, user_verification: UserVerification
+    user: user_dependency,
+    db: WriteDBDependency,
+    user_verification: UserVerification,
+    idempotency: idempotency_dependency,
 ):
-    user_service.change_user_password(user["id"], user_verification, db)
+    await idempotency.run(
+        lambda: async_user_service.change_user_password(
+            user["id"], user_verification, db
+        )
+    )
@@ -0,0 +1,147 @@
+"""
+Cache backend dùng chung: LRU + TTL trong process, hoặc Redis.
+Giá trị lưu trong cache phải serialize được thành JSON.
+"""
+
+import json
+import threading
+import time
+from collections import OrderedDict
+
+
+class CacheBackend:
+    # True nếu mỗi thao tác là IO mạng (không được gọi trực tiếp trên event loop)
+    blocking = False
+
+    def get(self, key: str):
+        raise NotImplementedError
+
+    def set(self, key: str, value, ttl: float):
+        raise NotImplementedError
+
+    def delete(self, *keys: str):
+        raise NotImplementedError
+
+    def clear(self):
+        raise NotImplementedError
+
+
+class NullCache(CacheBackend):
+    def get(self, key: str):
+        return None
+
+    def set(self, key: str, value, ttl: float):
+        pass
+
+    def delete(self, *keys: str):
+        pass
+
+    def clear(self):
+        pass
+
+
+class MemoryCache(CacheBackend):
+    """
+    LRU có giới hạn kích thước, mỗi entry có TTL riêng.
+    """
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self._entries: OrderedDict[str, tuple[float, object]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value, ttl: float):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def delete(self, *keys: str):
+        with self._lock:
+            for key in keys:
+                self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+class RedisCache(CacheBackend):
+    """
+    Backend dùng giao thức Redis. client: bất kỳ object nào có API giống
+    redis-py (get / set(ex=) / delete / flushdb).
+    """
+
+    blocking = True
+
+    def __init__(self, client, prefix: str = "todoapp:"):
+        self.client = client
+        self.prefix = prefix
+
+    def get(self, key: str):
+        raw = self.client.get(self.prefix + key)
+        return None if raw is None else json.loads(raw)
+
+    def set(self, key: str, value, ttl: float):
+        self.client.set(self.prefix + key, json.dumps(value), ex=max(1, int(ttl)))
+
+    def delete(self, *keys: str):
+        if keys:
+            self.client.delete(*[self.prefix + key for key in keys])
+
+    def clear(self):
+        self.client.flushdb()
+
+
+def create_cache_backend(kind: str, max_size: int, redis_url: str) -> CacheBackend:
+    if kind == "none":
+        return NullCache()
+    if kind == "redis":
+        try:
+            import redis
+        except ImportError as exc:
+            raise RuntimeError(
+                "Cache backend 'redis' requires the redis package"
+            ) from exc
+        return RedisCache(redis.Redis.from_url(redis_url))
+    return MemoryCache(max_size)
+
+
+class CacheStats:
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def record(self, hit: bool):
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def reset(self):
+        with self._lock:
+            self.hits = 0
+            self.misses = 0
+
+    def as_dict(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+        }
@@ -0,0 +1,114 @@
+import os
+from datetime import timedelta
+
+# Tạo secret key: openssl rand -hex 32
+SECRET_KEY = os.getenv(
+    "SECRET_KEY", "197b2c37c391bed93fe80344fe73b806947a65e36206e05a1a23c2fa12702fe3"
+)
+ALGORITHM = os.getenv("ALGORITHM", "HS256")
+ACCESS_TOKEN_EXPIRE_DELTA = timedelta(
+    minutes=int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", "20"))
+)
+
+SQLALCHEMY_DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./todosapp.db")
+# Replica chỉ đọc; không đặt thì đọc từ primary
+SQLALCHEMY_REPLICA_DATABASE_URL = os.getenv("DATABASE_REPLICA_URL") or None
+
+# "sync": Session chạy trong threadpool
+# "async": AsyncSession (aiosqlite / asyncpg), không chặn event loop
+DB_MODE = os.getenv("DB_MODE", "sync").lower()
+
+# Cache claims của JWT đã verify (key = sha256 của token)
+TOKEN_CACHE_MAX_SIZE = int(os.getenv("TOKEN_CACHE_MAX_SIZE", "10000"))
+# Giới hạn thời gian sống của entry, kể cả khi token có exp xa hơn
+TOKEN_CACHE_MAX_TTL_SECONDS = int(os.getenv("TOKEN_CACHE_MAX_TTL_SECONDS", "300"))
+
+# Executor riêng cho bcrypt (mỗi lần hash/verify tốn ~100-300 ms CPU)
+HASH_EXECUTOR = os.getenv("HASH_EXECUTOR", "thread").lower()  # thread | process
+HASH_WORKERS = int(os.getenv("HASH_WORKERS", str(min(4, os.cpu_count() or 1))))
+# Số job (đang chạy + đang chờ) tối đa; vượt quá => 503
+HASH_MAX_PENDING = int(os.getenv("HASH_MAX_PENDING", "64"))
+
+# Chạy "alembic upgrade head" khi app khởi động
+RUN_MIGRATIONS_ON_STARTUP = os.getenv("RUN_MIGRATIONS_ON_STARTUP", "1") == "1"
+
+# Cache đọc todo theo owner: "memory" (LRU trong process), "redis" hoặc "none"
+TODO_CACHE_BACKEND = os.getenv("TODO_CACHE_BACKEND", "memory").lower()
+TODO_CACHE_TTL_SECONDS = int(os.getenv("TODO_CACHE_TTL_SECONDS", "60"))
+TODO_CACHE_MAX_SIZE = int(os.getenv("TODO_CACHE_MAX_SIZE", "10000"))
+REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379/0")
+
+# Số key (route + IP/user) tối đa mà mỗi rate limiter giữ trong bộ nhớ
+RATE_LIMIT_MAX_KEYS = int(os.getenv("RATE_LIMIT_MAX_KEYS", "100000"))
+
+# Thu thập metrics (Prometheus) cho mỗi request và mỗi query
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "1") == "1"
+
+# Slow-query log + phát hiện N+1 (opt-in)
+QUERY_LOG_ENABLED = os.getenv("QUERY_LOG_ENABLED", "0") == "1"
+SLOW_QUERY_THRESHOLD_MS = float(os.getenv("SLOW_QUERY_THRESHOLD_MS", "100"))
+# Cùng một dạng statement chạy quá số lần này trong một request => cảnh báo N+1
+N_PLUS_ONE_THRESHOLD = int(os.getenv("N_PLUS_ONE_THRESHOLD", "5"))
+
+# Engine profile: "default" (mặc định của SQLAlchemy) hoặc "tuned"
+DB_PROFILE = os.getenv("DB_PROFILE", "default")
+# SQLite (profile tuned)
+SQLITE_JOURNAL_MODE = os.getenv("SQLITE_JOURNAL_MODE", "WAL")
+SQLITE_SYNCHRONOUS = os.getenv("SQLITE_SYNCHRONOUS", "NORMAL")
+SQLITE_MMAP_SIZE = int(os.getenv("SQLITE_MMAP_SIZE", str(256 * 1024 * 1024)))
+# Giá trị âm = KiB (-64000 ~ 64MB)
+SQLITE_CACHE_SIZE = int(os.getenv("SQLITE_CACHE_SIZE", "-64000"))
+SQLITE_BUSY_TIMEOUT_MS = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000"))
+SQLITE_TEMP_STORE = os.getenv("SQLITE_TEMP_STORE", "MEMORY")
+# Chu kỳ chạy wal_checkpoint + optimize (0 = tắt)
+SQLITE_MAINTENANCE_INTERVAL_SECONDS = float(
+    os.getenv("SQLITE_MAINTENANCE_INTERVAL_SECONDS", "300")
+)
+# Postgres (profile tuned)
+POSTGRES_STATEMENT_TIMEOUT_MS = int(os.getenv("POSTGRES_STATEMENT_TIMEOUT_MS", "5000"))
+POSTGRES_LOCK_TIMEOUT_MS = int(os.getenv("POSTGRES_LOCK_TIMEOUT_MS", "2000"))
+POSTGRES_IDLE_IN_TRANSACTION_TIMEOUT_MS = int(
+    os.getenv("POSTGRES_IDLE_IN_TRANSACTION_TIMEOUT_MS", "60000")
+)
+POSTGRES_POOL_RECYCLE_SECONDS = int(os.getenv("POSTGRES_POOL_RECYCLE_SECONDS", "1800"))
+
+# Connection pool (QueuePool) cho engine chính
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+DB_POOL_TIMEOUT_SECONDS = float(os.getenv("DB_POOL_TIMEOUT_SECONDS", "30"))
+# -1 = không recycle
+DB_POOL_RECYCLE_SECONDS = int(os.getenv("DB_POOL_RECYCLE_SECONDS", "-1"))
+DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "0") == "1"
+# Mở sẵn DB_POOL_SIZE connection trong lifespan trước khi nhận traffic
+DB_POOL_PREWARM = os.getenv("DB_POOL_PREWARM", "1") == "1"
+
+# Read-your-writes: sau khi ghi, đọc của user quay về primary trong N giây
+READ_YOUR_WRITES_SECONDS = float(os.getenv("READ_YOUR_WRITES_SECONDS", "5"))
+READ_YOUR_WRITES_MAX_USERS = int(os.getenv("READ_YOUR_WRITES_MAX_USERS", "10000"))
+# Cookie mang mốc thời gian, để stickiness còn hiệu lực giữa các worker
+READ_YOUR_WRITES_COOKIE = os.getenv("READ_YOUR_WRITES_COOKIE", "rw_primary_until")
+
+# Pub/sub cho change feed (/todos/stream, /todos/ws)
+# "memory": trong process; "redis": fan-out giữa nhiều worker qua Redis pub/sub
+EVENT_BROKER_BACKEND = os.getenv("EVENT_BROKER_BACKEND", "memory").lower()
+# Số event tối đa chờ gửi cho mỗi subscriber; đầy => ngắt subscriber chậm
+EVENT_QUEUE_SIZE = int(os.getenv("EVENT_QUEUE_SIZE", "100"))
+EVENT_HEARTBEAT_SECONDS = float(os.getenv("EVENT_HEARTBEAT_SECONDS", "15"))
+
+# Change log cho delta sync: giữ entry trong N giờ, cũ hơn sẽ bị compact
+TODO_CHANGES_RETENTION_HOURS = float(os.getenv("TODO_CHANGES_RETENTION_HOURS", "168"))
+
+# Import todo hàng loạt (/todos/imports): file upload được ghi ra đĩa rồi xử lý
+# ở background, mỗi chunk là một transaction
+IMPORT_CHUNK_SIZE = int(os.getenv("IMPORT_CHUNK_SIZE", "2000"))
+IMPORT_MAX_BYTES = int(os.getenv("IMPORT_MAX_BYTES", str(1024 * 1024 * 1024)))
+# Chỉ lưu N lỗi đầu tiên cho mỗi import, phần còn lại chỉ được đếm
+IMPORT_MAX_ERRORS = int(os.getenv("IMPORT_MAX_ERRORS", "1000"))
+# Thư mục chứa file upload đang chờ xử lý (mặc định: thư mục tạm của hệ thống)
+IMPORT_SPOOL_DIR = os.getenv("IMPORT_SPOOL_DIR") or None
+
+# Idempotency-Key cho các route ghi: "memory" (LRU + TTL trong process) hoặc
+# "redis" (dùng chung giữa các worker, REDIS_URL)
+IDEMPOTENCY_BACKEND = os.getenv("IDEMPOTENCY_BACKEND", "memory").lower()
+IDEMPOTENCY_TTL_SECONDS = float(os.getenv("IDEMPOTENCY_TTL_SECONDS", "86400"))
+IDEMPOTENCY_MAX_KEYS = int(os.getenv("IDEMPOTENCY_MAX_KEYS", "10000"))
@@ -0,0 +1,195 @@
+from contextlib import asynccontextmanager
+
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import declarative_base, sessionmaker
+from sqlalchemy.util.concurrency import await_only, in_greenlet
+
+from app.core import query_log
+from app.core.config import (
+    DB_MODE,
+    DB_PROFILE,
+    QUERY_LOG_ENABLED,
+    SQLALCHEMY_DATABASE_URL,
+    SQLALCHEMY_REPLICA_DATABASE_URL,
+)
+from app.core.engine_profile import apply_engine_profile, get_engine_profile
+from app.core.pool import pool_kwargs
+
+# Driver async tương ứng với từng driver sync
+ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "postgresql": "postgresql+asyncpg",
+}
+
+
+def to_async_url(url: str) -> str:
+    parsed = make_url(url)
+    backend = parsed.get_backend_name()
+    if backend not in ASYNC_DRIVERS:
+        raise ValueError(f"No async driver configured for '{backend}'")
+    return parsed.set(drivername=ASYNC_DRIVERS[backend]).render_as_string(
+        hide_password=False
+    )
+
+
+def create_profiled_engine(url: str, profile_name: str = DB_PROFILE):
+    profile = get_engine_profile(url, profile_name)
+    profiled_engine = create_engine(
+        url, **{**pool_kwargs(url), **profile.engine_kwargs}
+    )
+    apply_engine_profile(profiled_engine, profile)
+    return profiled_engine
+
+
+engine = create_profiled_engine(SQLALCHEMY_DATABASE_URL)
+SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+# Engine chỉ đọc; không cấu hình replica thì dùng chung engine primary
+replica_engine = (
+    create_profiled_engine(SQLALCHEMY_REPLICA_DATABASE_URL)
+    if SQLALCHEMY_REPLICA_DATABASE_URL
+    else engine
+)
+ReplicaSessionLocal = sessionmaker(
+    autocommit=False, autoflush=False, bind=replica_engine
+)
+
+# Slow-query log / N+1 detector (opt-in)
+if QUERY_LOG_ENABLED:
+    query_log.install()
+
+Base = declarative_base()
+
+# Engine async chỉ được tạo khi cần, để chế độ sync không phụ thuộc vào
+# aiosqlite / asyncpg
+async_engine = None
+AsyncSessionLocal = None
+async_replica_engine = None
+AsyncReplicaSessionLocal = None
+
+
+def _create_async_sessionmaker(url: str):
+    async_url = to_async_url(url)
+    profile = get_engine_profile(url, DB_PROFILE)
+    created_engine = create_async_engine(
+        async_url,
+        **{**pool_kwargs(async_url, is_async=True), **profile.engine_kwargs},
+    )
+    apply_engine_profile(created_engine.sync_engine, profile)
+    # expire_on_commit=False: object trả về vẫn đọc được sau commit mà không
+    # cần thêm một lần IO ngoài greenlet
+    return created_engine, async_sessionmaker(
+        created_engine, autoflush=False, expire_on_commit=False
+    )
+
+
+def get_async_sessionmaker() -> async_sessionmaker:
+    global async_engine, AsyncSessionLocal
+    if AsyncSessionLocal is None:
+        async_engine, AsyncSessionLocal = _create_async_sessionmaker(
+            SQLALCHEMY_DATABASE_URL
+        )
+    return AsyncSessionLocal
+
+
+def get_async_replica_sessionmaker() -> async_sessionmaker:
+    global async_replica_engine, AsyncReplicaSessionLocal
+    if not SQLALCHEMY_REPLICA_DATABASE_URL:
+        return get_async_sessionmaker()
+    if AsyncReplicaSessionLocal is None:
+        async_replica_engine, AsyncReplicaSessionLocal = _create_async_sessionmaker(
+            SQLALCHEMY_REPLICA_DATABASE_URL
+        )
+    return AsyncReplicaSessionLocal
+
+
+def get_db():
+    db = SessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+async def get_async_db():
+    async with get_async_sessionmaker()() as db:
+        yield db
+
+
+def get_replica_db():
+    db = ReplicaSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+async def get_async_replica_db():
+    async with get_async_replica_sessionmaker()() as db:
+        yield db
+
+
+# Dependency được các router sử dụng, chọn theo DB_MODE
+get_session = get_async_db if DB_MODE == "async" else get_db
+get_replica_session = get_async_replica_db if DB_MODE == "async" else get_replica_db
+
+
+@asynccontextmanager
+async def session_scope(replica: bool = False):
+    """
+    Mở session trên primary hoặc replica, theo DB_MODE.
+    """
+    # Không cấu hình replica => session "replica" thực chất là primary
+    replica = replica and bool(SQLALCHEMY_REPLICA_DATABASE_URL)
+    if DB_MODE == "async":
+        maker = (
+            get_async_replica_sessionmaker() if replica else get_async_sessionmaker()
+        )
+        async with maker() as db:
+            db.info["replica"] = replica
+            yield db
+        return
+
+    db = (ReplicaSessionLocal if replica else SessionLocal)()
+    db.info["replica"] = replica
+    try:
+        yield db
+    finally:
+        await run_in_threadpool(db.close)
+
+
+def is_replica_session(db) -> bool:
+    # Session / AsyncSession mở qua session_scope(replica=True)
+    return db.info.get("replica", False)
+
+
+class ReplicaBehind(Exception):
+    """
+    Replica chưa bắt kịp version cần đọc: đọc lại trên primary.
+    """
+
+
+async def run_sync(db, fn):
+    """
+    Chạy một hàm service sync fn(session) mà không chặn event loop:
+    - AsyncSession: qua greenlet của driver async (run_sync)
+    - Session: trong threadpool
+    """
+    if isinstance(db, AsyncSession):
+        return await db.run_sync(fn)
+    return await run_in_threadpool(fn, db)
+
+
+def run_blocking(fn, *args):
+    """
+    Gọi IO blocking (Redis, ...) từ code service sync mà không chặn event loop:
+    - trong AsyncSession.run_sync (greenlet chạy trên event loop): chuyển sang
+      threadpool và chờ qua greenlet, giống cách driver async chờ IO
+    - ngoài greenlet (threadpool của DB_MODE=sync, script): gọi trực tiếp
+    """
+    if in_greenlet():
+        return await_only(run_in_threadpool(fn, *args))
+    return fn(*args)
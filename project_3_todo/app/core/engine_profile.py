@@ -0,0 +1,118 @@
+"""
+Engine profile: engine kwargs (pool, ...) + các lệnh chạy trên mỗi connection
+mới (PRAGMA cho SQLite, SET cho Postgres) qua connect event.
+"""
+
+import asyncio
+import logging
+from dataclasses import dataclass, field
+
+from fastapi.concurrency import run_in_threadpool
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine, make_url
+
+from app.core.config import (
+    DB_POOL_RECYCLE_SECONDS,
+    POSTGRES_IDLE_IN_TRANSACTION_TIMEOUT_MS,
+    POSTGRES_LOCK_TIMEOUT_MS,
+    POSTGRES_POOL_RECYCLE_SECONDS,
+    POSTGRES_STATEMENT_TIMEOUT_MS,
+    SQLITE_BUSY_TIMEOUT_MS,
+    SQLITE_CACHE_SIZE,
+    SQLITE_JOURNAL_MODE,
+    SQLITE_MMAP_SIZE,
+    SQLITE_SYNCHRONOUS,
+    SQLITE_TEMP_STORE,
+)
+
+logger = logging.getLogger(__name__)
+
+PROFILES = ("default", "tuned")
+
+
+@dataclass
+class EngineProfile:
+    name: str
+    backend: str
+    engine_kwargs: dict = field(default_factory=dict)
+    connect_statements: list[str] = field(default_factory=list)
+
+
+def sqlite_tuned_statements() -> list[str]:
+    return [
+        # busy_timeout trước tiên: chuyển sang WAL cũng cần lock
+        f"PRAGMA busy_timeout = {SQLITE_BUSY_TIMEOUT_MS}",
+        f"PRAGMA journal_mode = {SQLITE_JOURNAL_MODE}",
+        f"PRAGMA synchronous = {SQLITE_SYNCHRONOUS}",
+        f"PRAGMA mmap_size = {SQLITE_MMAP_SIZE}",
+        f"PRAGMA cache_size = {SQLITE_CACHE_SIZE}",
+        f"PRAGMA temp_store = {SQLITE_TEMP_STORE}",
+    ]
+
+
+def postgres_tuned_statements() -> list[str]:
+    return [
+        f"SET statement_timeout = {POSTGRES_STATEMENT_TIMEOUT_MS}",
+        f"SET lock_timeout = {POSTGRES_LOCK_TIMEOUT_MS}",
+        "SET idle_in_transaction_session_timeout = "
+        f"{POSTGRES_IDLE_IN_TRANSACTION_TIMEOUT_MS}",
+    ]
+
+
+def get_engine_profile(url: str, name: str = "default") -> EngineProfile:
+    if name not in PROFILES:
+        raise ValueError(f"Unknown engine profile '{name}'")
+
+    backend = make_url(url).get_backend_name()
+    profile = EngineProfile(name=name, backend=backend)
+    if backend == "sqlite":
+        # SQLite mặc định chỉ cho phép dùng connection trong thread đã tạo ra nó
+        profile.engine_kwargs["connect_args"] = {"check_same_thread": False}
+        if name == "tuned":
+            profile.connect_statements = sqlite_tuned_statements()
+    elif backend == "postgresql" and name == "tuned":
+        profile.engine_kwargs["pool_pre_ping"] = True
+        # DB_POOL_RECYCLE_SECONDS đặt tường minh thì được ưu tiên
+        if DB_POOL_RECYCLE_SECONDS < 0:
+            profile.engine_kwargs["pool_recycle"] = POSTGRES_POOL_RECYCLE_SECONDS
+        profile.connect_statements = postgres_tuned_statements()
+    return profile
+
+
+def apply_engine_profile(engine: Engine, profile: EngineProfile):
+    if not profile.connect_statements:
+        return
+
+    @event.listens_for(engine, "connect")
+    def _apply_connect_statements(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for statement in profile.connect_statements:
+                cursor.execute(statement)
+        finally:
+            cursor.close()
+        # Postgres: SET nằm trong transaction ngầm của driver, commit để giữ lại
+        if profile.backend == "postgresql":
+            dbapi_connection.commit()
+
+
+def run_sqlite_maintenance(engine: Engine):
+    """
+    Gộp WAL về file chính và cập nhật thống kê cho query planner.
+    """
+    if engine.dialect.name != "sqlite":
+        return
+    with engine.connect() as connection:
+        connection.exec_driver_sql("PRAGMA wal_checkpoint(TRUNCATE)")
+        connection.exec_driver_sql("PRAGMA optimize")
+
+
+async def sqlite_maintenance_loop(engine: Engine, interval_seconds: float):
+    while True:
+        await asyncio.sleep(interval_seconds)
+        try:
+            await run_in_threadpool(run_sqlite_maintenance, engine)
+        except Exception:
+            # Vd. "database is locked": bỏ qua lần này, thử lại ở chu kỳ sau
+            logger.exception("SQLite maintenance failed")
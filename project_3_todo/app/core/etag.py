@@ -0,0 +1,28 @@
+"""
+ETag / conditional GET helpers.
+"""
+
+import hashlib
+
+
+def make_etag(*parts) -> str:
+    return '"' + "-".join(str(part) for part in parts) + '"'
+
+
+def etag_digest(*parts) -> str:
+    """
+    Băm các phần do client gửi (chuỗi tìm kiếm, cursor, ...): có thể chứa ký tự
+    ngoài latin-1 hoặc dấu " không được phép trong header ETag
+    """
+    raw = "\0".join(str(part) for part in parts)
+    return hashlib.sha256(raw.encode()).hexdigest()[:32]
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    # So sánh weak: bỏ tiền tố W/ ở cả hai phía
+    candidates = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    return etag.removeprefix("W/") in candidates
@@ -0,0 +1,251 @@
+"""
+Pub/sub fan-out cho change feed của todo.
+
+- Mỗi subscriber có một asyncio.Queue giới hạn kích thước; subscriber đọc chậm
+  làm đầy queue sẽ bị ngắt (nhận DROPPED) thay vì làm chậm publisher.
+- Publisher có thể ở bất kỳ thread nào (service chạy trong threadpool), event
+  được chuyển về event loop của subscriber qua call_soon_threadsafe.
+- Backend quyết định event đi tới đâu: InProcessBackend (một worker) hoặc
+  RedisEventBackend (nhiều worker, qua Redis pub/sub).
+"""
+
+import asyncio
+import json
+import logging
+import threading
+import time
+
+from app.core.config import EVENT_BROKER_BACKEND, EVENT_QUEUE_SIZE, REDIS_URL
+
+logger = logging.getLogger(__name__)
+
+# Event cuối cùng gửi cho subscriber bị ngắt vì đọc chậm
+DROPPED = {"type": "dropped"}
+
+
+class Subscription:
+    def __init__(self, broker: "EventBroker", channel: str, queue_size: int):
+        self.broker = broker
+        self.channel = channel
+        self.loop = asyncio.get_running_loop()
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        self.dropped = False
+
+    def push(self, event: dict):
+        # Luôn chạy trên event loop của subscriber
+        if self.dropped:
+            return
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            self.dropped = True
+            # Bỏ các event đang chờ, chỉ giữ lại tín hiệu DROPPED
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait(DROPPED)
+            self.broker.unsubscribe(self)
+
+    async def get(self) -> dict:
+        return await self.queue.get()
+
+    def close(self):
+        self.broker.unsubscribe(self)
+
+
+class InProcessBackend:
+    # True nếu publish là IO mạng (không được gọi trực tiếp trên event loop)
+    blocking = False
+
+    def __init__(self):
+        self._dispatch = None
+
+    def start(self, dispatch):
+        self._dispatch = dispatch
+
+    def publish(self, channel: str, event: dict):
+        # Chưa có ai subscribe trong process này => không cần giao
+        if self._dispatch is not None:
+            self._dispatch(channel, event)
+
+    def stop(self):
+        pass
+
+
+class RedisEventBackend:
+    """
+    Publish lên Redis; một thread nền nhận event của mọi worker (psubscribe)
+    rồi giao cho broker cục bộ. Mất kết nối => log, chờ (backoff) rồi subscribe lại.
+    """
+
+    blocking = True
+
+    def __init__(
+        self,
+        client,
+        prefix: str = "todoapp:events:",
+        retry_seconds: float = 0.5,
+        max_retry_seconds: float = 30,
+    ):
+        self.client = client
+        self.prefix = prefix
+        self.retry_seconds = retry_seconds
+        self.max_retry_seconds = max_retry_seconds
+        self._pubsub = None
+        self._stopped = threading.Event()
+
+    def start(self, dispatch):
+        # Subscribe trước khi trả về: event publish ngay sau subscribe không bị mất
+        self._subscribe()
+        threading.Thread(target=self._listen, args=(dispatch,), daemon=True).start()
+
+    def _subscribe(self):
+        pubsub = self.client.pubsub(ignore_subscribe_messages=True)
+        pubsub.psubscribe(self.prefix + "*")
+        self._pubsub = pubsub
+
+    def _listen(self, dispatch):
+        while True:
+            try:
+                for message in self._pubsub.listen():
+                    if message["type"] == "pmessage":
+                        self._deliver(dispatch, message)
+                if self._stopped.is_set():
+                    return
+                logger.warning("Redis event subscription ended")
+            except Exception:
+                if self._stopped.is_set():
+                    return
+                logger.exception("Redis event listener failed")
+            if not self._resubscribe():
+                return
+
+    def _resubscribe(self) -> bool:
+        """
+        Subscribe lại với backoff cho tới khi thành công; False nếu đã stop.
+        Event publish trong lúc mất kết nối không được giao lại.
+        """
+        try:
+            self._pubsub.close()
+        except Exception:
+            pass
+        delay = self.retry_seconds
+        while not self._stopped.wait(delay):
+            try:
+                self._subscribe()
+                return True
+            except Exception:
+                logger.exception("Redis event resubscribe failed")
+            delay = min(delay * 2, self.max_retry_seconds)
+        return False
+
+    def _deliver(self, dispatch, message):
+        channel = message["channel"]
+        if isinstance(channel, bytes):
+            channel = channel.decode()
+        try:
+            event = json.loads(message["data"])
+        except ValueError:
+            logger.warning("Dropping malformed event on %s", channel)
+            return
+        dispatch(channel.removeprefix(self.prefix), event)
+
+    def publish(self, channel: str, event: dict):
+        self.client.publish(self.prefix + channel, json.dumps(event))
+
+    def stop(self):
+        self._stopped.set()
+        if self._pubsub is not None:
+            self._pubsub.close()
+
+
+class EventBroker:
+    def __init__(self, backend=None, queue_size: int = EVENT_QUEUE_SIZE):
+        self.backend = backend or InProcessBackend()
+        self.queue_size = queue_size
+        self._subscribers: dict[str, set[Subscription]] = {}
+        self._lock = threading.Lock()
+        self._started = False
+
+    def _ensure_started(self):
+        with self._lock:
+            if self._started:
+                return
+            self._started = True
+        self.backend.start(self._dispatch)
+
+    def subscribe(self, channel: str) -> Subscription:
+        # Gọi từ trong event loop; subscriber rảnh chỉ tốn một Queue rỗng
+        self._ensure_started()
+        subscription = Subscription(self, channel, self.queue_size)
+        with self._lock:
+            self._subscribers.setdefault(channel, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        with self._lock:
+            subscribers = self._subscribers.get(subscription.channel)
+            if subscribers is None:
+                return
+            subscribers.discard(subscription)
+            if not subscribers:
+                del self._subscribers[subscription.channel]
+
+    def subscriber_count(self, channel: str | None = None) -> int:
+        with self._lock:
+            if channel is not None:
+                return len(self._subscribers.get(channel, ()))
+            return sum(len(subscribers) for subscribers in self._subscribers.values())
+
+    def publish(self, channel: str, event: dict):
+        self.backend.publish(channel, event)
+
+    def _dispatch(self, channel: str, event: dict):
+        with self._lock:
+            subscribers = list(self._subscribers.get(channel, ()))
+        for subscription in subscribers:
+            try:
+                subscription.loop.call_soon_threadsafe(subscription.push, event)
+            except RuntimeError:
+                # Event loop đã đóng (vd. worker đang tắt)
+                self.unsubscribe(subscription)
+
+    def close(self):
+        self.backend.stop()
+
+
+def create_event_backend(kind: str, redis_url: str):
+    if kind == "redis":
+        try:
+            import redis
+        except ImportError as exc:
+            raise RuntimeError(
+                "Event broker backend 'redis' requires the redis package"
+            ) from exc
+        return RedisEventBackend(redis.Redis.from_url(redis_url))
+    return InProcessBackend()
+
+
+event_broker = EventBroker(create_event_backend(EVENT_BROKER_BACKEND, REDIS_URL))
+
+
+def format_sse(event: dict) -> str:
+    return f"event: {event['type']}\ndata: {json.dumps(event)}\n\n"
+
+
+async def sse_stream(subscription: Subscription, heartbeat_seconds: float):
+    """
+    Server-Sent Events; comment keepalive giữ kết nối qua proxy khi không có event
+    """
+    try:
+        yield ": connected\n\n"
+        while True:
+            try:
+                event = await asyncio.wait_for(subscription.get(), heartbeat_seconds)
+            except asyncio.TimeoutError:
+                yield ": keepalive\n\n"
+                continue
+            yield format_sse(event)
+            if event is DROPPED:
+                return
+    finally:
+        subscription.close()
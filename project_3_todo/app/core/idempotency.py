@@ -0,0 +1,120 @@
+"""
+Idempotency-Key cho các route ghi: kết quả thành công đầu tiên được lưu (có TTL)
+và trả lại nguyên vẹn cho các lần retry cùng key, không chạy lại service.
+Request trùng key đến khi request đầu còn đang chạy sẽ chờ và dùng chung kết quả.
+"""
+
+import asyncio
+import hashlib
+from functools import lru_cache
+
+from fastapi import HTTPException
+from fastapi.concurrency import run_in_threadpool
+from pydantic import TypeAdapter
+
+from app.core.cache import CacheBackend, create_cache_backend
+from app.core.config import (
+    IDEMPOTENCY_BACKEND,
+    IDEMPOTENCY_MAX_KEYS,
+    IDEMPOTENCY_TTL_SECONDS,
+    REDIS_URL,
+)
+
+IDEMPOTENCY_HEADER = "Idempotency-Key"
+IDEMPOTENCY_KEY_MAX_LENGTH = 255
+# Header đánh dấu response được trả lại từ store
+REPLAYED_HEADER = "Idempotent-Replayed"
+
+
+def request_fingerprint(method: str, path: str, query: str, body: bytes) -> str:
+    digest = hashlib.sha256()
+    for part in (method.encode(), path.encode(), query.encode(), body):
+        digest.update(len(part).to_bytes(8, "big"))
+        digest.update(part)
+    return digest.hexdigest()
+
+
+@lru_cache(maxsize=None)
+def _response_adapter(response_model) -> TypeAdapter:
+    return TypeAdapter(response_model)
+
+
+def encode_response(response_model, result):
+    """
+    Kết quả của route (ORM object, dict, ...) => JSON theo response_model,
+    giống cách FastAPI serialize response
+    """
+    if response_model is None:
+        return None
+    adapter = _response_adapter(response_model)
+    return adapter.dump_python(
+        adapter.validate_python(result, from_attributes=True), mode="json"
+    )
+
+
+class IdempotencyStore:
+    """
+    backend: CacheBackend (LRU + TTL trong process hoặc Redis) lưu
+    {"fingerprint", "body"} của response thành công.
+
+    Gộp request trùng đang chạy chỉ có hiệu lực trong một process (các route
+    handler đều chạy trên event loop); giữa nhiều worker, kết quả đã lưu trong
+    Redis vẫn được dùng chung.
+    """
+
+    def __init__(self, backend: CacheBackend, ttl: float):
+        self.backend = backend
+        self.ttl = ttl
+        self._in_flight: dict[str, asyncio.Future] = {}
+
+    def _replay(self, stored: dict, fingerprint: str):
+        if stored["fingerprint"] != fingerprint:
+            raise HTTPException(
+                status_code=422,
+                detail=f"{IDEMPOTENCY_HEADER} was already used for a different request",
+            )
+        return stored["body"]
+
+    async def _backend_io(self, call, *args):
+        # Backend Redis: IO mạng, chạy trong threadpool để không chặn event loop
+        if self.backend.blocking:
+            return await run_in_threadpool(call, *args)
+        return call(*args)
+
+    async def run(self, key: str, fingerprint: str, call, encode):
+        """
+        Trả về (body, replayed). call: coroutine function thực hiện thao tác;
+        encode: chuyển kết quả thành giá trị JSON để lưu.
+        """
+        while (pending := self._in_flight.get(key)) is not None:
+            stored = await asyncio.shield(pending)
+            if stored is not None:
+                return self._replay(stored, fingerprint), True
+            # Request đầu lỗi / bị hủy => không có kết quả, request này tự chạy
+
+        # Giữ chỗ trước khi đọc backend: trong process này không request trùng key
+        # nào chen vào giữa lúc đọc và lúc lưu kết quả
+        future = asyncio.get_running_loop().create_future()
+        self._in_flight[key] = future
+        stored = None
+        try:
+            stored = await self._backend_io(self.backend.get, key)
+            if stored is not None:
+                return self._replay(stored, fingerprint), True
+            body = encode(await call())
+            stored = {"fingerprint": fingerprint, "body": body}
+            await self._backend_io(self.backend.set, key, stored, self.ttl)
+            return body, False
+        finally:
+            self._in_flight.pop(key, None)
+            future.set_result(stored)
+
+    def clear(self):
+        self.backend.clear()
+        self._in_flight.clear()
+
+
+idempotency_store = IdempotencyStore(
+    create_cache_backend(IDEMPOTENCY_BACKEND, IDEMPOTENCY_MAX_KEYS, REDIS_URL),
+    IDEMPOTENCY_TTL_SECONDS,
+)
@@ -0,0 +1,261 @@
+"""
+Metrics kiểu Prometheus, không phụ thuộc thư viện ngoài:
+- HTTP: số request theo route template + nhóm status, histogram latency,
+  gauge số request đang xử lý
+- DB: số query và thời gian DB theo route (qua SQLAlchemy engine events)
+- Single-flight: số lời gọi đọc được thực thi / được gộp theo từng hàm
+- Cache: số lần hit / miss của các cache đã đăng ký (register_cache)
+"""
+
+import bisect
+import threading
+import time
+from contextvars import ContextVar
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+
+
+class RequestDBStats:
+    __slots__ = ("queries", "seconds")
+
+    def __init__(self):
+        self.queries = 0
+        self.seconds = 0.0
+
+
+# Stats DB của request hiện tại (None khi không nằm trong request)
+current_db_stats: ContextVar[RequestDBStats | None] = ContextVar(
+    "current_db_stats", default=None
+)
+
+
+class Histogram:
+    __slots__ = ("buckets", "counts", "sum", "count")
+
+    def __init__(self, buckets: tuple):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        index = bisect.bisect_left(self.buckets, value)
+        if index < len(self.counts):
+            self.counts[index] += 1
+        self.sum += value
+        self.count += 1
+
+
+def _labels(**labels) -> str:
+    return ",".join(f'{key}="{value}"' for key, value in labels.items())
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._lock = threading.Lock()
+        # name => hàm trả về {"hits", "misses"}; counter nằm trong chính cache
+        self._caches: dict[str, object] = {}
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.requests: dict[tuple, int] = {}
+            self.latency: dict[tuple, Histogram] = {}
+            self.in_flight: dict[tuple, int] = {}
+            self.db_queries: dict[tuple, int] = {}
+            self.db_seconds: dict[tuple, float] = {}
+            self.db_queries_per_request: dict[tuple, Histogram] = {}
+            self.single_flight: dict[tuple, int] = {}
+
+    def request_started(self, method: str):
+        with self._lock:
+            self.in_flight[method] = self.in_flight.get(method, 0) + 1
+
+    def request_finished(
+        self,
+        key: tuple,
+        status_code: int,
+        seconds: float,
+        db_stats: RequestDBStats,
+    ):
+        status_class = f"{status_code // 100}xx"
+        with self._lock:
+            self.in_flight[key[0]] -= 1
+            counter_key = (*key, status_class)
+            self.requests[counter_key] = self.requests.get(counter_key, 0) + 1
+            if key not in self.latency:
+                self.latency[key] = Histogram(LATENCY_BUCKETS)
+                self.db_queries_per_request[key] = Histogram(QUERY_COUNT_BUCKETS)
+            self.latency[key].observe(seconds)
+            self.db_queries_per_request[key].observe(db_stats.queries)
+            self.db_queries[key] = self.db_queries.get(key, 0) + db_stats.queries
+            self.db_seconds[key] = self.db_seconds.get(key, 0.0) + db_stats.seconds
+
+    def record_single_flight(self, function: str, collapsed: bool):
+        key = (function, "collapsed" if collapsed else "executed")
+        with self._lock:
+            self.single_flight[key] = self.single_flight.get(key, 0) + 1
+
+    def register_cache(self, name: str, stats):
+        with self._lock:
+            self._caches[name] = stats
+
+    def render(self) -> str:
+        lines: list[str] = []
+        with self._lock:
+            lines += [
+                "# HELP http_requests_total Total HTTP requests.",
+                "# TYPE http_requests_total counter",
+            ]
+            for (method, route, status), value in sorted(self.requests.items()):
+                labels = _labels(method=method, route=route, status=status)
+                lines.append(f"http_requests_total{{{labels}}} {value}")
+
+            lines += [
+                "# HELP http_requests_in_flight HTTP requests being processed.",
+                "# TYPE http_requests_in_flight gauge",
+            ]
+            for method, value in sorted(self.in_flight.items()):
+                labels = _labels(method=method)
+                lines.append(f"http_requests_in_flight{{{labels}}} {value}")
+
+            self._render_histograms(
+                lines,
+                "http_request_duration_seconds",
+                "HTTP request latency.",
+                self.latency,
+            )
+            self._render_histograms(
+                lines,
+                "db_queries_per_request",
+                "Database queries executed per HTTP request.",
+                self.db_queries_per_request,
+            )
+
+            lines += [
+                "# HELP db_queries_total Database queries executed.",
+                "# TYPE db_queries_total counter",
+            ]
+            for (method, route), value in sorted(self.db_queries.items()):
+                labels = _labels(method=method, route=route)
+                lines.append(f"db_queries_total{{{labels}}} {value}")
+
+            lines += [
+                "# HELP db_query_duration_seconds_total Time spent in database queries.",
+                "# TYPE db_query_duration_seconds_total counter",
+            ]
+            for (method, route), value in sorted(self.db_seconds.items()):
+                labels = _labels(method=method, route=route)
+                lines.append(f"db_query_duration_seconds_total{{{labels}}} {value:.6f}")
+
+            lines += [
+                "# HELP singleflight_calls_total Read service calls, executed or collapsed into an in-flight call.",
+                "# TYPE singleflight_calls_total counter",
+            ]
+            for (function, outcome), value in sorted(self.single_flight.items()):
+                labels = _labels(function=function, outcome=outcome)
+                lines.append(f"singleflight_calls_total{{{labels}}} {value}")
+
+            lines += [
+                "# HELP cache_requests_total Cache lookups by result.",
+                "# TYPE cache_requests_total counter",
+            ]
+            for name, stats in sorted(self._caches.items()):
+                counts = stats()
+                for result, key in (("hit", "hits"), ("miss", "misses")):
+                    labels = _labels(cache=name, result=result)
+                    lines.append(f"cache_requests_total{{{labels}}} {counts[key]}")
+        return "\n".join(lines) + "\n"
+
+    @staticmethod
+    def _render_histograms(lines: list, name: str, help_text: str, histograms: dict):
+        lines += [f"# HELP {name} {help_text}", f"# TYPE {name} histogram"]
+        for (method, route), histogram in sorted(histograms.items()):
+            labels = _labels(method=method, route=route)
+            cumulative = 0
+            for bound, count in zip(histogram.buckets, histogram.counts):
+                cumulative += count
+                lines.append(f'{name}_bucket{{{labels},le="{bound}"}} {cumulative}')
+            lines.append(f'{name}_bucket{{{labels},le="+Inf"}} {histogram.count}')
+            lines.append(f"{name}_sum{{{labels}}} {histogram.sum:.6f}")
+            lines.append(f"{name}_count{{{labels}}} {histogram.count}")
+
+
+metrics = MetricsRegistry()
+
+
+class MetricsMiddleware:
+    """
+    ASGI middleware thuần (không dùng BaseHTTPMiddleware) để overhead thấp.
+    Label route dùng template của route đã match (scope["route"]), ví dụ
+    /todos/todo/{todo_id}, để số label không tăng theo id. Route chỉ được
+    biết sau khi routing nên gauge in-flight được ghi theo method.
+    """
+
+    def __init__(self, app, registry: MetricsRegistry = metrics):
+        self.app = app
+        self.registry = registry
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        status_code = 500
+        db_stats = RequestDBStats()
+        token = current_db_stats.set(db_stats)
+        self.registry.request_started(method)
+        started = time.perf_counter()
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - started
+            current_db_stats.reset(token)
+            route = getattr(scope.get("route"), "path", "unmatched")
+            self.registry.request_finished(
+                (method, route), status_code, elapsed, db_stats
+            )
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, many):
+    conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, many):
+    started = conn.info["query_started"].pop()
+    stats = current_db_stats.get()
+    if stats is not None:
+        stats.queries += 1
+        stats.seconds += time.perf_counter() - started
+
+
+def _handle_error(exception_context):
+    # Statement lỗi không đi qua after_cursor_execute => bỏ mốc thời gian của nó,
+    # tránh để lại trên connection của pool
+    conn = exception_context.connection
+    if conn is None or exception_context.statement is None:
+        # statement None: lỗi khi fetch, after_cursor_execute đã chạy
+        return
+    started = conn.info.get("query_started")
+    if started:
+        started.pop()
+
+
+def instrument_engines():
+    # Lắng nghe trên class Engine => áp dụng cho mọi engine (sync, async, replica)
+    if not event.contains(Engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
+        event.listen(Engine, "handle_error", _handle_error)
@@ -0,0 +1,34 @@
+"""
+Chạy Alembic migrations từ code (lúc startup hoặc trong test).
+"""
+
+from pathlib import Path
+
+from alembic import command
+from alembic.config import Config
+from sqlalchemy import inspect
+from sqlalchemy.engine import Engine
+
+ALEMBIC_INI = Path(__file__).resolve().parents[2] / "alembic.ini"
+
+# Revision tương ứng với schema mà Base.metadata.create_all từng tạo ra
+BASELINE_REVISION = "0001"
+
+
+def get_alembic_config(engine: Engine) -> Config:
+    config = Config(str(ALEMBIC_INI))
+    config.attributes["url"] = engine.url.render_as_string(hide_password=False)
+    config.attributes["configure_logger"] = False
+    return config
+
+
+def run_migrations(engine: Engine, revision: str = "head"):
+    config = get_alembic_config(engine)
+    with engine.begin() as connection:
+        config.attributes["connection"] = connection
+        tables = set(inspect(connection).get_table_names())
+        # DB cũ được tạo bằng create_all (chưa có alembic_version):
+        # đánh dấu baseline rồi mới upgrade tiếp
+        if "alembic_version" not in tables and {"users", "todos"} <= tables:
+            command.stamp(config, BASELINE_REVISION)
+        command.upgrade(config, revision)
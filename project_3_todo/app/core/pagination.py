@@ -0,0 +1,63 @@
+"""
+Keyset (cursor) pagination: thay vì OFFSET, mỗi trang bắt đầu ngay sau
+khóa sắp xếp của dòng cuối trang trước => chi phí không phụ thuộc độ sâu.
+"""
+
+import base64
+import json
+
+from fastapi import HTTPException, status
+from sqlalchemy import tuple_
+from sqlalchemy.orm import Query
+
+
+def encode_cursor(order_by: str, key: list) -> str:
+    raw = json.dumps({"o": order_by, "k": key}, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode()
+
+
+def decode_cursor(cursor: str, order_by: str, size: int) -> list:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        data = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        key = data["k"]
+        valid = (
+            data["o"] == order_by
+            and isinstance(key, list)
+            and len(key) == size
+            # float: điểm relevance của search
+            and all(isinstance(value, (int, float)) for value in key)
+        )
+    except (ValueError, KeyError, TypeError):
+        valid = False
+    if not valid:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor"
+        )
+    return key
+
+
+def keyset_page(
+    query: Query, order_by: str, columns: tuple, limit: int, cursor: str | None
+) -> dict:
+    """
+    columns: các cột tạo thành khóa sắp xếp duy nhất, ví dụ (Todos.id,)
+    hoặc (Todos.priority, Todos.id)
+    """
+    if cursor is not None:
+        key = decode_cursor(cursor, order_by, len(columns))
+        if len(columns) == 1:
+            query = query.filter(columns[0] > key[0])
+        else:
+            query = query.filter(tuple_(*columns) > tuple_(*key))
+
+    # Lấy dư 1 dòng để biết còn trang sau hay không
+    rows = query.order_by(*columns).limit(limit + 1).all()
+    items = rows[:limit]
+    next_cursor = None
+    if len(rows) > limit:
+        last = items[-1]
+        next_cursor = encode_cursor(
+            order_by, [getattr(last, column.key) for column in columns]
+        )
+    return {"items": items, "next_cursor": next_cursor}
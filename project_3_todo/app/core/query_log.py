@@ -0,0 +1,164 @@
+"""
+Instrumentation cho SQLAlchemy (opt-in, QUERY_LOG_ENABLED=1):
+- slow-query log: statement chậm hơn ngưỡng, kèm tham số và hàm service gọi nó
+- N+1 detector: cảnh báo khi một request chạy cùng một dạng statement quá
+  N_PLUS_ONE_THRESHOLD lần
+- assert_max_queries: helper cho test để khóa ngân sách query của endpoint
+"""
+
+import logging
+import re
+import sys
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.core.config import N_PLUS_ONE_THRESHOLD, SLOW_QUERY_THRESHOLD_MS
+
+logger = logging.getLogger("app.query_log")
+
+SERVICE_PATH_MARKER = "/app/services/"
+_IN_LIST = re.compile(
+    r"\(\s*\?(?:\s*,\s*\?)+\s*\)|\(\s*%\(\w+\)s(?:\s*,\s*%\(\w+\)s)+\s*\)"
+)
+_WHITESPACE = re.compile(r"\s+")
+
+
+def statement_shape(statement: str) -> str:
+    # Gộp IN (?, ?, ?) thành IN (?) để các query chỉ khác số phần tử là một dạng
+    return _WHITESPACE.sub(" ", _IN_LIST.sub("(?)", statement)).strip()
+
+
+def calling_service_function() -> str | None:
+    frame = sys._getframe(1)
+    while frame is not None:
+        filename = frame.f_code.co_filename.replace("\\", "/")
+        if SERVICE_PATH_MARKER in filename:
+            module = filename.rsplit("/", 1)[-1].removesuffix(".py")
+            return f"{module}.{frame.f_code.co_name}:{frame.f_lineno}"
+        frame = frame.f_back
+    return None
+
+
+class QueryTracker:
+    def __init__(self, parent: "QueryTracker | None" = None):
+        # Tracker lồng nhau (vd. assert_max_queries bao quanh middleware) vẫn
+        # đếm đủ query ở tracker ngoài
+        self.parent = parent
+        self.count = 0
+        self.statements: list[str] = []
+        self.shapes: Counter[str] = Counter()
+
+    def record(self, statement: str):
+        self.count += 1
+        self.statements.append(statement)
+        self.shapes[statement_shape(statement)] += 1
+        if self.parent is not None:
+            self.parent.record(statement)
+
+    def repeated_shapes(self, threshold: int) -> dict[str, int]:
+        return {shape: n for shape, n in self.shapes.items() if n > threshold}
+
+
+current_tracker: ContextVar[QueryTracker | None] = ContextVar(
+    "current_query_tracker", default=None
+)
+
+
+@contextmanager
+def track_queries():
+    tracker = QueryTracker(current_tracker.get())
+    token = current_tracker.set(tracker)
+    try:
+        yield tracker
+    finally:
+        current_tracker.reset(token)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, many):
+    conn.info.setdefault("query_log_started", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, many):
+    elapsed_ms = (time.perf_counter() - conn.info["query_log_started"].pop()) * 1000
+    tracker = current_tracker.get()
+    if tracker is not None:
+        tracker.record(statement)
+    if elapsed_ms >= SLOW_QUERY_THRESHOLD_MS:
+        logger.warning(
+            "Slow query (%.1f ms) from %s: %s | params=%r",
+            elapsed_ms,
+            calling_service_function() or "unknown",
+            statement_shape(statement),
+            parameters,
+        )
+
+
+def _handle_error(exception_context):
+    # Statement lỗi không đi qua after_cursor_execute => bỏ mốc thời gian của nó
+    conn = exception_context.connection
+    if conn is None or exception_context.statement is None:
+        # statement None: lỗi khi fetch, after_cursor_execute đã chạy
+        return
+    started = conn.info.get("query_log_started")
+    if started:
+        started.pop()
+
+
+def install():
+    # Lắng nghe trên class Engine => áp dụng cho mọi engine của app
+    if not event.contains(Engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
+        event.listen(Engine, "handle_error", _handle_error)
+
+
+class QueryLogMiddleware:
+    """
+    Theo dõi query của từng request và cảnh báo dấu hiệu N+1.
+    """
+
+    def __init__(self, app, threshold: int = N_PLUS_ONE_THRESHOLD):
+        self.app = app
+        self.threshold = threshold
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        with track_queries() as tracker:
+            await self.app(scope, receive, send)
+
+        for shape, count in tracker.repeated_shapes(self.threshold).items():
+            route = getattr(scope.get("route"), "path", scope["path"])
+            logger.warning(
+                "Possible N+1 in %s %s: statement ran %d times: %s",
+                scope["method"],
+                route,
+                count,
+                shape,
+            )
+
+
+@contextmanager
+def assert_max_queries(max_queries: int):
+    """
+    Dùng trong test:
+
+        with assert_max_queries(2):
+            client.get("/todos/", headers=headers)
+    """
+    install()
+    with track_queries() as tracker:
+        yield tracker
+    if tracker.count > max_queries:
+        statements = "\n".join(f"  {statement}" for statement in tracker.statements)
+        raise AssertionError(
+            f"Expected at most {max_queries} queries, got {tracker.count}:\n"
+            f"{statements}"
+        )
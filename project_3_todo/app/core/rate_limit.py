@@ -0,0 +1,85 @@
+"""
+Rate limiter GCRA (Generic Cell Rate Algorithm).
+
+Mỗi key chỉ lưu một số: TAT (theoretical arrival time). Mỗi request được
+chấp nhận sẽ đẩy TAT thêm một khoảng emission_interval = window / limit;
+request bị từ chối nếu TAT mới vượt quá now + window. Tương đương token
+bucket dung lượng `limit`, nạp lại đều trong `window` giây.
+"""
+
+import math
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+
+
+@dataclass
+class RateLimitResult:
+    allowed: bool
+    limit: int
+    remaining: int
+    reset_after: float
+    retry_after: float
+
+    def headers(self) -> dict:
+        headers = {
+            "RateLimit-Limit": str(self.limit),
+            "RateLimit-Remaining": str(self.remaining),
+            "RateLimit-Reset": str(math.ceil(self.reset_after)),
+        }
+        if not self.allowed:
+            headers["Retry-After"] = str(math.ceil(self.retry_after))
+        return headers
+
+
+class GCRARateLimiter:
+    def __init__(self, limit: int, window_seconds: float, max_keys: int):
+        self.limit = limit
+        self.window = float(window_seconds)
+        self.emission_interval = self.window / limit
+        self.max_keys = max_keys
+        # key -> TAT, theo thứ tự truy cập gần nhất (LRU)
+        self._tats: OrderedDict[str, float] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def hit(self, key: str, now: float | None = None) -> RateLimitResult:
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            tat = max(self._tats.get(key, now), now)
+            new_tat = tat + self.emission_interval
+            allow_at = new_tat - self.window
+
+            if now < allow_at:
+                return RateLimitResult(
+                    allowed=False,
+                    limit=self.limit,
+                    remaining=0,
+                    reset_after=tat - now,
+                    retry_after=allow_at - now,
+                )
+
+            self._tats[key] = new_tat
+            self._tats.move_to_end(key)
+            self._evict(now)
+            remaining = int((now - allow_at) / self.emission_interval + 1e-9)
+            return RateLimitResult(
+                allowed=True,
+                limit=self.limit,
+                remaining=min(remaining, self.limit - 1),
+                reset_after=new_tat - now,
+                retry_after=0.0,
+            )
+
+    def _evict(self, now: float):
+        # Key có TAT <= now đã "đầy bucket" => xóa cũng không đổi kết quả.
+        # Các key ít dùng nhất nằm ở đầu OrderedDict nên mỗi lần chỉ tốn O(1)
+        # amortized.
+        while self._tats:
+            oldest_key, oldest_tat = next(iter(self._tats.items()))
+            if oldest_tat > now and len(self._tats) <= self.max_keys:
+                break
+            del self._tats[oldest_key]
+
+    def __len__(self) -> int:
+        return len(self._tats)
@@ -0,0 +1,66 @@
+"""
+Read-your-writes cho read/write split: sau một lần ghi, đọc của user đó đi
+về primary trong READ_YOUR_WRITES_SECONDS giây (replica có thể đang trễ).
+"""
+
+import threading
+import time
+from collections import OrderedDict
+
+from app.core.config import (
+    READ_YOUR_WRITES_COOKIE,
+    READ_YOUR_WRITES_MAX_USERS,
+    READ_YOUR_WRITES_SECONDS,
+)
+
+
+class ReadYourWrites:
+    """
+    user_id -> thời điểm hết stickiness; LRU có giới hạn kích thước.
+    """
+
+    def __init__(self, window_seconds: float, max_users: int):
+        self.window_seconds = window_seconds
+        self.max_users = max_users
+        self._sticky_until: OrderedDict[int, float] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def mark_write(self, user_id: int, now: float | None = None) -> float:
+        now = time.time() if now is None else now
+        sticky_until = now + self.window_seconds
+        with self._lock:
+            self._sticky_until[user_id] = sticky_until
+            self._sticky_until.move_to_end(user_id)
+            while len(self._sticky_until) > self.max_users:
+                self._sticky_until.popitem(last=False)
+        return sticky_until
+
+    def is_sticky(self, user_id: int | None, now: float | None = None) -> bool:
+        if user_id is None:
+            return False
+        now = time.time() if now is None else now
+        with self._lock:
+            sticky_until = self._sticky_until.get(user_id)
+            if sticky_until is None:
+                return False
+            if sticky_until <= now:
+                del self._sticky_until[user_id]
+                return False
+            return True
+
+    def clear(self):
+        with self._lock:
+            self._sticky_until.clear()
+
+
+def cookie_is_sticky(cookies: dict, now: float | None = None) -> bool:
+    # Cookie chỉ ảnh hưởng việc chọn primary/replica nên không cần ký
+    try:
+        sticky_until = float(cookies.get(READ_YOUR_WRITES_COOKIE, 0))
+    except ValueError:
+        return False
+    now = time.time() if now is None else now
+    return sticky_until > now
+
+
+read_your_writes = ReadYourWrites(READ_YOUR_WRITES_SECONDS, READ_YOUR_WRITES_MAX_USERS)
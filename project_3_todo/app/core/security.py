@@ -0,0 +1,90 @@
+"""
+Hash / verify mật khẩu qua một executor riêng có hàng đợi giới hạn,
+để bcrypt không chiếm event loop và không làm nghẽn threadpool của FastAPI.
+"""
+
+import asyncio
+import threading
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+
+from fastapi import HTTPException, status
+from passlib.context import CryptContext
+
+from app.core.config import HASH_EXECUTOR, HASH_MAX_PENDING, HASH_WORKERS
+
+# CryptContext dùng chung cho toàn bộ app
+bcrypt_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+
+
+def _hash(password: str) -> str:
+    return bcrypt_context.hash(password)
+
+
+def _verify(password: str, hashed_password: str) -> bool:
+    return bcrypt_context.verify(password, hashed_password)
+
+
+class HashingExecutor:
+    def __init__(self, kind: str, workers: int, max_pending: int):
+        self.kind = kind
+        self.workers = workers
+        self.max_pending = max_pending
+        self._executor: Executor | None = None
+        self._slots = threading.BoundedSemaphore(max_pending)
+        self._lock = threading.Lock()
+
+    def _get_executor(self) -> Executor:
+        with self._lock:
+            if self._executor is None:
+                if self.kind == "process":
+                    self._executor = ProcessPoolExecutor(max_workers=self.workers)
+                else:
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=self.workers, thread_name_prefix="hashing"
+                    )
+            return self._executor
+
+    def submit(self, fn, *args) -> Future:
+        # Hàng đợi đầy => từ chối ngay thay vì để request xếp hàng vô hạn
+        if not self._slots.acquire(blocking=False):
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Password hashing is busy, try again later",
+                headers={"Retry-After": "1"},
+            )
+        try:
+            future = self._get_executor().submit(fn, *args)
+        except BaseException:
+            self._slots.release()
+            raise
+        future.add_done_callback(lambda _: self._slots.release())
+        return future
+
+    def shutdown(self):
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=True)
+                self._executor = None
+
+
+hashing_executor = HashingExecutor(HASH_EXECUTOR, HASH_WORKERS, HASH_MAX_PENDING)
+
+
+# Dùng trong code sync (service chạy trong threadpool)
+def hash_password(password: str) -> str:
+    return hashing_executor.submit(_hash, password).result()
+
+
+def verify_password(password: str, hashed_password: str) -> bool:
+    return hashing_executor.submit(_verify, password, hashed_password).result()
+
+
+# Dùng trong code async: chờ kết quả mà không chặn event loop
+async def ahash_password(password: str) -> str:
+    return await asyncio.wrap_future(hashing_executor.submit(_hash, password))
+
+
+async def averify_password(password: str, hashed_password: str) -> bool:
+    return await asyncio.wrap_future(
+        hashing_executor.submit(_verify, password, hashed_password)
+    )
@@ -0,0 +1,116 @@
+"""
+Single-flight cho các hàm đọc: nhiều lời gọi giống hệt nhau (cùng hàm, owner,
+tham số, engine) chạy đồng thời chỉ thực thi một lần, các lời gọi còn lại chờ
+và dùng chung kết quả (hoặc exception).
+
+Áp dụng ở tầng async service nên dùng được cho cả DB_MODE=sync (service chạy
+trong threadpool) lẫn DB_MODE=async; lời gọi bị gộp không chiếm thêm thread /
+connection nào.
+"""
+
+import asyncio
+import functools
+import inspect
+import threading
+
+from app.core.metrics import metrics
+
+
+class SingleFlight:
+    def __init__(self):
+        # forget() có thể được gọi từ thread của threadpool => cần lock
+        self._lock = threading.Lock()
+        self._flights: dict[tuple, asyncio.Future] = {}
+        self._owner_keys: dict[object, set] = {}
+
+    async def do(self, name: str, key: tuple, owner, call):
+        """
+        key: định danh đầy đủ của lời gọi (phải hashable); owner: dùng cho forget
+        """
+        loop = asyncio.get_running_loop()
+        # Future gắn với event loop => loop là một phần của key
+        key = (loop, *key)
+        while True:
+            with self._lock:
+                flight = self._flights.get(key)
+                leader = flight is None
+                if leader:
+                    flight = loop.create_future()
+                    self._flights[key] = flight
+                    self._owner_keys.setdefault(owner, set()).add(key)
+            metrics.record_single_flight(name, collapsed=not leader)
+            if leader:
+                return await self._lead(key, owner, flight, call)
+            try:
+                return await asyncio.shield(flight)
+            except asyncio.CancelledError:
+                # Leader bị hủy (client ngắt kết nối) => tự chạy lại;
+                # còn nếu chính lời gọi này bị hủy thì dừng
+                if not flight.cancelled():
+                    raise
+
+    async def _lead(self, key: tuple, owner, flight: asyncio.Future, call):
+        try:
+            result = await call()
+        except asyncio.CancelledError:
+            flight.cancel()
+            raise
+        except BaseException as exc:
+            flight.set_exception(exc)
+            # Không có follower nào => tránh log "exception was never retrieved"
+            flight.exception()
+            raise
+        else:
+            flight.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                if self._flights.get(key) is flight:
+                    del self._flights[key]
+                    self._discard_owner_key(owner, key)
+
+    def _discard_owner_key(self, owner, key):
+        keys = self._owner_keys.get(owner)
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._owner_keys[owner]
+
+    def forget(self, owner):
+        """
+        Gọi sau khi owner ghi dữ liệu: lời gọi đến sau không được gộp vào các
+        lời gọi bắt đầu trước lần ghi (có thể đọc dữ liệu cũ)
+        """
+        with self._lock:
+            for key in self._owner_keys.pop(owner, ()):
+                self._flights.pop(key, None)
+
+    def in_flight(self) -> int:
+        with self._lock:
+            return len(self._flights)
+
+
+single_flight = SingleFlight()
+
+
+def coalesced(func):
+    """
+    Decorator cho hàm async service dạng f(db, user_id, ...) / f(user_id, db, ...).
+    Key = (hàm, engine của session, user_id, các tham số còn lại).
+    """
+    signature = inspect.signature(func)
+
+    @functools.wraps(func)
+    async def wrapper(*args, **kwargs):
+        arguments = signature.bind(*args, **kwargs)
+        arguments.apply_defaults()
+        params = dict(arguments.arguments)
+        db = params.pop("db")
+        owner = params.pop("user_id")
+        # Session primary và replica không gộp với nhau (read-your-writes)
+        key = (func, db.bind, owner, *params.values())
+        return await single_flight.do(
+            func.__name__, key, owner, lambda: func(*args, **kwargs)
+        )
+
+    return wrapper
@@ -0,0 +1,80 @@
+"""
+Cache các claims của JWT đã được verify, để không phải jwt.decode lại
+mỗi request với cùng một bearer token.
+"""
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+
+from app.core.config import TOKEN_CACHE_MAX_SIZE, TOKEN_CACHE_MAX_TTL_SECONDS
+from app.core.metrics import metrics
+
+
+def token_digest(token: str) -> str:
+    # Không giữ token gốc trong bộ nhớ, chỉ giữ digest
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
+class VerifiedTokenCache:
+    """
+    LRU có giới hạn kích thước; mỗi entry hết hạn tại exp của token
+    (hoặc sau max_ttl giây, tùy cái nào đến trước).
+    """
+
+    def __init__(self, max_size: int, max_ttl: float):
+        self.max_size = max_size
+        self.max_ttl = max_ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[str, tuple[float, dict]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, token: str) -> dict | None:
+        key = token_digest(token)
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            expires_at, claims = entry
+            if expires_at <= now:
+                del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return claims
+
+    def set(self, token: str, claims: dict, exp: float | None = None):
+        if self.max_size <= 0:
+            return
+        expires_at = time.time() + self.max_ttl
+        if exp is not None:
+            expires_at = min(expires_at, float(exp))
+        key = token_digest(token)
+        with self._lock:
+            self._entries[key] = (expires_at, claims)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+
+token_cache = VerifiedTokenCache(TOKEN_CACHE_MAX_SIZE, TOKEN_CACHE_MAX_TTL_SECONDS)
+metrics.register_cache("token", token_cache.stats)
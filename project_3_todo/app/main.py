@@ -1,12 +1,84 @@
-from fastapi import FastAPI
+import asyncio
+from contextlib import asynccontextmanager, suppress
+
+from fastapi import FastAPI, Response
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import JSONResponse
 
 from app.api.v1 import admin, auth, todos, users
-from app.core.database import Base, engine
+from app.core import database
+from app.core.config import (
+    DB_MODE,
+    DB_POOL_PREWARM,
+    DB_POOL_SIZE,
+    DB_PROFILE,
+    METRICS_ENABLED,
+    QUERY_LOG_ENABLED,
+    RUN_MIGRATIONS_ON_STARTUP,
+    SQLITE_MAINTENANCE_INTERVAL_SECONDS,
+)
+from app.core.database import engine
+from app.core.engine_profile import sqlite_maintenance_loop
+from app.core.events import event_broker
+from app.core.metrics import MetricsMiddleware, instrument_engines, metrics
+from app.core.migrations import run_migrations
+from app.core.pool import pool_status, prewarm_async_pool, prewarm_pool
+from app.core.query_log import QueryLogMiddleware
+from app.core.security import hashing_executor
+
+
+def serving_engine():
+    # Engine mà các request đang dùng, theo DB_MODE
+    if DB_MODE == "async":
+        database.get_async_sessionmaker()
+        return database.async_engine.sync_engine
+    return engine
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    app.state.ready = False
+    # Tạo / cập nhật bảng bằng Alembic thay vì create_all
+    if RUN_MIGRATIONS_ON_STARTUP:
+        run_migrations(engine)
+
+    # Mở sẵn pool_size connection trước khi nhận traffic
+    if DB_POOL_PREWARM:
+        if DB_MODE == "async":
+            database.get_async_sessionmaker()
+            await prewarm_async_pool(database.async_engine, DB_POOL_SIZE)
+        else:
+            await run_in_threadpool(prewarm_pool, engine, DB_POOL_SIZE)
+
+    # SQLite tuned: định kỳ checkpoint WAL + PRAGMA optimize
+    maintenance = None
+    if (
+        DB_PROFILE == "tuned"
+        and engine.dialect.name == "sqlite"
+        and SQLITE_MAINTENANCE_INTERVAL_SECONDS > 0
+    ):
+        maintenance = asyncio.create_task(
+            sqlite_maintenance_loop(engine, SQLITE_MAINTENANCE_INTERVAL_SECONDS)
+        )
+    app.state.ready = True
+    yield
+    app.state.ready = False
+    if maintenance is not None:
+        maintenance.cancel()
+        with suppress(asyncio.CancelledError):
+            await maintenance
+    hashing_executor.shutdown()
+    event_broker.close()
 
-# Tạo bảng nếu chưa có
-Base.metadata.create_all(bind=engine)
 
-app = FastAPI()
+app = FastAPI(lifespan=lifespan)
+
+if METRICS_ENABLED:
+    instrument_engines()
+    app.add_middleware(MetricsMiddleware)
+
+if QUERY_LOG_ENABLED:
+    app.add_middleware(QueryLogMiddleware)
 
 # Đăng ký các router
 app.include_router(auth.router)
@@ -19,3 +91,22 @@ app.include_router(users.router)
 @app.get("/healthy")
 def health_check():
     return {"status": "healthy"}
+
+
+@app.get("/metrics", include_in_schema=False)
+def read_metrics():
+    # Prometheus text exposition format
+    return Response(content=metrics.render(), media_type="text/plain; version=0.0.4")
+
+
+@app.get("/ready", include_in_schema=False)
+def readiness():
+    # Orchestrator chỉ route traffic tới worker đã warm pool
+    ready = getattr(app.state, "ready", False)
+    return JSONResponse(
+        status_code=200 if ready else 503,
+        content={
+            "status": "ready" if ready else "starting",
+            "pool": pool_status(serving_engine()),
+        },
+    )
@@ -1,4 +1,18 @@
 from app.models.todo import Todos
+from app.models.todo_change import TodoChangeWatermarks, TodoChanges
+from app.models.todo_import import TodoImportErrors, TodoImports
+from app.models.todo_stats import TodoStats
+from app.models.todo_version import TodoVersions
 from app.models.user import Users
+from app.models import todo_search  # noqa: F401  (full-text index của todos)
 
-__all__ = ["Users", "Todos"]
+__all__ = [
+    "Users",
+    "Todos",
+    "TodoVersions",
+    "TodoStats",
+    "TodoChanges",
+    "TodoChangeWatermarks",
+    "TodoImports",
+    "TodoImportErrors",
+]
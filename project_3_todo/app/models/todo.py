@@ -1,4 +1,4 @@
-from sqlalchemy import Boolean, Column, ForeignKey, Integer, String
+from sqlalchemy import Boolean, Column, ForeignKey, Index, Integer, String
 
 from app.core.database import Base
 
@@ -12,3 +12,17 @@ class Todos(Base):
     priority = Column(Integer, nullable=False)
     complete = Column(Boolean, default=False)
     owner_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+
+    # Index cho các query nóng:
+    # - list / get theo id, phân trang theo id
+    # - phân trang theo (priority, id)
+    # - lọc theo trạng thái hoàn thành + priority
+    # - admin phân trang toàn bảng theo (priority, id)
+    __table_args__ = (
+        Index("ix_todos_owner_id_id", "owner_id", "id"),
+        Index("ix_todos_owner_id_priority_id", "owner_id", "priority", "id"),
+        Index(
+            "ix_todos_owner_id_complete_priority", "owner_id", "complete", "priority"
+        ),
+        Index("ix_todos_priority_id", "priority", "id"),
+    )
@@ -0,0 +1,38 @@
+from datetime import datetime, timezone
+
+from sqlalchemy import Column, DateTime, ForeignKey, Index, Integer, String
+
+from app.core.database import Base
+
+
+def utcnow() -> datetime:
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+# Change log append-only cho delta sync (/todos/changes): mỗi thao tác ghi thêm
+# một dòng (op = "upsert" | "delete"); dòng "delete" là tombstone của todo đã xóa
+class TodoChanges(Base):
+    __tablename__ = "todo_changes"
+
+    id = Column(Integer, primary_key=True)
+    owner_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    # Không có FK: todo có thể đã bị xóa (tombstone)
+    todo_id = Column(Integer, nullable=False)
+    op = Column(String(10), nullable=False)
+    changed_at = Column(DateTime, nullable=False, default=utcnow)
+
+    __table_args__ = (
+        Index("ix_todo_changes_owner_id_id", "owner_id", "id"),
+        Index("ix_todo_changes_changed_at", "changed_at"),
+        # SQLite: AUTOINCREMENT để id không bị dùng lại sau khi compaction xóa
+        # các dòng cuối bảng
+        {"sqlite_autoincrement": True},
+    )
+
+
+# Đã compact tới change id nào cho từng owner; cursor cũ hơn => phải resync
+class TodoChangeWatermarks(Base):
+    __tablename__ = "todo_change_watermarks"
+
+    owner_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
+    compacted_through = Column(Integer, nullable=False, default=0)
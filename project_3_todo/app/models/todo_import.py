@@ -0,0 +1,39 @@
+from sqlalchemy import Column, DateTime, ForeignKey, Integer, String, Text
+
+from app.core.database import Base
+from app.models.todo_change import utcnow
+
+
+# Một lần import todo hàng loạt (/todos/imports); các counter được cập nhật
+# trong cùng transaction với mỗi chunk insert => progress luôn khớp dữ liệu
+class TodoImports(Base):
+    __tablename__ = "todo_imports"
+
+    id = Column(Integer, primary_key=True)
+    owner_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
+    format = Column(String(10), nullable=False)
+    # pending -> running -> completed | failed
+    status = Column(String(20), nullable=False, default="pending")
+    bytes_total = Column(Integer, nullable=False, default=0)
+    rows_processed = Column(Integer, nullable=False, default=0)
+    rows_imported = Column(Integer, nullable=False, default=0)
+    rows_failed = Column(Integer, nullable=False, default=0)
+    # Lỗi làm dừng cả job (không phải lỗi của từng dòng)
+    error = Column(Text, nullable=True)
+    created_at = Column(DateTime, nullable=False, default=utcnow)
+    finished_at = Column(DateTime, nullable=True)
+
+
+# Lỗi validate của từng dòng (row: số thứ tự bản ghi trong file, bắt đầu từ 1)
+class TodoImportErrors(Base):
+    __tablename__ = "todo_import_errors"
+
+    id = Column(Integer, primary_key=True)
+    import_id = Column(
+        Integer,
+        ForeignKey("todo_imports.id", ondelete="CASCADE"),
+        nullable=False,
+        index=True,
+    )
+    row = Column(Integer, nullable=False)
+    message = Column(Text, nullable=False)
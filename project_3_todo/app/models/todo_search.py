@@ -0,0 +1,96 @@
+from sqlalchemy import column, event, table
+
+from app.models.todo import Todos
+
+# Full-text index cho todos (title, description), đồng bộ ngay trong database:
+# - SQLite: bảng ảo FTS5 external-content + trigger trên todos
+# - Postgres: cột tsvector generated + GIN index
+# Được tạo / xóa cùng bảng todos (create_all / drop_all) và bởi migration 0004.
+
+SEARCH_TABLE = "todos_fts"
+SEARCH_VECTOR_COLUMN = "search_vector"
+
+# owner_id nằm trong index để MATCH lọc theo owner ngay trên posting list
+SQLITE_CREATE = [
+    f"""CREATE VIRTUAL TABLE IF NOT EXISTS {SEARCH_TABLE} USING fts5(
+        title, description, owner_id,
+        content='todos', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2'
+    )""",
+    f"""CREATE TRIGGER IF NOT EXISTS todos_fts_ai AFTER INSERT ON todos BEGIN
+        INSERT INTO {SEARCH_TABLE}(rowid, title, description, owner_id)
+        VALUES (new.id, new.title, new.description, new.owner_id);
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS todos_fts_ad AFTER DELETE ON todos BEGIN
+        INSERT INTO {SEARCH_TABLE}({SEARCH_TABLE}, rowid, title, description, owner_id)
+        VALUES ('delete', old.id, old.title, old.description, old.owner_id);
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS todos_fts_au AFTER UPDATE ON todos BEGIN
+        INSERT INTO {SEARCH_TABLE}({SEARCH_TABLE}, rowid, title, description, owner_id)
+        VALUES ('delete', old.id, old.title, old.description, old.owner_id);
+        INSERT INTO {SEARCH_TABLE}(rowid, title, description, owner_id)
+        VALUES (new.id, new.title, new.description, new.owner_id);
+    END""",
+    # Index lại các dòng đã có (khi thêm vào database cũ)
+    f"INSERT INTO {SEARCH_TABLE}({SEARCH_TABLE}) VALUES ('rebuild')",
+]
+
+SQLITE_DROP = [
+    "DROP TRIGGER IF EXISTS todos_fts_ai",
+    "DROP TRIGGER IF EXISTS todos_fts_ad",
+    "DROP TRIGGER IF EXISTS todos_fts_au",
+    f"DROP TABLE IF EXISTS {SEARCH_TABLE}",
+]
+
+POSTGRES_CREATE = [
+    f"""ALTER TABLE todos ADD COLUMN IF NOT EXISTS {SEARCH_VECTOR_COLUMN} tsvector
+        GENERATED ALWAYS AS (
+            to_tsvector('simple', coalesce(title, '') || ' ' || coalesce(description, ''))
+        ) STORED""",
+    f"""CREATE INDEX IF NOT EXISTS ix_todos_search_vector
+        ON todos USING gin ({SEARCH_VECTOR_COLUMN})""",
+]
+
+POSTGRES_DROP = [
+    "DROP INDEX IF EXISTS ix_todos_search_vector",
+    f"ALTER TABLE todos DROP COLUMN IF EXISTS {SEARCH_VECTOR_COLUMN}",
+]
+
+CREATE_STATEMENTS = {"sqlite": SQLITE_CREATE, "postgresql": POSTGRES_CREATE}
+DROP_STATEMENTS = {"sqlite": SQLITE_DROP, "postgresql": POSTGRES_DROP}
+
+# Bề mặt query của bảng FTS5 (không phải model: không quản lý bởi metadata)
+todos_fts = table(SEARCH_TABLE, column("rowid"), column("rank"))
+
+
+def include_object(object, name, type_, reflected, compare_to):
+    # Dùng cho Alembic autogenerate: full-text index được quản lý bằng DDL ở
+    # trên, không được đề xuất xóa
+    if type_ == "table" and name.startswith(SEARCH_TABLE):
+        return False
+    if type_ == "column" and name == SEARCH_VECTOR_COLUMN:
+        return False
+    if type_ == "index" and name == "ix_todos_search_vector":
+        return False
+    return True
+
+
+def create_search_index(connection):
+    for statement in CREATE_STATEMENTS.get(connection.dialect.name, []):
+        connection.exec_driver_sql(statement)
+
+
+def drop_search_index(connection):
+    for statement in DROP_STATEMENTS.get(connection.dialect.name, []):
+        connection.exec_driver_sql(statement)
+
+
+@event.listens_for(Todos.__table__, "after_create")
+def _create_search_index(target, connection, **kw):
+    create_search_index(connection)
+
+
+@event.listens_for(Todos.__table__, "before_drop")
+def _drop_search_index(target, connection, **kw):
+    # Bảng FTS5 không tự bị xóa theo todos, index cũ sẽ lệch với dữ liệu mới
+    drop_search_index(connection)
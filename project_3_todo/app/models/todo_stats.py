@@ -0,0 +1,14 @@
+from sqlalchemy import Boolean, Column, ForeignKey, Integer
+
+from app.core.database import Base
+
+
+# Số todo theo (owner, priority, complete), cập nhật trong cùng transaction với
+# mọi thao tác ghi todo => /admin/stats đọc O(số nhóm) thay vì O(số todo)
+class TodoStats(Base):
+    __tablename__ = "todo_stats"
+
+    owner_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
+    priority = Column(Integer, primary_key=True)
+    complete = Column(Boolean, primary_key=True)
+    count = Column(Integer, nullable=False, default=0)
@@ -0,0 +1,12 @@
+from sqlalchemy import Column, ForeignKey, Integer
+
+from app.core.database import Base
+
+
+# Version của toàn bộ todo của một owner, tăng trong cùng transaction với mọi
+# thao tác ghi => dùng làm ETag mà không cần đọc các dòng todo
+class TodoVersions(Base):
+    __tablename__ = "todo_versions"
+
+    owner_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
+    version = Column(Integer, nullable=False, default=0)
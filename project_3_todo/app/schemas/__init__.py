@@ -1,12 +1,38 @@
 from app.schemas.auth import Token, TokenData
-from app.schemas.todo import TodoRequest, TodoResponse
-from app.schemas.user import CreateUserRequest, UserVerification
+from app.schemas.todo import (
+    BULK_MAX_ITEMS,
+    TodoBulkItemResult,
+    TodoBulkUpdateItem,
+    TodoChangesPage,
+    TodoImportResponse,
+    TodoPage,
+    TodoRequest,
+    TodoResponse,
+    TodoStatsResponse,
+)
+from app.schemas.user import (
+    CreateUserRequest,
+    CreateUserResponse,
+    UserListResponse,
+    UserResponse,
+    UserVerification,
+)
 
 __all__ = [
     "CreateUserRequest",
     "UserVerification",
+    "UserResponse",
+    "UserListResponse",
+    "CreateUserResponse",
     "TodoRequest",
     "TodoResponse",
+    "TodoPage",
+    "TodoBulkUpdateItem",
+    "TodoBulkItemResult",
+    "TodoStatsResponse",
+    "TodoChangesPage",
+    "TodoImportResponse",
+    "BULK_MAX_ITEMS",
     "Token",
     "TokenData",
 ]
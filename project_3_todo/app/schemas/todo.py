@@ -1,4 +1,7 @@
-from pydantic import BaseModel, Field
+from datetime import datetime
+from typing import Literal
+
+from pydantic import BaseModel, ConfigDict, Field
 
 
 # Dùng để nhận dữ liệu từ client khi tạo/cập nhật todo
@@ -8,8 +11,8 @@ class TodoRequest(BaseModel):
     priority: int = Field(gt=0, lt=6)
     complete: bool = Field(default=False)
 
-    class Config:
-        json_schema_extra = {
+    model_config = ConfigDict(
+        json_schema_extra={
             "example": {
                 "title": "Learn FastAPI",
                 "description": "So I can build powerful web APIs",
@@ -17,6 +20,21 @@ class TodoRequest(BaseModel):
                 "complete": False,
             }
         }
+    )
+
+
+# Bulk: tối đa số item trong một request (một transaction)
+BULK_MAX_ITEMS = 1000
+
+
+class TodoBulkUpdateItem(TodoRequest):
+    id: int = Field(gt=0)
+
+
+# Kết quả cho từng item trong bulk update / delete
+class TodoBulkItemResult(BaseModel):
+    id: int
+    status: str
 
 
 # Dùng để trả về dữ liệu cho client sau khi đã lưu vào database
@@ -28,5 +46,74 @@ class TodoResponse(BaseModel):
     complete: bool
     owner_id: int
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
+
+
+# Một trang kết quả khi phân trang theo cursor
+class TodoPage(BaseModel):
+    items: list[TodoResponse]
+    next_cursor: str | None = None
+
+
+# Thống kê cho dashboard admin (/admin/stats)
+class TodoStatsGroup(BaseModel):
+    owner_id: int
+    priority: int
+    complete: bool
+    count: int
+
+
+class TodoOwnerStats(BaseModel):
+    owner_id: int
+    total: int
+    completed: int
+
+
+class TodoPriorityStats(BaseModel):
+    priority: int
+    total: int
+    completed: int
+
+
+class TodoStatsResponse(BaseModel):
+    total: int
+    completed: int
+    by_owner: list[TodoOwnerStats]
+    by_priority: list[TodoPriorityStats]
+    groups: list[TodoStatsGroup]
+
+
+# Delta sync (/todos/changes): trạng thái cuối của mỗi todo thay đổi sau cursor
+class TodoChange(BaseModel):
+    todo_id: int
+    op: Literal["upsert", "delete"]
+    todo: TodoResponse | None = None
+
+
+class TodoChangesPage(BaseModel):
+    changes: list[TodoChange]
+    next_cursor: str
+    has_more: bool
+    # True: cursor quá cũ (đã compact), client phải tải lại toàn bộ rồi dùng
+    # next_cursor cho lần sync sau
+    resync_required: bool
+
+
+# Import hàng loạt (/todos/imports)
+class TodoImportError(BaseModel):
+    row: int
+    message: str
+
+
+class TodoImportResponse(BaseModel):
+    id: int
+    format: Literal["jsonl", "csv"]
+    status: Literal["pending", "running", "completed", "failed"]
+    bytes_total: int
+    rows_processed: int
+    rows_imported: int
+    rows_failed: int
+    error: str | None = None
+    created_at: datetime
+    finished_at: datetime | None = None
+    errors: list[TodoImportError]
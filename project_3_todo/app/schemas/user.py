@@ -2,7 +2,7 @@
 # Dùng ở Request body, Response body
 
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 
 """
 Không khai báo id và is_active vì:
@@ -24,3 +24,25 @@ class CreateUserRequest(BaseModel):
 class UserVerification(BaseModel):
     password: str
     new_password: str = Field(min_length=6)
+
+
+# Dữ liệu user trả về cho client (không bao giờ kèm hashed_password)
+class UserResponse(BaseModel):
+    id: int
+    username: str
+    email: str
+    first_name: str | None = None
+    last_name: str | None = None
+    role: str | None = None
+    is_active: bool | None = None
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class UserListResponse(BaseModel):
+    users: list[UserResponse]
+
+
+class CreateUserResponse(BaseModel):
+    message: str
+    user: UserResponse
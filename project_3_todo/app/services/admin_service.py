@@ -1,22 +1,159 @@
+import csv
+import io
+import json
+from collections import Counter
+
+try:
+    import orjson
+except ImportError:  # orjson là optional, fallback về json chuẩn
+    orjson = None
+
 from fastapi import HTTPException
+from sqlalchemy import delete, select
 from sqlalchemy.orm import Session
 
+from app.core.database import SessionLocal
+from app.core.pagination import keyset_page
 from app.models.todo import Todos
+from app.models.todo_stats import TodoStats
+from app.services.todo_service import (
+    TODO_ORDERINGS,
+    adjust_todo_stats,
+    bump_todos_version,
+    invalidate_todo_cache,
+    publish_todo_event,
+    record_todo_changes,
+    stats_key,
+)
+
+
+def get_todos_page_as_admin(
+    user: dict,
+    db: Session,
+    limit: int,
+    cursor: str | None = None,
+    order_by: str = "id",
+):
+    if not user or user.get("role") != "admin":
+        raise HTTPException(status_code=401, detail="Authentication failed")
+    return keyset_page(
+        db.query(Todos), order_by, TODO_ORDERINGS[order_by], limit, cursor
+    )
 
 
-def get_all_todos_as_admin(user: dict, db: Session):
+def get_todo_stats_as_admin(user: dict, db: Session):
+    """
+    Đọc từ bảng todo_stats: O(số nhóm), không đụng tới bảng todos
+    """
     if not user or user.get("role") != "admin":
         raise HTTPException(status_code=401, detail="Authentication failed")
-    return db.query(Todos).all()
+
+    groups = db.execute(
+        select(
+            TodoStats.owner_id,
+            TodoStats.priority,
+            TodoStats.complete,
+            TodoStats.count,
+        ).order_by(TodoStats.owner_id, TodoStats.priority, TodoStats.complete)
+    ).all()
+
+    by_owner, by_priority = {}, {}
+    for group in groups:
+        for rollup, key in ((by_owner, group.owner_id), (by_priority, group.priority)):
+            totals = rollup.setdefault(key, {"total": 0, "completed": 0})
+            totals["total"] += group.count
+            totals["completed"] += group.count if group.complete else 0
+
+    return {
+        "total": sum(group.count for group in groups),
+        "completed": sum(group.count for group in groups if group.complete),
+        "by_owner": [{"owner_id": key, **totals} for key, totals in by_owner.items()],
+        "by_priority": [
+            {"priority": key, **totals} for key, totals in sorted(by_priority.items())
+        ],
+        "groups": [dict(group._mapping) for group in groups],
+    }
+
+
+# Export: đọc theo từng batch qua server-side cursor, không tạo ORM object
+EXPORT_COLUMNS = (
+    Todos.id,
+    Todos.title,
+    Todos.description,
+    Todos.priority,
+    Todos.complete,
+    Todos.owner_id,
+)
+EXPORT_BATCH_SIZE = 1000
+EXPORT_MEDIA_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+
+
+def export_todos_statement():
+    return (
+        select(*EXPORT_COLUMNS)
+        .order_by(Todos.id)
+        .execution_options(yield_per=EXPORT_BATCH_SIZE)
+    )
+
+
+# Header và các batch đều là bytes, dù có orjson hay không
+def export_header(export_format: str) -> bytes:
+    if export_format != "csv":
+        return b""
+    return format_export_rows([[column.key for column in EXPORT_COLUMNS]], "csv")
+
+
+def format_export_rows(rows, export_format: str) -> bytes:
+    if export_format == "csv":
+        buffer = io.StringIO()
+        csv.writer(buffer, lineterminator="\n").writerows(rows)
+        return buffer.getvalue().encode()
+    keys = [column.key for column in EXPORT_COLUMNS]
+    if orjson is not None:
+        return b"".join(orjson.dumps(dict(zip(keys, row))) + b"\n" for row in rows)
+    # Cùng định dạng với orjson: UTF-8, không có khoảng trắng
+    return "".join(
+        json.dumps(dict(zip(keys, row)), ensure_ascii=False, separators=(",", ":"))
+        + "\n"
+        for row in rows
+    ).encode()
+
+
+def stream_todos_as_admin(user: dict, export_format: str = "ndjson"):
+    # Kiểm tra quyền trước khi bắt đầu stream để còn trả được 401
+    if not user or user.get("role") != "admin":
+        raise HTTPException(status_code=401, detail="Authentication failed")
+
+    def generate():
+        yield export_header(export_format)
+        # Session riêng cho stream: sống đến khi gửi xong byte cuối cùng
+        with SessionLocal() as db:
+            result = db.execute(export_todos_statement())
+            for rows in result.partitions():
+                yield format_export_rows(rows, export_format)
+
+    return generate()
 
 
 def delete_todo_as_admin(user: dict, todo_id: int, db: Session):
     if not user or user.get("role") != "admin":
         raise HTTPException(status_code=401, detail="Authentication failed")
 
-    todo_model = db.query(Todos).filter(Todos.id == todo_id).first()
-    if todo_model is None:
+    # DELETE ... RETURNING: một statement, owner lấy từ chính dòng bị xóa
+    deleted = db.execute(
+        delete(Todos)
+        .where(Todos.id == todo_id)
+        .returning(Todos.owner_id, Todos.priority, Todos.complete)
+    ).first()
+    if deleted is None:
         raise HTTPException(status_code=404, detail="Todo not found")
 
-    db.delete(todo_model)
+    owner_id = deleted.owner_id
+    bump_todos_version(db, owner_id)
+    record_todo_changes(db, owner_id, "delete", [todo_id])
+    adjust_todo_stats(
+        db, Counter({stats_key(owner_id, deleted.priority, deleted.complete): -1})
+    )
     db.commit()
+    invalidate_todo_cache(owner_id)
+    publish_todo_event(owner_id, "deleted", [todo_id])
@@ -0,0 +1,51 @@
+# Phiên bản async của admin_service
+from fastapi import HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.core.config import DB_MODE
+from app.core.database import get_async_sessionmaker, run_sync
+from app.services import admin_service
+
+
+async def get_todos_page_as_admin(
+    user: dict,
+    db: AsyncSession | Session,
+    limit: int,
+    cursor: str | None = None,
+    order_by: str = "id",
+):
+    return await run_sync(
+        db,
+        lambda s: admin_service.get_todos_page_as_admin(
+            user, s, limit, cursor, order_by
+        ),
+    )
+
+
+async def get_todo_stats_as_admin(user: dict, db: AsyncSession | Session):
+    return await run_sync(db, lambda s: admin_service.get_todo_stats_as_admin(user, s))
+
+
+async def delete_todo_as_admin(user: dict, todo_id: int, db: AsyncSession | Session):
+    return await run_sync(
+        db, lambda s: admin_service.delete_todo_as_admin(user, todo_id, s)
+    )
+
+
+def stream_todos_as_admin(user: dict, export_format: str = "ndjson"):
+    # Chế độ sync: generator sync, StreamingResponse sẽ chạy nó trong threadpool
+    if DB_MODE != "async":
+        return admin_service.stream_todos_as_admin(user, export_format)
+
+    if not user or user.get("role") != "admin":
+        raise HTTPException(status_code=401, detail="Authentication failed")
+
+    async def generate():
+        yield admin_service.export_header(export_format)
+        async with get_async_sessionmaker()() as db:
+            result = await db.stream(admin_service.export_todos_statement())
+            async for rows in result.partitions():
+                yield admin_service.format_export_rows(rows, export_format)
+
+    return generate()
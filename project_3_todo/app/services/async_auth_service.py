@@ -0,0 +1,37 @@
+# Phiên bản async của auth_service
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.core.database import run_sync
+from app.core.security import ahash_password, averify_password
+from app.schemas import CreateUserRequest
+from app.services import auth_service
+
+
+async def get_all_users(db: AsyncSession | Session):
+    return await run_sync(db, auth_service.get_all_users)
+
+
+async def register_user(
+    create_user_request: CreateUserRequest, db: AsyncSession | Session
+):
+    # Hash ngoài session: bcrypt chạy trên hashing executor
+    hashed_password = await ahash_password(create_user_request.password)
+    return await run_sync(
+        db,
+        lambda s: auth_service.register_user(create_user_request, s, hashed_password),
+    )
+
+
+async def authenticate_user(username: str, password: str, db: AsyncSession | Session):
+    user = await run_sync(db, lambda s: auth_service.get_user_by_username(username, s))
+    if not user or not await averify_password(password, user.hashed_password):
+        return None
+    return user
+
+
+async def authenticate_user_and_get_token(
+    username: str, password: str, db: AsyncSession | Session
+):
+    user = await authenticate_user(username, password, db)
+    return auth_service.get_token_for_user(user)
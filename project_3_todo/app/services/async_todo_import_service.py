@@ -0,0 +1,33 @@
+# Phiên bản async của todo_import_service (background job vẫn chạy sync trong
+# threadpool với session riêng)
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.core.database import run_sync
+from app.services import todo_import_service
+
+
+async def create_import(
+    db: AsyncSession | Session, user_id: int, import_format: str, bytes_total: int
+):
+    return await run_sync(
+        db,
+        lambda s: todo_import_service.create_import(
+            s, user_id, import_format, bytes_total
+        ),
+    )
+
+
+async def get_import(
+    db: AsyncSession | Session,
+    user_id: int,
+    import_id: int,
+    errors_after: int = 0,
+    errors_limit: int = 100,
+):
+    return await run_sync(
+        db,
+        lambda s: todo_import_service.get_import(
+            s, user_id, import_id, errors_after, errors_limit
+        ),
+    )
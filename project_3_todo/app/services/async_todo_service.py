@@ -0,0 +1,106 @@
+# Phiên bản async của todo_service: dùng chung logic, chỉ khác cách chạy IO
+# Hàm đọc được gộp (single-flight) khi có lời gọi giống hệt đang chạy
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.core.database import run_sync
+from app.core.single_flight import coalesced
+from app.schemas.todo import TodoBulkUpdateItem, TodoRequest
+from app.services import todo_service
+
+
+@coalesced
+async def get_all_todos(
+    db: AsyncSession | Session, user_id: int, version: int | None = None
+):
+    return await run_sync(db, lambda s: todo_service.get_all_todos(s, user_id, version))
+
+
+@coalesced
+async def get_todos_version(db: AsyncSession | Session, user_id: int):
+    return await run_sync(db, lambda s: todo_service.get_todos_version(s, user_id))
+
+
+@coalesced
+async def get_todos_page(
+    db: AsyncSession | Session,
+    user_id: int,
+    limit: int,
+    cursor: str | None = None,
+    order_by: str = "id",
+    version: int | None = None,
+):
+    return await run_sync(
+        db,
+        lambda s: todo_service.get_todos_page(
+            s, user_id, limit, cursor, order_by, version
+        ),
+    )
+
+
+@coalesced
+async def search_todos(
+    db: AsyncSession | Session,
+    user_id: int,
+    q: str,
+    limit: int,
+    cursor: str | None = None,
+    version: int | None = None,
+):
+    return await run_sync(
+        db, lambda s: todo_service.search_todos(s, user_id, q, limit, cursor, version)
+    )
+
+
+@coalesced
+async def get_todo_changes(
+    db: AsyncSession | Session, user_id: int, since: str | None, limit: int
+):
+    return await run_sync(
+        db, lambda s: todo_service.get_todo_changes(s, user_id, since, limit)
+    )
+
+
+@coalesced
+async def get_todo_by_id(
+    db: AsyncSession | Session, user_id: int, todo_id: int, version: int | None = None
+):
+    return await run_sync(
+        db, lambda s: todo_service.get_todo_by_id(s, user_id, todo_id, version)
+    )
+
+
+async def create_todo(db: AsyncSession | Session, user_id: int, todo_data: TodoRequest):
+    return await run_sync(db, lambda s: todo_service.create_todo(s, user_id, todo_data))
+
+
+async def update_todo(
+    db: AsyncSession | Session, user_id: int, todo_id: int, todo_data: TodoRequest
+):
+    return await run_sync(
+        db, lambda s: todo_service.update_todo(s, user_id, todo_id, todo_data)
+    )
+
+
+async def delete_todo(db: AsyncSession | Session, user_id: int, todo_id: int):
+    return await run_sync(db, lambda s: todo_service.delete_todo(s, user_id, todo_id))
+
+
+async def bulk_create_todos(
+    db: AsyncSession | Session, user_id: int, items: list[TodoRequest]
+):
+    return await run_sync(
+        db, lambda s: todo_service.bulk_create_todos(s, user_id, items)
+    )
+
+
+async def bulk_update_todos(
+    db: AsyncSession | Session, user_id: int, items: list[TodoBulkUpdateItem]
+):
+    return await run_sync(
+        db, lambda s: todo_service.bulk_update_todos(s, user_id, items)
+    )
+
+
+async def bulk_delete_todos(db: AsyncSession | Session, user_id: int, ids: list[int]):
+    return await run_sync(db, lambda s: todo_service.bulk_delete_todos(s, user_id, ids))
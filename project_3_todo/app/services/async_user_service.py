@@ -0,0 +1,32 @@
+# Phiên bản async của user_service
+from fastapi import HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.core.database import run_sync
+from app.core.security import ahash_password, averify_password
+from app.core.single_flight import coalesced
+from app.schemas import UserVerification
+from app.services import user_service
+
+
+@coalesced
+async def get_user_by_id(user_id: int, db: AsyncSession | Session):
+    # Kết quả có thể được dùng chung giữa các request => chỉ để đọc
+    return await run_sync(db, lambda s: user_service.get_user_by_id(user_id, s))
+
+
+async def change_user_password(
+    user_id: int, data: UserVerification, db: AsyncSession | Session
+):
+    # Không gộp: user_model phải thuộc session của request này để cập nhật
+    user_model = await run_sync(db, lambda s: user_service.get_user_by_id(user_id, s))
+
+    # verify / hash trên hashing executor, không giữ event loop
+    if not await averify_password(data.password, user_model.hashed_password):
+        raise HTTPException(status_code=401, detail="Error on password change")
+
+    hashed_password = await ahash_password(data.new_password)
+    await run_sync(
+        db, lambda s: user_service.set_user_password(user_model, hashed_password, s)
+    )
@@ -2,24 +2,27 @@ from datetime import datetime, timedelta, timezone
 
 from fastapi import HTTPException
 from jose import jwt
-from passlib.context import CryptContext
 from sqlalchemy.orm import Session
 
 from app.core.config import ACCESS_TOKEN_EXPIRE_DELTA, ALGORITHM, SECRET_KEY
+from app.core.security import hash_password, verify_password
 from app.models import Users
 from app.schemas import CreateUserRequest
 
-# Khởi tạo đối tượng Bcrypt hashing để mã hóa mật khẩu
-bcrypt_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
-
 
 def get_all_users(db: Session):
     return db.query(Users).all()
 
 
-def register_user(create_user_request: CreateUserRequest, db: Session):
-    user_data = create_user_request.dict()
-    user_data["hashed_password"] = bcrypt_context.hash(user_data.pop("password"))
+def register_user(
+    create_user_request: CreateUserRequest,
+    db: Session,
+    hashed_password: str | None = None,
+):
+    # hashed_password: đã được hash sẵn ở tầng async (ngoài event loop)
+    user_data = create_user_request.model_dump()
+    password = user_data.pop("password")
+    user_data["hashed_password"] = hashed_password or hash_password(password)
     user_data["is_active"] = True
 
     new_user = Users(**user_data)
@@ -29,9 +32,13 @@ def register_user(create_user_request: CreateUserRequest, db: Session):
     return new_user
 
 
+def get_user_by_username(username: str, db: Session):
+    return db.query(Users).filter(Users.username == username).first()
+
+
 def authenticate_user(username: str, password: str, db: Session):
-    user = db.query(Users).filter(Users.username == username).first()
-    if not user or not bcrypt_context.verify(password, user.hashed_password):
+    user = get_user_by_username(username, db)
+    if not user or not verify_password(password, user.hashed_password):
         return None
     return user
 
@@ -46,6 +53,10 @@ def create_access_token(
 
 def authenticate_user_and_get_token(username: str, password: str, db: Session):
     user = authenticate_user(username, password, db)
+    return get_token_for_user(user)
+
+
+def get_token_for_user(user: Users | None):
     if not user:
         raise HTTPException(status_code=401, detail="Invalid credentials")
 
@@ -0,0 +1,334 @@
+# Import todo hàng loạt từ file JSONL / CSV
+# - upload được ghi thẳng ra file tạm theo từng chunk (không giữ cả file trong RAM)
+# - background job đọc file từng dòng, validate theo batch, insert theo chunk;
+#   mỗi chunk là một transaction, kèm cập nhật progress của job
+import codecs
+import csv
+import json
+import logging
+import os
+import tempfile
+from collections import Counter
+from itertools import islice
+
+import anyio
+from fastapi import HTTPException
+from pydantic import TypeAdapter, ValidationError
+from sqlalchemy import insert, select, update
+from sqlalchemy.orm import Session
+
+from app.core.config import (
+    IMPORT_CHUNK_SIZE,
+    IMPORT_MAX_BYTES,
+    IMPORT_MAX_ERRORS,
+    IMPORT_SPOOL_DIR,
+)
+from app.core.database import SessionLocal
+from app.models.todo import Todos
+from app.models.todo_change import utcnow
+from app.models.todo_import import TodoImportErrors, TodoImports
+from app.schemas.todo import TodoRequest
+from app.services.todo_service import (
+    TODO_COLUMNS,
+    adjust_todo_stats,
+    bump_todos_version,
+    invalidate_todo_cache,
+    publish_todo_event,
+    record_todo_changes,
+    stats_key,
+)
+
+try:
+    import orjson
+except ImportError:  # orjson là optional, fallback về json chuẩn
+    orjson = None
+
+logger = logging.getLogger(__name__)
+
+json_loads = orjson.loads if orjson is not None else json.loads
+
+IMPORT_FORMATS = ("jsonl", "csv")
+# Content-Type => format, khi client không truyền ?format=
+IMPORT_CONTENT_TYPES = {
+    "application/x-ndjson": "jsonl",
+    "application/jsonl": "jsonl",
+    "application/x-jsonlines": "jsonl",
+    "text/csv": "csv",
+}
+
+IMPORT_COLUMNS = (
+    TodoImports.id,
+    TodoImports.format,
+    TodoImports.status,
+    TodoImports.bytes_total,
+    TodoImports.rows_processed,
+    TodoImports.rows_imported,
+    TodoImports.rows_failed,
+    TodoImports.error,
+    TodoImports.created_at,
+    TodoImports.finished_at,
+)
+
+todo_batch_adapter = TypeAdapter(list[TodoRequest])
+
+
+def resolve_import_format(import_format: str | None, content_type: str | None):
+    if import_format:
+        return import_format
+    media_type = (content_type or "").split(";")[0].strip().lower()
+    if media_type not in IMPORT_CONTENT_TYPES:
+        raise HTTPException(
+            status_code=415,
+            detail="Unsupported import format, use ?format=jsonl or ?format=csv",
+        )
+    return IMPORT_CONTENT_TYPES[media_type]
+
+
+async def spool_upload(chunks) -> tuple[str, int]:
+    """
+    Ghi body của request ra file tạm; trả về (path, số byte).
+    Bộ nhớ dùng không phụ thuộc kích thước file.
+    """
+    fd, path = tempfile.mkstemp(prefix="todo-import-", dir=IMPORT_SPOOL_DIR)
+    os.close(fd)
+    size = 0
+    try:
+        async with await anyio.open_file(path, "wb") as spool:
+            async for chunk in chunks:
+                size += len(chunk)
+                if size > IMPORT_MAX_BYTES:
+                    raise HTTPException(
+                        status_code=413,
+                        detail=f"Import file exceeds {IMPORT_MAX_BYTES} bytes",
+                    )
+                await spool.write(chunk)
+        if size == 0:
+            raise HTTPException(status_code=400, detail="Import file is empty")
+    except BaseException:
+        os.unlink(path)
+        raise
+    return path, size
+
+
+def create_import(db: Session, user_id: int, import_format: str, bytes_total: int):
+    job = TodoImports(owner_id=user_id, format=import_format, bytes_total=bytes_total)
+    db.add(job)
+    db.commit()
+    return get_import(db, user_id, job.id, errors_limit=0)
+
+
+def get_import(
+    db: Session,
+    user_id: int,
+    import_id: int,
+    errors_after: int = 0,
+    errors_limit: int = 100,
+):
+    row = db.execute(
+        select(*IMPORT_COLUMNS).where(
+            TodoImports.id == import_id, TodoImports.owner_id == user_id
+        )
+    ).first()
+    if row is None:
+        raise HTTPException(status_code=404, detail="Import not found")
+    # Lỗi từng dòng, phân trang theo số dòng (errors_after = row cuối đã đọc)
+    errors = db.execute(
+        select(TodoImportErrors.row, TodoImportErrors.message)
+        .where(
+            TodoImportErrors.import_id == import_id,
+            TodoImportErrors.row > errors_after,
+        )
+        .order_by(TodoImportErrors.row)
+        .limit(errors_limit)
+    ).all()
+    return {**row._mapping, "errors": [dict(error._mapping) for error in errors]}
+
+
+# =============================================================================
+# BACKGROUND JOB
+# =============================================================================
+
+
+def iter_import_records(path: str, import_format: str):
+    """
+    Đọc file từng dòng; yield (số thứ tự bản ghi, dict | thông báo lỗi parse).
+    """
+    if import_format == "csv":
+        yield from _iter_csv_records(path)
+        return
+
+    # JSONL: đọc bytes, mỗi dòng được decode riêng => byte lỗi chỉ làm hỏng dòng đó
+    with open(path, "rb") as source:
+        row = 0
+        for line in source:
+            if row == 0:
+                line = line.removeprefix(codecs.BOM_UTF8)
+            if not line.strip():
+                continue
+            row += 1
+            try:
+                record = json_loads(line)
+            except ValueError as exc:
+                yield row, f"Invalid JSON: {exc}"
+                continue
+            if not isinstance(record, dict):
+                yield row, "Expected a JSON object"
+                continue
+            yield row, record
+
+
+def _is_decoded(value: str) -> bool:
+    # Byte lỗi được surrogateescape giữ lại dưới dạng surrogate (\udc80-\udcff)
+    try:
+        value.encode()
+    except UnicodeEncodeError:
+        return False
+    return True
+
+
+def _iter_csv_records(path: str):
+    # utf-8-sig: bỏ BOM của file CSV xuất từ Excel; surrogateescape: byte lỗi
+    # không dừng việc đọc file, dòng chứa nó được báo lỗi như JSONL
+    with open(
+        path, encoding="utf-8-sig", errors="surrogateescape", newline=""
+    ) as source:
+        reader = csv.DictReader(source)
+        row = 0
+        while True:
+            row += 1
+            try:
+                record = next(reader)
+            except StopIteration:
+                return
+            except csv.Error as exc:
+                # csv reader bắt đầu lại ở dòng kế tiếp
+                yield row, f"Invalid CSV: {exc}"
+                continue
+            if not all(
+                _is_decoded(value)
+                for value in record.values()
+                if isinstance(value, str)
+            ):
+                yield row, "Invalid UTF-8"
+                continue
+            # Ô trống => dùng giá trị mặc định của TodoRequest
+            yield row, {
+                key: value
+                for key, value in record.items()
+                if key is not None and value not in (None, "")
+            }
+
+
+def _format_validation_error(exc: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(part) for part in error['loc']) or 'row'}: {error['msg']}"
+        for error in exc.errors()
+    )
+
+
+def validate_import_chunk(chunk):
+    """
+    Trả về (list TodoRequest hợp lệ, list (row, lỗi)).
+    Validate cả batch một lần; chỉ khi batch có lỗi mới validate lại từng dòng.
+    """
+    errors = [(row, record) for row, record in chunk if isinstance(record, str)]
+    records = [(row, record) for row, record in chunk if isinstance(record, dict)]
+    try:
+        return todo_batch_adapter.validate_python([r for _, r in records]), errors
+    except ValidationError:
+        pass
+
+    items = []
+    for row, record in records:
+        try:
+            items.append(TodoRequest.model_validate(record))
+        except ValidationError as exc:
+            errors.append((row, _format_validation_error(exc)))
+    errors.sort()
+    return items, errors
+
+
+def insert_import_chunk(db: Session, user_id: int, items: list[TodoRequest]):
+    """
+    Trả về các todo đã tạo (dict, cùng dạng với payload event "created")
+    """
+    # Core INSERT ... RETURNING theo batch (insertmanyvalues), bỏ qua ORM
+    todos = [
+        dict(row._mapping)
+        for row in db.execute(
+            insert(Todos.__table__).returning(*TODO_COLUMNS),
+            [
+                {**values, "owner_id": user_id}
+                for values in todo_batch_adapter.dump_python(items)
+            ],
+        )
+    ]
+    ids = [todo["id"] for todo in todos]
+    bump_todos_version(db, user_id)
+    record_todo_changes(db, user_id, "upsert", ids)
+    adjust_todo_stats(
+        db, Counter(stats_key(user_id, item.priority, item.complete) for item in items)
+    )
+    return todos
+
+
+def _set_import(db: Session, import_id: int, **values):
+    db.execute(update(TodoImports).where(TodoImports.id == import_id).values(values))
+
+
+def run_import(import_id: int, path: str, chunk_size: int = IMPORT_CHUNK_SIZE):
+    """
+    Chạy ở background (threadpool), với session riêng. Các chunk đã commit được
+    giữ lại khi job lỗi giữa chừng; progress cho biết chính xác đã import tới đâu.
+    """
+    try:
+        with SessionLocal() as db:
+            job = db.get(TodoImports, import_id)
+            user_id, import_format = job.owner_id, job.format
+            _set_import(db, import_id, status="running")
+            db.commit()
+
+            stored_errors = 0
+            try:
+                records = iter_import_records(path, import_format)
+                while chunk := list(islice(records, chunk_size)):
+                    items, errors = validate_import_chunk(chunk)
+                    todos = insert_import_chunk(db, user_id, items) if items else []
+                    to_store = errors[: max(IMPORT_MAX_ERRORS - stored_errors, 0)]
+                    if to_store:
+                        db.execute(
+                            insert(TodoImportErrors),
+                            [
+                                {"import_id": import_id, "row": row, "message": msg}
+                                for row, msg in to_store
+                            ],
+                        )
+                        stored_errors += len(to_store)
+                    _set_import(
+                        db,
+                        import_id,
+                        rows_processed=TodoImports.rows_processed + len(chunk),
+                        rows_imported=TodoImports.rows_imported + len(todos),
+                        rows_failed=TodoImports.rows_failed + len(errors),
+                    )
+                    db.commit()
+                    if todos:
+                        invalidate_todo_cache(user_id)
+                        publish_todo_event(
+                            user_id, "created", [todo["id"] for todo in todos], todos
+                        )
+            except Exception as exc:
+                db.rollback()
+                logger.exception("Todo import %s failed", import_id)
+                _set_import(
+                    db,
+                    import_id,
+                    status="failed",
+                    error=str(exc)[:1000],
+                    finished_at=utcnow(),
+                )
+            else:
+                _set_import(db, import_id, status="completed", finished_at=utcnow())
+            db.commit()
+    finally:
+        os.unlink(path)
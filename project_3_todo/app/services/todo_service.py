@@ -1,15 +1,472 @@
+import re
+from collections import Counter
+from datetime import datetime
+
 from fastapi import HTTPException
+from sqlalchemy import bindparam, delete, func, insert, literal_column, select, update
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.orm import Session
 
+from app.core.cache import CacheStats, create_cache_backend
+from app.core.config import (
+    REDIS_URL,
+    TODO_CACHE_BACKEND,
+    TODO_CACHE_MAX_SIZE,
+    TODO_CACHE_TTL_SECONDS,
+)
+from app.core.database import ReplicaBehind, is_replica_session, run_blocking
+from app.core.events import event_broker
+from app.core.metrics import metrics
+from app.core.pagination import decode_cursor, encode_cursor, keyset_page
+from app.core.single_flight import single_flight
 from app.models.todo import Todos
-from app.schemas.todo import TodoRequest
+from app.models.todo_change import TodoChangeWatermarks, TodoChanges, utcnow
+from app.models.todo_stats import TodoStats
+from app.models.todo_search import SEARCH_VECTOR_COLUMN, todos_fts
+from app.models.todo_version import TodoVersions
+from app.schemas.todo import TodoBulkUpdateItem, TodoRequest
+
+TODO_COLUMNS = (
+    Todos.id,
+    Todos.title,
+    Todos.description,
+    Todos.priority,
+    Todos.complete,
+    Todos.owner_id,
+)
+
+# Khóa sắp xếp cho phân trang theo cursor (luôn kết thúc bằng id để duy nhất)
+TODO_ORDERINGS = {
+    "id": (Todos.id,),
+    "priority": (Todos.priority, Todos.id),
+}
+
+
+# =============================================================================
+# READ-THROUGH CACHE
+# - mọi key (item, list, page) chứa version của owner trong todo_versions (tăng
+#   trong cùng transaction với thao tác ghi) => entry cũ không bao giờ được đọc
+#   lại, mọi worker / process thấy cùng một version
+# - read_with_etag truyền vào đúng version đã dùng cho ETag => body trong cache
+#   khớp với ETag; không truyền thì đọc version trước khi đọc dữ liệu
+# - cache hit không chạm database; chỉ khi miss mới kiểm tra replica đã bắt kịp
+#   version chưa (ReplicaBehind => caller đọc lại trên primary)
+# =============================================================================
+
+todo_cache = create_cache_backend(TODO_CACHE_BACKEND, TODO_CACHE_MAX_SIZE, REDIS_URL)
+todo_cache_stats = CacheStats()
+metrics.register_cache("todo", todo_cache_stats.as_dict)
+
+
+def _cache_io(call, *args):
+    # Backend Redis: không gọi trên event loop khi chạy trong AsyncSession.run_sync
+    return run_blocking(call, *args) if todo_cache.blocking else call(*args)
+
+
+def _cache_key(user_id: int, version: int, *parts) -> str:
+    return f"todos:{user_id}:v{version}:" + ":".join(str(part) for part in parts)
+
+
+def _cached(db: Session, user_id: int, version: int | None, parts: tuple, loader):
+    if version is None:
+        version = get_todos_version(db, user_id)
+    key = _cache_key(user_id, version, *parts)
+    value = _cache_io(todo_cache.get, key)
+    todo_cache_stats.record(hit=value is not None)
+    if value is None:
+        # Replica trễ: dữ liệu cũ không được trả về / ghi vào key của version mới
+        if is_replica_session(db) and get_todos_version(db, user_id) < version:
+            raise ReplicaBehind
+        value = loader()
+        _cache_io(todo_cache.set, key, value, TODO_CACHE_TTL_SECONDS)
+    return value
+
+
+def invalidate_todo_cache(user_id: int):
+    # Entry của version cũ không còn được đọc (key theo version), tự hết hạn theo
+    # TTL / bị LRU loại bỏ; lần đọc sau không dùng chung kết quả với lần đọc
+    # bắt đầu trước khi ghi
+    single_flight.forget(user_id)
+
+
+# =============================================================================
+# CHANGE FEED: event gửi tới subscriber của owner sau khi commit
+# =============================================================================
+
+
+def todo_channel(user_id: int) -> str:
+    return f"todos:{user_id}"
+
+
+def publish_todo_event(
+    user_id: int, event_type: str, ids: list[int], todos: list[dict] | None = None
+):
+    if not ids:
+        return
+    event = {"type": event_type, "owner_id": user_id, "ids": list(ids)}
+    if todos is not None:
+        event["todos"] = todos
+    if event_broker.backend.blocking:
+        # Như _cache_io: Redis publish không chạy trên event loop
+        run_blocking(event_broker.publish, todo_channel(user_id), event)
+    else:
+        event_broker.publish(todo_channel(user_id), event)
+
+
+# =============================================================================
+# VERSION theo owner (dùng cho ETag), tăng trong cùng transaction với thao tác ghi
+# =============================================================================
+
+UPSERT_INSERTS = {"sqlite": sqlite_insert, "postgresql": postgresql_insert}
+
+
+def get_todos_version(db: Session, user_id: int) -> int:
+    version = db.scalar(
+        select(TodoVersions.version).where(TodoVersions.owner_id == user_id)
+    )
+    return version or 0
+
+
+def bump_todos_version(db: Session, user_id: int):
+    dialect = db.get_bind().dialect.name
+    if dialect in UPSERT_INSERTS:
+        stmt = (
+            UPSERT_INSERTS[dialect](TodoVersions)
+            .values(owner_id=user_id, version=1)
+            .on_conflict_do_update(
+                index_elements=[TodoVersions.owner_id],
+                set_={"version": TodoVersions.version + 1},
+            )
+        )
+        db.execute(stmt)
+        return
+    updated = db.execute(
+        update(TodoVersions)
+        .where(TodoVersions.owner_id == user_id)
+        .values(version=TodoVersions.version + 1)
+    )
+    if updated.rowcount == 0:
+        db.add(TodoVersions(owner_id=user_id, version=1))
+
+
+# =============================================================================
+# STATS theo (owner, priority, complete), cập nhật trong cùng transaction với
+# thao tác ghi; rebuild_todo_stats tính lại toàn bộ bằng GROUP BY
+# =============================================================================
+
+
+def stats_key(user_id: int, priority: int, complete) -> tuple:
+    return (user_id, priority, bool(complete))
+
+
+def adjust_todo_stats(db: Session, changes: Counter):
+    """
+    changes: {(owner_id, priority, complete): delta}
+    """
+    changes = {key: delta for key, delta in changes.items() if delta}
+    if not changes:
+        return
+    rows = [
+        {
+            "owner_id": owner_id,
+            "priority": priority,
+            "complete": complete,
+            "count": delta,
+        }
+        for (owner_id, priority, complete), delta in changes.items()
+    ]
+    dialect = db.get_bind().dialect.name
+    if dialect in UPSERT_INSERTS:
+        stmt = UPSERT_INSERTS[dialect](TodoStats).values(rows)
+        db.execute(
+            stmt.on_conflict_do_update(
+                index_elements=[
+                    TodoStats.owner_id,
+                    TodoStats.priority,
+                    TodoStats.complete,
+                ],
+                set_={"count": TodoStats.count + stmt.excluded.count},
+            )
+        )
+    else:
+        for row in rows:
+            updated = db.execute(
+                update(TodoStats)
+                .where(
+                    TodoStats.owner_id == row["owner_id"],
+                    TodoStats.priority == row["priority"],
+                    TodoStats.complete == row["complete"],
+                )
+                .values(count=TodoStats.count + row["count"])
+            )
+            if updated.rowcount == 0:
+                db.add(TodoStats(**row))
+    # Nhóm về 0 thì xóa để bảng chỉ chứa các nhóm đang có todo
+    if any(delta < 0 for delta in changes.values()):
+        db.execute(
+            delete(TodoStats).where(
+                TodoStats.count <= 0,
+                TodoStats.owner_id.in_({key[0] for key in changes}),
+            )
+        )
+
+
+def rebuild_todo_stats(db: Session) -> int:
+    complete = func.coalesce(Todos.complete, False)
+    db.execute(delete(TodoStats))
+    db.execute(
+        insert(TodoStats).from_select(
+            ["owner_id", "priority", "complete", "count"],
+            select(Todos.owner_id, Todos.priority, complete, func.count()).group_by(
+                Todos.owner_id, Todos.priority, complete
+            ),
+        )
+    )
+    db.commit()
+    return db.scalar(select(func.count()).select_from(TodoStats))
+
+
+# =============================================================================
+# CHANGE LOG cho delta sync (/todos/changes)
+# =============================================================================
+
+
+def record_todo_changes(db: Session, user_id: int, op: str, todo_ids):
+    """
+    op: "upsert" | "delete". Phải gọi SAU bump_todos_version: row lock của
+    todo_versions tuần tự hóa các transaction ghi của cùng owner, nên change id
+    của một owner được cấp và commit theo đúng thứ tự => cursor không bỏ sót.
+    """
+    changed_at = utcnow()
+    rows = [
+        {"owner_id": user_id, "todo_id": todo_id, "op": op, "changed_at": changed_at}
+        for todo_id in todo_ids
+    ]
+    if rows:
+        # Core executemany: không qua ORM bulk persistence (nhanh hơn khi import)
+        db.execute(insert(TodoChanges.__table__), rows)
+
+
+def get_todo_changes(db: Session, user_id: int, since: str | None, limit: int):
+    since_id = decode_cursor(since, "changes", 1)[0] if since else 0
+    watermark = (
+        db.scalar(
+            select(TodoChangeWatermarks.compacted_through).where(
+                TodoChangeWatermarks.owner_id == user_id
+            )
+        )
+        or 0
+    )
+    if since_id < watermark:
+        # Các entry sau cursor đã bị compact: client phải tải lại toàn bộ rồi
+        # tiếp tục từ cursor mới
+        head = db.scalar(
+            select(func.max(TodoChanges.id)).where(TodoChanges.owner_id == user_id)
+        )
+        return {
+            "changes": [],
+            "next_cursor": encode_cursor("changes", [max(head or 0, watermark)]),
+            "has_more": False,
+            "resync_required": True,
+        }
+
+    rows = db.execute(
+        select(TodoChanges.id, TodoChanges.todo_id, TodoChanges.op)
+        .where(TodoChanges.owner_id == user_id, TodoChanges.id > since_id)
+        .order_by(TodoChanges.id)
+        .limit(limit + 1)
+    ).all()
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+
+    # Nhiều thay đổi của cùng một todo => chỉ gửi trạng thái cuối
+    latest: dict[int, str] = {}
+    for row in rows:
+        latest.pop(row.todo_id, None)
+        latest[row.todo_id] = row.op
+    upsert_ids = [todo_id for todo_id, op in latest.items() if op == "upsert"]
+    current = {}
+    if upsert_ids:
+        current = {
+            row.id: dict(row._mapping)
+            for row in db.execute(
+                select(*TODO_COLUMNS).where(
+                    Todos.owner_id == user_id, Todos.id.in_(upsert_ids)
+                )
+            )
+        }
+
+    changes = []
+    for todo_id, op in latest.items():
+        todo = current.get(todo_id) if op == "upsert" else None
+        # Upsert mà todo không còn: đã bị xóa ở một entry sau cursor trang này
+        changes.append(
+            {"todo_id": todo_id, "op": "upsert" if todo else "delete", "todo": todo}
+        )
+    return {
+        "changes": changes,
+        "next_cursor": encode_cursor("changes", [rows[-1].id if rows else since_id]),
+        "has_more": has_more,
+        "resync_required": False,
+    }
+
 
+def compact_todo_changes(db: Session, older_than: datetime) -> int:
+    """
+    Xóa entry cũ hơn older_than; ghi lại watermark theo owner để báo client có
+    cursor cũ phải resync.
+    """
+    marks = db.execute(
+        select(TodoChanges.owner_id, func.max(TodoChanges.id).label("through"))
+        .where(TodoChanges.changed_at < older_than)
+        .group_by(TodoChanges.owner_id)
+    ).all()
+    if not marks:
+        return 0
 
-def get_all_todos(db: Session, user_id: int):
-    return db.query(Todos).filter(Todos.owner_id == user_id).all()
+    rows = [
+        {"owner_id": row.owner_id, "compacted_through": row.through} for row in marks
+    ]
+    dialect = db.get_bind().dialect.name
+    if dialect in UPSERT_INSERTS:
+        stmt = UPSERT_INSERTS[dialect](TodoChangeWatermarks).values(rows)
+        # Watermark không bao giờ lùi (vd. chạy lại với retention dài hơn):
+        # GREATEST trên Postgres, max() vô hướng trên SQLite
+        greatest = func.greatest if dialect == "postgresql" else func.max
+        db.execute(
+            stmt.on_conflict_do_update(
+                index_elements=[TodoChangeWatermarks.owner_id],
+                set_={
+                    "compacted_through": greatest(
+                        TodoChangeWatermarks.compacted_through,
+                        stmt.excluded.compacted_through,
+                    )
+                },
+            )
+        )
+    else:
+        for row in rows:
+            mark = db.get(TodoChangeWatermarks, row["owner_id"], with_for_update=True)
+            if mark is None:
+                db.add(TodoChangeWatermarks(**row))
+            elif mark.compacted_through < row["compacted_through"]:
+                mark.compacted_through = row["compacted_through"]
+
+    # Xóa đúng phần đã ghi vào watermark của từng owner
+    deleted = db.execute(
+        delete(TodoChanges.__table__).where(
+            TodoChanges.owner_id == bindparam("owner_id"),
+            TodoChanges.id <= bindparam("compacted_through"),
+        ),
+        rows,
+    ).rowcount
+    db.commit()
+    return deleted
+
+
+def todo_to_dict(todo: Todos) -> dict:
+    return {column.key: getattr(todo, column.key) for column in TODO_COLUMNS}
+
+
+def get_all_todos(db: Session, user_id: int, version: int | None = None):
+    return _cached(
+        db,
+        user_id,
+        version,
+        ("all",),
+        lambda: [
+            todo_to_dict(todo)
+            for todo in db.query(Todos).filter(Todos.owner_id == user_id)
+        ],
+    )
+
+
+def get_todos_page(
+    db: Session,
+    user_id: int,
+    limit: int,
+    cursor: str | None = None,
+    order_by: str = "id",
+    version: int | None = None,
+):
+    def load():
+        query = db.query(Todos).filter(Todos.owner_id == user_id)
+        page = keyset_page(query, order_by, TODO_ORDERINGS[order_by], limit, cursor)
+        return {**page, "items": [todo_to_dict(todo) for todo in page["items"]]}
+
+    return _cached(db, user_id, version, ("page", order_by, limit, cursor), load)
+
+
+# =============================================================================
+# FULL-TEXT SEARCH (FTS5 / tsvector), xem app/models/todo_search.py
+# =============================================================================
+
+SEARCH_MAX_TERMS = 8
+_SEARCH_TERM = re.compile(r"\w+", re.UNICODE)
 
 
-def get_todo_by_id(db: Session, user_id: int, todo_id: int):
+def search_terms(q: str) -> list[str]:
+    # Chỉ giữ ký tự chữ / số => không cần escape cú pháp MATCH / tsquery
+    return _SEARCH_TERM.findall(q.lower())[:SEARCH_MAX_TERMS]
+
+
+def _search_query(db: Session, user_id: int, terms: list[str]):
+    """
+    Trả về (query, rank); rank tăng dần = liên quan giảm dần.
+    """
+    dialect = db.get_bind().dialect.name
+    if dialect == "sqlite":
+        # Mỗi từ khớp tiền tố ("milk"*), chỉ trong title / description
+        phrases = " AND ".join(f'"{term}"*' for term in terms)
+        match = f"owner_id:{user_id} AND {{title description}}: ({phrases})"
+        rank = literal_column("todos_fts.rank").label("rank")
+        # owner_id trong MATCH chỉ để thu hẹp index; quyền sở hữu kiểm tra
+        # trên dòng todos như nhánh Postgres
+        query = (
+            db.query(*TODO_COLUMNS, rank)
+            .join(todos_fts, todos_fts.c.rowid == Todos.id)
+            .filter(
+                Todos.owner_id == user_id,
+                literal_column("todos_fts").op("MATCH")(match),
+            )
+        )
+        return query, rank
+    if dialect == "postgresql":
+        tsquery = func.to_tsquery("simple", " & ".join(f"{t}:*" for t in terms))
+        vector = literal_column(f"todos.{SEARCH_VECTOR_COLUMN}")
+        rank = (-func.ts_rank(vector, tsquery)).label("rank")
+        query = db.query(*TODO_COLUMNS, rank).filter(
+            Todos.owner_id == user_id, vector.op("@@")(tsquery)
+        )
+        return query, rank
+    raise HTTPException(status_code=501, detail="Search is not supported")
+
+
+def search_todos(
+    db: Session,
+    user_id: int,
+    q: str,
+    limit: int,
+    cursor: str | None = None,
+    version: int | None = None,
+):
+    terms = search_terms(q)
+    if not terms:
+        return {"items": [], "next_cursor": None}
+
+    def load():
+        query, rank = _search_query(db, user_id, terms)
+        page = keyset_page(query, "search", (rank, Todos.id), limit, cursor)
+        return {**page, "items": [todo_to_dict(row) for row in page["items"]]}
+
+    return _cached(
+        db, user_id, version, ("search", " ".join(terms), limit, cursor), load
+    )
+
+
+def get_todo_model(db: Session, user_id: int, todo_id: int):
+    # Không qua cache: dùng khi cần ORM object để sửa / xóa
     todo = (
         db.query(Todos).filter(Todos.id == todo_id, Todos.owner_id == user_id).first()
     )
@@ -18,23 +475,227 @@ def get_todo_by_id(db: Session, user_id: int, todo_id: int):
     return todo
 
 
+def get_todo_by_id(db: Session, user_id: int, todo_id: int, version: int | None = None):
+    return _cached(
+        db,
+        user_id,
+        version,
+        ("item", todo_id),
+        lambda: todo_to_dict(get_todo_model(db, user_id, todo_id)),
+    )
+
+
 def create_todo(db: Session, user_id: int, todo_data: TodoRequest):
-    todo_model = Todos(**todo_data.dict(), owner_id=user_id)
+    todo_model = Todos(**todo_data.model_dump(), owner_id=user_id)
     db.add(todo_model)
+    bump_todos_version(db, user_id)
+    db.flush()
+    record_todo_changes(db, user_id, "upsert", [todo_model.id])
+    adjust_todo_stats(
+        db, Counter({stats_key(user_id, todo_data.priority, todo_data.complete): 1})
+    )
     db.commit()
     db.refresh(todo_model)
+    invalidate_todo_cache(user_id)
+    publish_todo_event(user_id, "created", [todo_model.id], [todo_to_dict(todo_model)])
     return todo_model
 
 
+def update_todo_with_old_statement(user_id: int, todo_id: int, values: dict):
+    """
+    PostgreSQL: WITH old AS (SELECT ... FOR UPDATE) UPDATE ... FROM old
+    RETURNING ...; CTE đọc theo snapshot đầu statement => trả về được cả giá
+    trị trước khi UPDATE trong một round-trip
+    """
+    todos = Todos.__table__
+    old = (
+        select(todos.c.id, todos.c.priority, todos.c.complete)
+        .where(todos.c.id == todo_id, todos.c.owner_id == user_id)
+        .with_for_update()
+        .cte("old")
+    )
+    return (
+        update(todos)
+        .where(todos.c.id == old.c.id)
+        .values(values)
+        .returning(
+            *TODO_COLUMNS,
+            old.c.priority.label("old_priority"),
+            old.c.complete.label("old_complete"),
+        )
+    )
+
+
+def _update_todo_returning(db: Session, user_id: int, todo_id: int, values: dict):
+    """
+    UPDATE ... WHERE id AND owner_id RETURNING: dòng sau khi sửa kèm priority /
+    complete cũ (old_priority, old_complete) cho todo_stats; None nếu không có
+    todo của owner. Trên SQLite caller phải giữ write lock trước (vd. đã bump
+    todo_versions) để không có lệnh ghi nào chen giữa SELECT và UPDATE.
+    """
+    todos = Todos.__table__
+    owned = (todos.c.id == todo_id, todos.c.owner_id == user_id)
+    if db.get_bind().dialect.name == "postgresql":
+        row = db.execute(update_todo_with_old_statement(user_id, todo_id, values))
+        row = row.first()
+        return None if row is None else dict(row._mapping)
+
+    # SQLite: RETURNING chỉ thấy giá trị mới => đọc khóa stats cũ trước, trong
+    # cùng transaction (SQLite chạy in-process, không tốn network round-trip)
+    old = db.execute(select(todos.c.priority, todos.c.complete).where(*owned)).first()
+    if old is None:
+        return None
+    row = db.execute(
+        update(todos).where(*owned).values(values).returning(*TODO_COLUMNS)
+    ).first()
+    if row is None:
+        return None
+    return {**row._mapping, "old_priority": old.priority, "old_complete": old.complete}
+
+
 def update_todo(db: Session, user_id: int, todo_id: int, todo_data: TodoRequest):
-    todo = get_todo_by_id(db, user_id, todo_id)
-    for key, value in todo_data.dict().items():
-        setattr(todo, key, value)
+    # Bump trước: SQLite giữ write lock từ đây, lệnh ghi khác (vd. xóa todo này)
+    # không chen giữa lúc đọc giá trị cũ và UPDATE
+    bump_todos_version(db, user_id)
+    updated = _update_todo_returning(db, user_id, todo_id, todo_data.model_dump())
+    if updated is None:
+        # Bỏ bump version: không có gì thay đổi
+        db.rollback()
+        raise HTTPException(status_code=404, detail="Todo not found")
+    changes = Counter()
+    changes[
+        stats_key(user_id, updated.pop("old_priority"), updated.pop("old_complete"))
+    ] -= 1
+    changes[stats_key(user_id, updated["priority"], updated["complete"])] += 1
+    record_todo_changes(db, user_id, "upsert", [todo_id])
+    adjust_todo_stats(db, changes)
     db.commit()
-    return todo
+    invalidate_todo_cache(user_id)
+    publish_todo_event(user_id, "updated", [todo_id], [updated])
+    return updated
 
 
 def delete_todo(db: Session, user_id: int, todo_id: int):
-    todo = get_todo_by_id(db, user_id, todo_id)
-    db.delete(todo)
+    # DELETE ... RETURNING: xóa và lấy khóa stats trong một statement; ORM delete
+    # (synchronize_session mặc định) đánh dấu object đã load trong session là
+    # đã xóa mà không cần thêm query
+    deleted = db.execute(
+        delete(Todos)
+        .where(Todos.id == todo_id, Todos.owner_id == user_id)
+        .returning(Todos.priority, Todos.complete)
+    ).first()
+    if deleted is None:
+        raise HTTPException(status_code=404, detail="Todo not found")
+    bump_todos_version(db, user_id)
+    record_todo_changes(db, user_id, "delete", [todo_id])
+    adjust_todo_stats(
+        db, Counter({stats_key(user_id, deleted.priority, deleted.complete): -1})
+    )
+    db.commit()
+    invalidate_todo_cache(user_id)
+    publish_todo_event(user_id, "deleted", [todo_id])
+
+
+# =============================================================================
+# BULK: mỗi thao tác là một transaction, số round-trip không phụ thuộc số item
+# =============================================================================
+
+
+def bulk_create_todos(db: Session, user_id: int, items: list[TodoRequest]):
+    # executemany INSERT ... RETURNING, kết quả theo đúng thứ tự input
+    stmt = insert(Todos).returning(*TODO_COLUMNS, sort_by_parameter_order=True)
+    rows = db.execute(
+        stmt, [{**item.model_dump(), "owner_id": user_id} for item in items]
+    ).all()
+    bump_todos_version(db, user_id)
+    record_todo_changes(db, user_id, "upsert", [row.id for row in rows])
+    adjust_todo_stats(
+        db, Counter(stats_key(user_id, row.priority, row.complete) for row in rows)
+    )
+    db.commit()
+    invalidate_todo_cache(user_id)
+    created = [dict(row._mapping) for row in rows]
+    publish_todo_event(user_id, "created", [todo["id"] for todo in created], created)
+    return created
+
+
+def bulk_update_todos(db: Session, user_id: int, items: list[TodoBulkUpdateItem]):
+    ids = [item.id for item in items]
+    # Bump version trước khi đọc giá trị cũ: SQLite giữ write lock, Postgres
+    # khóa dòng todo_versions của owner => các lệnh ghi cùng owner chạy lần lượt
+    bump_todos_version(db, user_id)
+    # Giá trị cũ của priority / complete để cập nhật stats (FOR UPDATE trên
+    # Postgres, SQLite bỏ qua)
+    owned = {
+        row.id: row
+        for row in db.execute(
+            select(Todos.id, Todos.priority, Todos.complete)
+            .where(Todos.owner_id == user_id, Todos.id.in_(ids))
+            .with_for_update()
+        )
+    }
+    if not owned:
+        # Không có todo nào của owner: bỏ bump version
+        db.rollback()
+    params = [
+        {**item.model_dump(exclude={"id"}), "todo_id": item.id}
+        for item in items
+        if item.id in owned
+    ]
+    if params:
+        stmt = (
+            update(Todos.__table__)
+            .where(Todos.id == bindparam("todo_id"), Todos.owner_id == user_id)
+            .values({key: bindparam(key) for key in TodoRequest.model_fields})
+        )
+        db.execute(stmt, params)
+        record_todo_changes(
+            db, user_id, "upsert", dict.fromkeys(p["todo_id"] for p in params)
+        )
+        changes = Counter()
+        for item in items:
+            old = owned.get(item.id)
+            if old is None:
+                continue
+            changes[stats_key(user_id, old.priority, old.complete)] -= 1
+            changes[stats_key(user_id, item.priority, item.complete)] += 1
+            # Cùng id xuất hiện nhiều lần: lần sau tính từ giá trị vừa ghi
+            owned[item.id] = item
+        adjust_todo_stats(db, changes)
+    db.commit()
+    invalidate_todo_cache(user_id)
+    # Trùng id: chỉ giữ giá trị cuối cùng
+    updated = {
+        item.id: {**item.model_dump(), "owner_id": user_id}
+        for item in items
+        if item.id in owned
+    }
+    publish_todo_event(user_id, "updated", list(updated), list(updated.values()))
+    return [
+        {"id": item.id, "status": "updated" if item.id in owned else "not_found"}
+        for item in items
+    ]
+
+
+def bulk_delete_todos(db: Session, user_id: int, ids: list[int]):
+    stmt = (
+        delete(Todos)
+        .where(Todos.owner_id == user_id, Todos.id.in_(ids))
+        .returning(Todos.id, Todos.priority, Todos.complete)
+    )
+    rows = db.execute(stmt).all()
+    deleted = {row.id for row in rows}
+    if deleted:
+        bump_todos_version(db, user_id)
+        record_todo_changes(db, user_id, "delete", [row.id for row in rows])
+        changes = Counter()
+        for row in rows:
+            changes[stats_key(user_id, row.priority, row.complete)] -= 1
+        adjust_todo_stats(db, changes)
     db.commit()
+    invalidate_todo_cache(user_id)
+    publish_todo_event(user_id, "deleted", [row.id for row in rows])
+    return [
+        {"id": todo_id, "status": "deleted" if todo_id in deleted else "not_found"}
+        for todo_id in ids
+    ]
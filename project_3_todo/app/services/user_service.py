@@ -1,12 +1,11 @@
 from fastapi import HTTPException
-from passlib.context import CryptContext
 from sqlalchemy.orm import Session
 
+from app.core.security import hash_password, verify_password
+from app.core.single_flight import single_flight
 from app.models import Users
 from app.schemas import UserVerification
 
-bcrypt_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
-
 
 def get_user_by_id(user_id: int, db: Session):
     user = db.query(Users).filter(Users.id == user_id).first()
@@ -21,9 +20,14 @@ def change_user_password(user_id: int, data: UserVerification, db: Session):
     if not user_model:
         raise HTTPException(status_code=404, detail="User not found")
 
-    if not bcrypt_context.verify(data.password, user_model.hashed_password):
+    if not verify_password(data.password, user_model.hashed_password):
         raise HTTPException(status_code=401, detail="Error on password change")
 
-    user_model.hashed_password = bcrypt_context.hash(data.new_password)
+    set_user_password(user_model, hash_password(data.new_password), db)
+
+
+def set_user_password(user_model: Users, hashed_password: str, db: Session):
+    user_model.hashed_password = hashed_password
     db.add(user_model)
     db.commit()
+    single_flight.forget(user_model.id)
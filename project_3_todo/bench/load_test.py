@@ -0,0 +1,254 @@
+"""
+Load benchmark end-to-end cho todo API.
+
+Chạy app.main:app thật (uvicorn) trên một database SQLite / Postgres đã seed,
+bắn traffic hỗn hợp (login, list, get, create, update, delete) rồi báo cáo
+req/s và p50/p95/p99 theo từng route.
+
+    PYTHONPATH=. python -m bench.load_test --duration 20 --concurrency 32
+    PYTHONPATH=. python -m bench.load_test --save-baseline bench/baselines/sqlite.json
+    PYTHONPATH=. python -m bench.load_test --baseline bench/baselines/sqlite.json
+"""
+
+import argparse
+import asyncio
+import random
+import sys
+import tempfile
+import time
+from collections import defaultdict
+
+import httpx
+
+from bench.seed import BENCH_PASSWORD, seed_database
+from bench.server import running_server
+from bench.stats import compare, format_report, load_json, save_json, summarize
+
+# Tỉ lệ traffic mặc định (tổng không cần bằng 100)
+DEFAULT_MIX = {
+    "login": 1,
+    "list": 40,
+    "get": 30,
+    "create": 10,
+    "update": 12,
+    "delete": 7,
+}
+
+ROUTES = {
+    "login": "POST /auth/token",
+    "list": "GET /todos/",
+    "get": "GET /todos/todo/{todo_id}",
+    "create": "POST /todos/todo",
+    "update": "PUT /todos/todo/{todo_id}",
+    "delete": "DELETE /todos/todo/{todo_id}",
+}
+
+TODO_PAYLOAD = {
+    "title": "benchmark todo",
+    "description": "created during benchmark",
+    "priority": 3,
+    "complete": False,
+}
+
+
+class VirtualUser:
+    def __init__(self, client: httpx.AsyncClient, username: str, rng: random.Random):
+        self.client = client
+        self.username = username
+        self.rng = rng
+        self.headers: dict = {}
+        self.todo_ids: list[int] = []
+        self.created_ids: list[int] = []
+
+    async def login(self):
+        response = await self.client.post(
+            "/auth/token",
+            data={"username": self.username, "password": BENCH_PASSWORD},
+        )
+        response.raise_for_status()
+        self.headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+        return response
+
+    async def list(self):
+        response = await self.client.get(
+            "/todos/", params={"limit": 100}, headers=self.headers
+        )
+        if response.status_code == 200:
+            self.todo_ids = [todo["id"] for todo in response.json()["items"]]
+        return response
+
+    def _pick_todo(self) -> int | None:
+        ids = self.todo_ids + self.created_ids
+        return self.rng.choice(ids) if ids else None
+
+    async def get(self):
+        todo_id = self._pick_todo()
+        if todo_id is None:
+            return await self.list()
+        return await self.client.get(f"/todos/todo/{todo_id}", headers=self.headers)
+
+    async def create(self):
+        response = await self.client.post(
+            "/todos/todo", json=TODO_PAYLOAD, headers=self.headers
+        )
+        if response.status_code == 201:
+            self.created_ids.append(response.json()["id"])
+        return response
+
+    async def update(self):
+        todo_id = self._pick_todo()
+        if todo_id is None:
+            return await self.create()
+        params = {**TODO_PAYLOAD, "priority": self.rng.randint(1, 5)}
+        return await self.client.put(
+            f"/todos/todo/{todo_id}", params=params, headers=self.headers
+        )
+
+    async def delete(self):
+        # Chỉ xóa todo do benchmark tạo ra để dữ liệu seed không cạn dần
+        if not self.created_ids:
+            return await self.create()
+        todo_id = self.created_ids.pop()
+        return await self.client.delete(f"/todos/todo/{todo_id}", headers=self.headers)
+
+
+async def drive(
+    base_url: str,
+    usernames: list[str],
+    mix: dict[str, int],
+    duration: float,
+    concurrency: int,
+    seed: int,
+):
+    samples: dict[str, list[float]] = defaultdict(list)
+    errors: dict[str, int] = defaultdict(int)
+    operations = list(mix)
+    weights = [mix[operation] for operation in operations]
+    limits = httpx.Limits(max_connections=concurrency)
+
+    # timeout rộng: login (bcrypt) có thể xếp hàng lâu trên máy ít CPU
+    async with httpx.AsyncClient(
+        base_url=base_url, limits=limits, timeout=60.0, trust_env=False
+    ) as client:
+        users = [
+            VirtualUser(
+                client, usernames[index % len(usernames)], random.Random(seed + index)
+            )
+            for index in range(concurrency)
+        ]
+        await asyncio.gather(*(user.login() for user in users))
+        await asyncio.gather(*(user.list() for user in users))
+
+        started = time.perf_counter()
+        deadline = started + duration
+
+        async def worker(user: VirtualUser):
+            while time.perf_counter() < deadline:
+                operation = user.rng.choices(operations, weights)[0]
+                begin = time.perf_counter()
+                try:
+                    response = await getattr(user, operation)()
+                    failed = response.status_code >= 400
+                except httpx.HTTPError:
+                    failed = True
+                samples[ROUTES[operation]].append(time.perf_counter() - begin)
+                if failed:
+                    errors[ROUTES[operation]] += 1
+
+        await asyncio.gather(*(worker(user) for user in users))
+        elapsed = time.perf_counter() - started
+
+    return summarize(samples, errors, elapsed)
+
+
+def parse_mix(value: str) -> dict[str, int]:
+    mix = {}
+    for part in value.split(","):
+        name, weight = part.split("=")
+        if name not in ROUTES:
+            raise argparse.ArgumentTypeError(f"unknown operation '{name}'")
+        mix[name] = int(weight)
+    return mix
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--database-url", help="mặc định: SQLite tạm thời")
+    parser.add_argument("--users", type=int, default=20)
+    parser.add_argument("--todos-per-user", type=int, default=200)
+    parser.add_argument("--duration", type=float, default=15.0)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--workers", type=int, default=1, help="số uvicorn worker")
+    parser.add_argument(
+        "--mix",
+        type=parse_mix,
+        default=DEFAULT_MIX,
+        help="vd: list=40,get=30,create=10",
+    )
+    parser.add_argument(
+        "--env",
+        action="append",
+        default=[],
+        metavar="KEY=VALUE",
+        help="biến môi trường cho server, vd: DB_MODE=async",
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="ghi kết quả JSON ra file")
+    parser.add_argument("--save-baseline", help="lưu kết quả làm baseline")
+    parser.add_argument("--baseline", help="so sánh với baseline JSON")
+    parser.add_argument(
+        "--threshold", type=float, default=10.0, help="ngưỡng regression (%%)"
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    env = dict(item.split("=", 1) for item in args.env)
+
+    with tempfile.TemporaryDirectory(prefix="todo-bench-") as tmp_dir:
+        database_url = args.database_url or f"sqlite:///{tmp_dir}/bench.db"
+        usernames = seed_database(
+            database_url, args.users, args.todos_per_user, seed=args.seed
+        )
+        with running_server(database_url, env, workers=args.workers) as base_url:
+            report = asyncio.run(
+                drive(
+                    base_url,
+                    usernames,
+                    args.mix,
+                    args.duration,
+                    args.concurrency,
+                    args.seed,
+                )
+            )
+
+    report["config"] = {
+        "users": args.users,
+        "todos_per_user": args.todos_per_user,
+        "duration": args.duration,
+        "concurrency": args.concurrency,
+        "workers": args.workers,
+        "mix": args.mix,
+        "env": env,
+    }
+    print(format_report(report))
+
+    if args.output:
+        save_json(args.output, report)
+    if args.save_baseline:
+        save_json(args.save_baseline, report)
+        print(f"baseline saved to {args.save_baseline}")
+    if args.baseline:
+        regressions = compare(report, load_json(args.baseline), args.threshold)
+        if regressions:
+            print(f"REGRESSIONS (> {args.threshold:.0f}%):")
+            for regression in regressions:
+                print(f"  {regression}")
+            return 1
+        print(f"no regressions beyond {args.threshold:.0f}%")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
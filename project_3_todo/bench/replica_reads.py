@@ -0,0 +1,149 @@
+"""
+Đo chi phí trên primary / replica của một GET todo đi qua replica, theo đúng
+các bước của read_with_etag: đọc version trên primary (ETag), rồi đọc body
+(cache theo version) trên replica, ReplicaBehind thì đọc lại trên primary.
+
+- hit: cache đã có entry của version => replica không chạy statement nào
+- miss: cache trống => replica kiểm tra version + đọc todo
+- lagging: replica chưa có version mới nhất => body đọc trên primary
+
+Chi phí còn lại của mọi GET qua replica là một lần checkout connection primary
+và một SELECT todo_versions (để ETag / 304 phản ánh lần ghi mới nhất).
+
+    PYTHONPATH=. python -m bench.replica_reads --iterations 2000
+    PYTHONPATH=. python -m bench.replica_reads --output /tmp/replica_reads.json
+"""
+
+import argparse
+import shutil
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from pathlib import Path
+
+from sqlalchemy import event
+from sqlalchemy.orm import sessionmaker
+
+from app.core.database import ReplicaBehind, create_profiled_engine
+from app.services import todo_service
+from bench.seed import seed_database
+from bench.stats import format_report, save_json, summarize
+
+USER_ID = 1
+
+
+class EngineCounter:
+    """Số statement và số lần checkout connection của một engine."""
+
+    def __init__(self, engine):
+        self.statements = 0
+        self.checkouts = 0
+        event.listen(engine, "before_cursor_execute", self._on_execute)
+        event.listen(engine.pool, "checkout", self._on_checkout)
+
+    def _on_execute(self, *args):
+        self.statements += 1
+
+    def _on_checkout(self, *args):
+        self.checkouts += 1
+
+    def snapshot(self) -> tuple[int, int]:
+        return self.statements, self.checkouts
+
+
+def read_todo(Primary, Replica, todo_id: int):
+    with Primary() as primary:
+        version = todo_service.get_todos_version(primary, USER_ID)
+    with Replica() as replica:
+        replica.info["replica"] = True
+        try:
+            return todo_service.get_todo_by_id(replica, USER_ID, todo_id, version)
+        except ReplicaBehind:
+            pass
+    with Primary() as primary:
+        return todo_service.get_todo_by_id(primary, USER_ID, todo_id, version)
+
+
+def run(iterations: int, profile: str) -> dict:
+    directory = Path(tempfile.mkdtemp(prefix="todo-replica-"))
+    seed_database(f"sqlite:///{directory}/primary.db", users=1, todos_per_user=100)
+    shutil.copy(directory / "primary.db", directory / "replica.db")
+    primary_engine = create_profiled_engine(
+        f"sqlite:///{directory}/primary.db", profile
+    )
+    replica_engine = create_profiled_engine(
+        f"sqlite:///{directory}/replica.db", profile
+    )
+    Primary = sessionmaker(bind=primary_engine)
+    Replica = sessionmaker(bind=replica_engine)
+    counters = {
+        "primary": EngineCounter(primary_engine),
+        "replica": EngineCounter(replica_engine),
+    }
+
+    samples: dict[str, list[float]] = defaultdict(list)
+    costs: dict[str, dict[str, list[int]]] = defaultdict(
+        lambda: {name: [0, 0] for name in counters}
+    )
+
+    def timed(name: str, todo_id: int):
+        before = {key: counter.snapshot() for key, counter in counters.items()}
+        started = time.perf_counter()
+        read_todo(Primary, Replica, todo_id)
+        samples[name].append(time.perf_counter() - started)
+        for key, counter in counters.items():
+            statements, checkouts = counter.snapshot()
+            costs[name][key][0] += statements - before[key][0]
+            costs[name][key][1] += checkouts - before[key][1]
+
+    todo_service.todo_cache.clear()
+    started = time.perf_counter()
+    for index in range(iterations):
+        todo_id = index % 100 + 1
+        todo_service.todo_cache.clear()
+        timed("miss", todo_id)
+        timed("hit", todo_id)
+    # Ghi chỉ trên primary: replica đứng ở version cũ
+    with Primary() as primary:
+        todo_service.bump_todos_version(primary, USER_ID)
+        primary.commit()
+    for index in range(iterations):
+        todo_service.todo_cache.clear()
+        timed("lagging", index % 100 + 1)
+    report = summarize(samples, {}, time.perf_counter() - started)
+    for name, route in report["routes"].items():
+        for key, (statements, checkouts) in costs[name].items():
+            route[f"{key}_statements_per_op"] = statements / route["requests"]
+            route[f"{key}_checkouts_per_op"] = checkouts / route["requests"]
+    primary_engine.dispose()
+    replica_engine.dispose()
+    return report
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--iterations", type=int, default=2000)
+    parser.add_argument("--profile", default="default")
+    parser.add_argument("--output", help="ghi kết quả JSON ra file")
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    report = run(args.iterations, args.profile)
+    print(format_report(report))
+    for name, route in report["routes"].items():
+        print(
+            f"{name}: primary {route['primary_statements_per_op']:.1f} statements / "
+            f"{route['primary_checkouts_per_op']:.1f} checkouts, "
+            f"replica {route['replica_statements_per_op']:.1f} statements / "
+            f"{route['replica_checkouts_per_op']:.1f} checkouts per op"
+        )
+    if args.output:
+        save_json(args.output, report)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
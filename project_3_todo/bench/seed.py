@@ -0,0 +1,55 @@
+"""
+Tạo database benchmark: chạy migrations rồi seed users + todos.
+"""
+
+import random
+
+from sqlalchemy import create_engine, insert
+
+from app.core.migrations import run_migrations
+from app.core.security import hash_password
+from app.models import Todos, Users
+
+BENCH_PASSWORD = "benchpassword"
+
+
+def seed_database(database_url: str, users: int, todos_per_user: int, seed: int = 0):
+    engine = create_engine(database_url)
+    run_migrations(engine)
+    rng = random.Random(seed)
+    # Hash một lần, dùng chung cho mọi user để seed nhanh
+    hashed_password = hash_password(BENCH_PASSWORD)
+
+    with engine.begin() as connection:
+        connection.execute(
+            insert(Users),
+            [
+                {
+                    "username": f"bench{index}",
+                    "email": f"bench{index}@example.com",
+                    "first_name": "Bench",
+                    "last_name": str(index),
+                    "hashed_password": hashed_password,
+                    "is_active": True,
+                    "role": "admin" if index == 0 else "user",
+                }
+                for index in range(users)
+            ],
+        )
+        owner_ids = [row.id for row in connection.execute(Users.__table__.select())]
+        for owner_id in owner_ids:
+            connection.execute(
+                insert(Todos),
+                [
+                    {
+                        "title": f"todo {owner_id}-{index}",
+                        "description": "seeded for benchmark",
+                        "priority": rng.randint(1, 5),
+                        "complete": rng.random() < 0.3,
+                        "owner_id": owner_id,
+                    }
+                    for index in range(todos_per_user)
+                ],
+            )
+    engine.dispose()
+    return [f"bench{index}" for index in range(users)]
@@ -0,0 +1,102 @@
+"""
+So sánh engine profile SQLite "default" và "tuned" dưới tải ghi đồng thời.
+
+Mỗi writer là một thread chạy create_todo / update_todo thật qua SessionLocal
+của profile tương ứng; đo throughput, p50/p95/p99 và số lỗi
+`database is locked`.
+
+    PYTHONPATH=. python -m bench.sqlite_profile --writers 8 --duration 10
+"""
+
+import argparse
+import sys
+import tempfile
+import threading
+import time
+from collections import defaultdict
+
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import sessionmaker
+
+from app.core.database import create_profiled_engine
+from app.core.engine_profile import PROFILES
+from app.schemas.todo import TodoRequest
+from app.services import todo_service
+from bench.seed import seed_database
+from bench.stats import format_report, save_json, summarize
+
+TODO = TodoRequest(
+    title="profile bench", description="sqlite profile", priority=3, complete=False
+)
+
+
+def run_profile(profile: str, writers: int, duration: float, users: int) -> dict:
+    database_url = f"sqlite:///{tempfile.mkdtemp(prefix='todo-profile-')}/bench.db"
+    seed_database(database_url, users=users, todos_per_user=10)
+    engine = create_profiled_engine(database_url, profile)
+    Session = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+    samples: dict[str, list[float]] = defaultdict(list)
+    errors: dict[str, int] = defaultdict(int)
+    lock = threading.Lock()
+    deadline = time.perf_counter() + duration
+
+    def timed(route: str, operation):
+        started = time.perf_counter()
+        try:
+            with Session() as db:
+                result = operation(db)
+        except OperationalError:
+            with lock:
+                errors[route] += 1
+            return None
+        with lock:
+            samples[route].append(time.perf_counter() - started)
+        return result
+
+    def writer(index: int):
+        owner_id = index % users + 1
+        while time.perf_counter() < deadline:
+            todo_id = timed(
+                "create", lambda db: todo_service.create_todo(db, owner_id, TODO).id
+            )
+            if todo_id is not None:
+                timed(
+                    "update",
+                    lambda db: todo_service.update_todo(db, owner_id, todo_id, TODO),
+                )
+
+    started = time.perf_counter()
+    threads = [threading.Thread(target=writer, args=(i,)) for i in range(writers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    report = summarize(samples, errors, time.perf_counter() - started)
+    engine.dispose()
+    return report
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--writers", type=int, default=8)
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--users", type=int, default=4)
+    parser.add_argument("--output", help="ghi kết quả JSON ra file")
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    results = {}
+    for profile in PROFILES:
+        results[profile] = run_profile(profile, args.writers, args.duration, args.users)
+        print(f"== profile: {profile}")
+        print(format_report(results[profile]))
+    if args.output:
+        save_json(args.output, results)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,83 @@
+"""
+Tổng hợp latency theo route và so sánh với baseline.
+"""
+
+import json
+from pathlib import Path
+
+
+def percentile(sorted_values: list[float], pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    # Nearest-rank
+    index = max(
+        0, min(len(sorted_values) - 1, round(pct / 100 * len(sorted_values)) - 1)
+    )
+    return sorted_values[index]
+
+
+def summarize(samples: dict[str, list[float]], errors: dict[str, int], elapsed: float):
+    routes = {}
+    for route, latencies in sorted(samples.items()):
+        ordered = sorted(latencies)
+        routes[route] = {
+            "requests": len(ordered),
+            "errors": errors.get(route, 0),
+            "rps": len(ordered) / elapsed if elapsed else 0.0,
+            "p50_ms": percentile(ordered, 50) * 1000,
+            "p95_ms": percentile(ordered, 95) * 1000,
+            "p99_ms": percentile(ordered, 99) * 1000,
+        }
+    total = sum(route["requests"] for route in routes.values())
+    return {
+        "elapsed_s": elapsed,
+        "total_requests": total,
+        "total_rps": total / elapsed if elapsed else 0.0,
+        "routes": routes,
+    }
+
+
+def compare(current: dict, baseline: dict, threshold_pct: float) -> list[str]:
+    """
+    Trả về danh sách regression: p95 tăng hoặc rps giảm quá threshold_pct %.
+    """
+    regressions = []
+    factor = threshold_pct / 100
+    for route, base in baseline.get("routes", {}).items():
+        now = current["routes"].get(route)
+        if now is None:
+            continue
+        if base["p95_ms"] and now["p95_ms"] > base["p95_ms"] * (1 + factor):
+            regressions.append(
+                f"{route}: p95 {base['p95_ms']:.1f}ms -> {now['p95_ms']:.1f}ms"
+            )
+        if base["rps"] and now["rps"] < base["rps"] * (1 - factor):
+            regressions.append(f"{route}: rps {base['rps']:.1f} -> {now['rps']:.1f}")
+    return regressions
+
+
+def format_report(report: dict) -> str:
+    lines = [
+        f"{'route':<32}{'reqs':>8}{'err':>6}{'rps':>10}"
+        f"{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}"
+    ]
+    for route, stats in report["routes"].items():
+        lines.append(
+            f"{route:<32}{stats['requests']:>8}{stats['errors']:>6}"
+            f"{stats['rps']:>10.1f}{stats['p50_ms']:>10.2f}"
+            f"{stats['p95_ms']:>10.2f}{stats['p99_ms']:>10.2f}"
+        )
+    lines.append(
+        f"total: {report['total_requests']} requests, "
+        f"{report['total_rps']:.1f} req/s in {report['elapsed_s']:.1f}s"
+    )
+    return "\n".join(lines)
+
+
+def load_json(path: str | Path) -> dict:
+    return json.loads(Path(path).read_text())
+
+
+def save_json(path: str | Path, data: dict):
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    Path(path).write_text(json.dumps(data, indent=2, sort_keys=True) + "\n")
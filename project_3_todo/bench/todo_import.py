@@ -0,0 +1,105 @@
+"""
+Đo throughput của import hàng loạt (/todos/imports) so với tạo từng todo.
+
+Sinh file JSONL / CSV với N dòng, chạy run_import (đúng job background của API)
+trên database mới đã migrate; in số dòng/giây và max RSS của process.
+
+    PYTHONPATH=. python -m bench.todo_import --rows 200000 --format csv
+"""
+
+import os
+import tempfile
+
+# Database riêng cho benchmark; phải set trước khi import app (engine được
+# tạo lúc import)
+_BENCH_DIR = tempfile.mkdtemp(prefix="todo-import-")
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{_BENCH_DIR}/bench.db")
+
+import argparse  # noqa: E402
+import csv  # noqa: E402
+import json  # noqa: E402
+import resource  # noqa: E402
+import sys  # noqa: E402
+import time  # noqa: E402
+
+from app.core.config import IMPORT_CHUNK_SIZE, SQLALCHEMY_DATABASE_URL  # noqa: E402
+from app.core.database import SessionLocal  # noqa: E402
+from app.schemas.todo import TodoRequest  # noqa: E402
+from app.services import todo_import_service, todo_service  # noqa: E402
+from bench.seed import seed_database  # noqa: E402
+
+
+def write_import_file(path: str, rows: int, import_format: str):
+    with open(path, "w", newline="", encoding="utf-8") as target:
+        records = (
+            {
+                "title": f"imported {index}",
+                "description": "bench import",
+                "priority": index % 5 + 1,
+                "complete": index % 3 == 0,
+            }
+            for index in range(rows)
+        )
+        if import_format == "csv":
+            writer = csv.DictWriter(target, TodoRequest.model_fields)
+            writer.writeheader()
+            writer.writerows(records)
+        else:
+            target.writelines(json.dumps(record) + "\n" for record in records)
+
+
+def bench_one_by_one(owner_id: int, rows: int) -> float:
+    # Đường cũ: mỗi dòng một create_todo (commit + refresh)
+    todo = TodoRequest(title="one by one", description="bench import", priority=3)
+    started = time.perf_counter()
+    with SessionLocal() as db:
+        for _ in range(rows):
+            todo_service.create_todo(db, owner_id, todo)
+    return rows / (time.perf_counter() - started)
+
+
+def bench_import(owner_id: int, rows: int, import_format: str, chunk_size: int):
+    path = os.path.join(_BENCH_DIR, f"import.{import_format}")
+    write_import_file(path, rows, import_format)
+    with SessionLocal() as db:
+        job = todo_import_service.create_import(
+            db, owner_id, import_format, os.path.getsize(path)
+        )
+    started = time.perf_counter()
+    todo_import_service.run_import(job["id"], path, chunk_size)
+    elapsed = time.perf_counter() - started
+    with SessionLocal() as db:
+        job = todo_import_service.get_import(db, owner_id, job["id"])
+    return job, rows / elapsed
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--format", choices=todo_import_service.IMPORT_FORMATS)
+    parser.add_argument("--chunk-size", type=int, default=IMPORT_CHUNK_SIZE)
+    parser.add_argument("--baseline-rows", type=int, default=2_000)
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    seed_database(SQLALCHEMY_DATABASE_URL, users=2, todos_per_user=1)
+
+    baseline = bench_one_by_one(1, args.baseline_rows)
+    print(f"create_todo từng dòng: {baseline:,.0f} rows/s")
+    job, throughput = bench_import(
+        2, args.rows, args.format or "jsonl", args.chunk_size
+    )
+    print(
+        f"import {job['format']}: {throughput:,.0f} rows/s "
+        f"({job['rows_imported']:,} rows, status={job['status']})"
+    )
+    # ru_maxrss: KB trên Linux
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    print(f"max RSS: {max_rss:.0f} MB")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
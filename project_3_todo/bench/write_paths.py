@@ -0,0 +1,91 @@
+"""
+Đo latency và số statement SQL của các đường ghi một todo:
+update_todo, delete_todo (owner) và delete_todo_as_admin.
+
+Mỗi vòng tạo sẵn todo (không tính giờ) rồi đo từng thao tác trên một
+database SQLite mới đã migrate.
+
+    PYTHONPATH=. python -m bench.write_paths --iterations 2000
+    PYTHONPATH=. python -m bench.write_paths --output /tmp/write_paths.json
+"""
+
+import argparse
+import sys
+import tempfile
+import time
+from collections import defaultdict
+
+from sqlalchemy.orm import sessionmaker
+
+from app.core import query_log
+from app.core.database import create_profiled_engine
+from app.schemas.todo import TodoRequest
+from app.services import admin_service, todo_service
+from bench.seed import seed_database
+from bench.stats import format_report, save_json, summarize
+
+TODO = TodoRequest(title="write path", description="bench", priority=2)
+UPDATED = TodoRequest(
+    title="write path", description="bench", priority=4, complete=True
+)
+ADMIN = {"id": 1, "role": "admin"}
+
+
+def run(iterations: int, profile: str) -> dict:
+    database_url = f"sqlite:///{tempfile.mkdtemp(prefix='todo-writes-')}/bench.db"
+    seed_database(database_url, users=2, todos_per_user=100)
+    engine = create_profiled_engine(database_url, profile)
+    Session = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    query_log.install()
+
+    samples: dict[str, list[float]] = defaultdict(list)
+    queries: dict[str, int] = defaultdict(int)
+
+    def timed(name: str, operation):
+        with Session() as db, query_log.track_queries() as tracker:
+            started = time.perf_counter()
+            operation(db)
+            samples[name].append(time.perf_counter() - started)
+        queries[name] += tracker.count
+
+    def create(db) -> int:
+        return todo_service.bulk_create_todos(db, 2, [TODO, TODO])
+
+    started = time.perf_counter()
+    for _ in range(iterations):
+        with Session() as db:
+            first, second = [todo["id"] for todo in create(db)]
+        timed("update_todo", lambda db: todo_service.update_todo(db, 2, first, UPDATED))
+        timed("delete_todo", lambda db: todo_service.delete_todo(db, 2, first))
+        timed(
+            "delete_todo_as_admin",
+            lambda db: admin_service.delete_todo_as_admin(ADMIN, second, db),
+        )
+    report = summarize(samples, {}, time.perf_counter() - started)
+    for name, route in report["routes"].items():
+        route["queries_per_op"] = queries[name] / route["requests"]
+    engine.dispose()
+    return report
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--iterations", type=int, default=2000)
+    parser.add_argument("--profile", default="default")
+    parser.add_argument("--output", help="ghi kết quả JSON ra file")
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    report = run(args.iterations, args.profile)
+    print(format_report(report))
+    for name, route in report["routes"].items():
+        print(f"{name}: {route['queries_per_op']:.1f} statements/op")
+    if args.output:
+        save_json(args.output, report)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
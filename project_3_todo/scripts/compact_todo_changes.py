@@ -0,0 +1,34 @@
+"""
+Compact change log của delta sync: xóa entry cũ hơn retention và ghi watermark
+theo owner (client có cursor cũ hơn watermark sẽ nhận resync_required).
+
+Chạy định kỳ (cron):
+
+    PYTHONPATH=. python scripts/compact_todo_changes.py
+    PYTHONPATH=. python scripts/compact_todo_changes.py --retention-hours 24
+"""
+
+import argparse
+from datetime import timedelta
+
+from app.core.config import TODO_CHANGES_RETENTION_HOURS
+from app.core.database import SessionLocal
+from app.models.todo_change import utcnow
+from app.services.todo_service import compact_todo_changes
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument(
+        "--retention-hours", type=float, default=TODO_CHANGES_RETENTION_HOURS
+    )
+    args = parser.parse_args(argv)
+
+    cutoff = utcnow() - timedelta(hours=args.retention_hours)
+    with SessionLocal() as db:
+        deleted = compact_todo_changes(db, cutoff)
+    print(f"✅ Compacted todo_changes: {deleted} entries older than {cutoff}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,20 @@
+"""
+Tính lại bảng todo_stats từ bảng todos (GROUP BY owner, priority, complete).
+
+Dùng khi số liệu bị lệch (import trực tiếp vào database, sửa tay, ...):
+
+    PYTHONPATH=. python scripts/rebuild_todo_stats.py
+"""
+
+from app.core.database import SessionLocal
+from app.services.todo_service import rebuild_todo_stats
+
+
+def main():
+    with SessionLocal() as db:
+        groups = rebuild_todo_stats(db)
+    print(f"✅ Rebuilt todo_stats: {groups} groups")
+
+
+if __name__ == "__main__":
+    main()
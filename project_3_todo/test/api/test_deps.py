@@ -1,4 +1,171 @@
 # Auto-generated test for app.api.deps
 
+import pytest
+from fastapi import Depends, FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.api.deps import rate_limit
+from app.core import database
+from app.core.config import READ_YOUR_WRITES_COOKIE
+from app.core.database import Base
+from app.core.read_routing import read_your_writes
+from app.models import Todos, TodoVersions, Users
+from app.services import todo_service
+from app.services.todo_service import todo_cache
+from test.conftest import auth_headers
+
+limited_app = FastAPI()
+
+
+@limited_app.get("/ip/{item_id}", dependencies=[Depends(rate_limit(2, 60))])
+def limited_by_ip(item_id: int):
+    return {"item_id": item_id}
+
+
+@limited_app.get("/user", dependencies=[Depends(rate_limit(1, 60, per_user=True))])
+def limited_by_user():
+    return {"ok": True}
+
+
 def test_placeholder():
     assert True
+
+
+def test_rate_limit_sets_headers_and_rejects_with_retry_after():
+    client = TestClient(limited_app)
+    first = client.get("/ip/1")
+    assert first.status_code == 200
+    assert first.headers["RateLimit-Limit"] == "2"
+    assert first.headers["RateLimit-Remaining"] == "1"
+
+    # Cùng route template => cùng key dù path khác nhau
+    assert client.get("/ip/2").status_code == 200
+    rejected = client.get("/ip/3")
+    assert rejected.status_code == 429
+    assert int(rejected.headers["Retry-After"]) >= 1
+    assert rejected.headers["RateLimit-Remaining"] == "0"
+
+
+def test_rate_limit_per_user(test_user, admin_user):
+    client = TestClient(limited_app)
+    assert client.get("/user", headers=auth_headers(test_user)).status_code == 200
+    assert client.get("/user", headers=auth_headers(test_user)).status_code == 429
+    assert client.get("/user", headers=auth_headers(admin_user)).status_code == 200
+
+
+@pytest.fixture
+def replica(tmp_path, monkeypatch, test_user):
+    # Replica là một file SQLite thứ hai, dữ liệu khác primary để phân biệt
+    replica_url = f"sqlite:///{tmp_path}/replica.db"
+    replica_engine = create_engine(replica_url)
+    Base.metadata.create_all(bind=replica_engine)
+    ReplicaSession = sessionmaker(bind=replica_engine)
+    with ReplicaSession() as session:
+        session.add(
+            Users(
+                id=test_user.id,
+                username=test_user.username,
+                email=test_user.email,
+                hashed_password=test_user.hashed_password,
+                role=test_user.role,
+                is_active=True,
+            )
+        )
+        session.add(
+            Todos(
+                title="from replica",
+                description="replica row",
+                priority=1,
+                complete=False,
+                owner_id=test_user.id,
+            )
+        )
+        session.commit()
+    monkeypatch.setattr(database, "ReplicaSessionLocal", ReplicaSession)
+    # DB_MODE=async: engine replica async được tạo lại từ URL này
+    monkeypatch.setattr(database, "SQLALCHEMY_REPLICA_DATABASE_URL", replica_url)
+    monkeypatch.setattr(database, "AsyncReplicaSessionLocal", None)
+    yield ReplicaSession
+    replica_engine.dispose()
+
+
+def _catch_up(replica_session, user, version: int):
+    # Giả lập replica đã nhận các thay đổi của owner tới version này
+    with replica_session() as session:
+        session.merge(TodoVersions(owner_id=user.id, version=version))
+        session.commit()
+
+
+def _titles(client, user):
+    response = client.get("/todos/", headers=auth_headers(user))
+    assert response.status_code == 200
+    return [todo["title"] for todo in response.json()["items"]]
+
+
+def test_reads_go_to_replica_until_user_writes(client, test_user, test_todo, replica):
+    assert _titles(client, test_user) == ["from replica"]
+
+    created = client.post(
+        "/todos/todo",
+        headers=auth_headers(test_user),
+        json={"title": "new", "description": "fresh", "priority": 2, "complete": False},
+    )
+    assert created.status_code == 201
+    assert READ_YOUR_WRITES_COOKIE in created.cookies
+
+    # Read-your-writes: trong cửa sổ, đọc quay về primary
+    assert _titles(client, test_user) == [test_todo.title, "new"]
+
+
+def test_cookie_alone_keeps_reads_on_primary(client, test_user, test_todo, replica):
+    client.post(
+        "/todos/todo",
+        headers=auth_headers(test_user),
+        json={"title": "new", "description": "fresh", "priority": 2, "complete": False},
+    )
+    # Worker khác: không có trạng thái in-process, chỉ có cookie
+    read_your_writes.clear()
+    todo_cache.clear()
+    assert _titles(client, test_user) == [test_todo.title, "new"]
+
+    client.cookies.clear()
+    todo_cache.clear()
+    _catch_up(replica, test_user, 1)
+    assert _titles(client, test_user) == ["from replica"]
+
+
+def test_lagging_replica_falls_back_to_primary(client, test_user, test_todo, replica):
+    client.post(
+        "/todos/todo",
+        headers=auth_headers(test_user),
+        json={"title": "new", "description": "fresh", "priority": 2, "complete": False},
+    )
+    read_your_writes.clear()
+    client.cookies.clear()
+
+    # ETag theo version của primary; replica chưa có version đó => body từ primary
+    assert _titles(client, test_user) == [test_todo.title, "new"]
+
+
+def test_replica_cache_hit_skips_replica_version_check(
+    client, test_user, test_todo, replica, monkeypatch
+):
+    calls = []
+    get_todos_version = todo_service.get_todos_version
+
+    def recording_get_todos_version(db, user_id):
+        calls.append("replica" if database.is_replica_session(db) else "primary")
+        return get_todos_version(db, user_id)
+
+    monkeypatch.setattr(todo_service, "get_todos_version", recording_get_todos_version)
+
+    # Miss: version trên primary (ETag) + kiểm tra replica đã bắt kịp
+    assert _titles(client, test_user) == ["from replica"]
+    assert calls == ["primary", "replica"]
+
+    # Hit (key theo version): không query replica
+    calls.clear()
+    assert _titles(client, test_user) == ["from replica"]
+    assert calls == ["primary"]
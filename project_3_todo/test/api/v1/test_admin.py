@@ -1,4 +1,85 @@
 # Auto-generated test for app.api.v1.admin
+import json
+
+from test.conftest import auth_headers
+
 
 def test_placeholder():
     assert True
+
+
+def test_admin_reads_all_todos_paginated(client, admin_user, test_todo):
+    response = client.get(
+        "/admin/todo", params={"limit": 1}, headers=auth_headers(admin_user)
+    )
+    assert response.status_code == 200
+    assert [todo["id"] for todo in response.json()["items"]] == [test_todo.id]
+
+
+def test_non_admin_cannot_read_all_todos(client, test_user):
+    response = client.get("/admin/todo", headers=auth_headers(test_user))
+    assert response.status_code == 401
+
+
+def test_admin_exports_todos_as_ndjson(client, admin_user, test_todo):
+    response = client.get("/admin/todo/export", headers=auth_headers(admin_user))
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert rows == [
+        {
+            "id": test_todo.id,
+            "title": test_todo.title,
+            "description": test_todo.description,
+            "priority": test_todo.priority,
+            "complete": False,
+            "owner_id": test_todo.owner_id,
+        }
+    ]
+
+
+def test_admin_exports_todos_as_csv(client, admin_user, test_todo):
+    response = client.get(
+        "/admin/todo/export", params={"format": "csv"}, headers=auth_headers(admin_user)
+    )
+    assert response.status_code == 200
+    lines = response.text.splitlines()
+    assert lines[0] == "id,title,description,priority,complete,owner_id"
+    assert lines[1].startswith(f"{test_todo.id},Learn FastAPI,")
+
+
+def test_export_requires_admin(client, test_user):
+    response = client.get("/admin/todo/export", headers=auth_headers(test_user))
+    assert response.status_code == 401
+
+
+def test_admin_stats_are_served_from_summary_table(client, admin_user, test_user):
+    user_headers = auth_headers(test_user)
+    for priority, complete in ((1, False), (1, True), (4, True)):
+        client.post(
+            "/todos/todo",
+            headers=user_headers,
+            json={
+                "title": "stat todo",
+                "description": "counted",
+                "priority": priority,
+                "complete": complete,
+            },
+        )
+
+    response = client.get("/admin/stats", headers=auth_headers(admin_user))
+    assert response.status_code == 200
+    body = response.json()
+    assert body["total"] == 3
+    assert body["completed"] == 2
+    assert body["by_owner"] == [{"owner_id": test_user.id, "total": 3, "completed": 2}]
+    assert body["by_priority"] == [
+        {"priority": 1, "total": 2, "completed": 1},
+        {"priority": 4, "total": 1, "completed": 1},
+    ]
+    assert len(body["groups"]) == 3
+
+
+def test_stats_require_admin(client, test_user):
+    response = client.get("/admin/stats", headers=auth_headers(test_user))
+    assert response.status_code == 401
@@ -1,4 +1,45 @@
 # Auto-generated test for app.api.v1.auth
+from test.conftest import TEST_PASSWORD
+
 
 def test_placeholder():
     assert True
+
+
+def test_login_returns_bearer_token(client, test_user):
+    response = client.post(
+        "/auth/token",
+        data={"username": test_user.username, "password": TEST_PASSWORD},
+    )
+    assert response.status_code == 200
+    assert response.json()["token_type"] == "bearer"
+
+
+def test_login_with_wrong_password_is_rejected(client, test_user):
+    response = client.post(
+        "/auth/token", data={"username": test_user.username, "password": "nope"}
+    )
+    assert response.status_code == 401
+
+
+def test_read_all_users_does_not_leak_password_hash(client, test_user):
+    response = client.get("/auth/users")
+    assert response.status_code == 200
+    users = response.json()["users"]
+    assert [user["username"] for user in users] == [test_user.username]
+    assert "hashed_password" not in users[0]
+
+
+def test_create_user_returns_public_fields_only(client):
+    payload = {
+        "username": "bob",
+        "email": "bob@example.com",
+        "first_name": "Bob",
+        "last_name": "Builder",
+        "password": "secret123",
+        "role": "user",
+    }
+    response = client.post("/auth", json=payload)
+    assert response.status_code == 201
+    assert response.json()["user"]["username"] == "bob"
+    assert "hashed_password" not in response.json()["user"]
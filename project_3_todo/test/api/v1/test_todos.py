@@ -1,4 +1,369 @@
 # Auto-generated test for app.api.v1.todos
+import pytest
+from starlette.websockets import WebSocketDisconnect
+
+from app.models import Todos
+from test.conftest import auth_headers
+
 
 def test_placeholder():
     assert True
+
+
+def test_read_all_returns_only_own_todos(client, test_user, test_todo):
+    response = client.get("/todos/", headers=auth_headers(test_user))
+    assert response.status_code == 200
+    assert [todo["id"] for todo in response.json()["items"]] == [test_todo.id]
+    assert response.json()["next_cursor"] is None
+
+
+def _seed_todos(db, owner_id: int, priorities: list[int], texts=None) -> list[Todos]:
+    # texts: [(title, description)] theo thứ tự của priorities
+    texts = texts or [(f"todo {index}", "seeded") for index in range(len(priorities))]
+    todos = [
+        Todos(
+            title=title,
+            description=description,
+            priority=priority,
+            complete=False,
+            owner_id=owner_id,
+        )
+        for priority, (title, description) in zip(priorities, texts)
+    ]
+    db.add_all(todos)
+    db.commit()
+    return todos
+
+
+def test_read_all_walks_pages_with_cursor(client, db, test_user):
+    _seed_todos(db, test_user.id, [3, 1, 2, 1, 3])
+    headers = auth_headers(test_user)
+
+    seen, cursor = [], None
+    while True:
+        params = {"limit": 2, "order_by": "priority"}
+        if cursor:
+            params["cursor"] = cursor
+        page = client.get("/todos/", params=params, headers=headers).json()
+        seen += [(todo["priority"], todo["id"]) for todo in page["items"]]
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+
+    assert seen == sorted(seen)
+    assert len(seen) == 5
+
+
+def test_read_all_rejects_bad_cursor_and_limit(client, test_user):
+    headers = auth_headers(test_user)
+    assert (
+        client.get("/todos/", params={"cursor": "??"}, headers=headers).status_code
+        == 400
+    )
+    assert (
+        client.get("/todos/", params={"limit": 0}, headers=headers).status_code == 400
+    )
+
+
+def test_create_update_delete_todo(client, test_user):
+    headers = auth_headers(test_user)
+    payload = {
+        "title": "Write tests",
+        "description": "Cover the todo routes",
+        "priority": 2,
+        "complete": False,
+    }
+    response = client.post("/todos/todo", json=payload, headers=headers)
+    assert response.status_code == 201
+    todo_id = response.json()["id"]
+
+    response = client.put(
+        f"/todos/todo/{todo_id}",
+        params={**payload, "complete": True},
+        headers=headers,
+    )
+    assert response.status_code == 204
+    assert client.get(f"/todos/todo/{todo_id}", headers=headers).json()["complete"]
+
+    response = client.delete(f"/todos/todo/{todo_id}", headers=headers)
+    assert response.status_code == 204
+    response = client.get(f"/todos/todo/{todo_id}", headers=headers)
+    assert response.status_code == 404
+
+
+def test_bulk_create_update_delete(client, test_user, test_todo):
+    headers = auth_headers(test_user)
+    payload = [
+        {"title": f"bulk {i}", "description": "bulk item", "priority": 1 + i % 5}
+        for i in range(3)
+    ]
+    response = client.post("/todos/bulk", json=payload, headers=headers)
+    assert response.status_code == 201
+    created = response.json()
+    assert [todo["title"] for todo in created] == ["bulk 0", "bulk 1", "bulk 2"]
+    ids = [todo["id"] for todo in created]
+
+    updates = [
+        {"id": ids[0], "title": "changed", "description": "bulk", "priority": 5},
+        {"id": 999, "title": "missing", "description": "bulk", "priority": 5},
+    ]
+    response = client.put("/todos/bulk", json=updates, headers=headers)
+    assert response.json() == [
+        {"id": ids[0], "status": "updated"},
+        {"id": 999, "status": "not_found"},
+    ]
+    assert client.get(f"/todos/todo/{ids[0]}", headers=headers).json()["title"] == (
+        "changed"
+    )
+
+    response = client.request(
+        "DELETE", "/todos/bulk", json=[ids[1], 999], headers=headers
+    )
+    assert response.json() == [
+        {"id": ids[1], "status": "deleted"},
+        {"id": 999, "status": "not_found"},
+    ]
+    remaining = client.get("/todos/", headers=headers).json()["items"]
+    assert sorted(todo["id"] for todo in remaining) == sorted(
+        [test_todo.id, ids[0], ids[2]]
+    )
+
+
+def test_bulk_does_not_touch_other_users_todos(client, admin_user, test_todo):
+    response = client.request(
+        "DELETE", "/todos/bulk", json=[test_todo.id], headers=auth_headers(admin_user)
+    )
+    assert response.json() == [{"id": test_todo.id, "status": "not_found"}]
+
+
+def test_bulk_validates_every_item(client, test_user):
+    payload = [
+        {"title": "valid", "description": "bulk item", "priority": 1},
+        {"title": "x", "description": "bulk item", "priority": 9},
+    ]
+    response = client.post("/todos/bulk", json=payload, headers=auth_headers(test_user))
+    assert response.status_code == 422
+    assert client.get("/todos/", headers=auth_headers(test_user)).json()["items"] == []
+    assert (
+        client.post("/todos/bulk", json=[], headers=auth_headers(test_user)).status_code
+        == 422
+    )
+
+
+def test_conditional_get_returns_304_until_owner_writes(
+    client, test_user, admin_user, test_todo
+):
+    headers = auth_headers(test_user)
+    first = client.get("/todos/", headers=headers)
+    etag = first.headers["ETag"]
+
+    cached = client.get("/todos/", headers={**headers, "If-None-Match": etag})
+    assert cached.status_code == 304
+    assert cached.headers["ETag"] == etag
+    assert cached.content == b""
+
+    item = client.get(f"/todos/todo/{test_todo.id}", headers=headers)
+    item_etag = item.headers["ETag"]
+    assert (
+        client.get(
+            f"/todos/todo/{test_todo.id}",
+            headers={**headers, "If-None-Match": item_etag},
+        ).status_code
+        == 304
+    )
+
+    # Admin xóa todo của owner => version của owner tăng
+    client.delete(f"/admin/todo/{test_todo.id}", headers=auth_headers(admin_user))
+    changed = client.get("/todos/", headers={**headers, "If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.headers["ETag"] != etag
+    assert changed.json()["items"] == []
+
+
+def test_search_ranks_prefix_matches_and_pages(client, db, test_user, admin_user):
+    best, _, _ = _seed_todos(
+        db,
+        test_user.id,
+        [1, 1, 1],
+        [
+            ("milk milk", "buy milk for the week"),
+            ("groceries", "milkshake powder"),
+            ("walk the dog", "evening"),
+        ],
+    )
+    _seed_todos(db, admin_user.id, [1], [("milk", "not visible to alice")])
+    headers = auth_headers(test_user)
+
+    first = client.get(
+        "/todos/search", params={"q": "mil", "limit": 1}, headers=headers
+    )
+    assert first.status_code == 200
+    assert [todo["id"] for todo in first.json()["items"]] == [best.id]
+
+    second = client.get(
+        "/todos/search",
+        params={"q": "mil", "limit": 1, "cursor": first.json()["next_cursor"]},
+        headers=headers,
+    ).json()
+    assert [todo["title"] for todo in second["items"]] == ["groceries"]
+    assert second["next_cursor"] is None
+
+
+@pytest.mark.parametrize("q", ["sữa", 'say "hi"'])
+def test_search_etag_is_header_safe(client, db, test_user, q):
+    _seed_todos(db, test_user.id, [1], [("sữa tươi", 'say "hi"')])
+    headers = auth_headers(test_user)
+
+    response = client.get("/todos/search", params={"q": q}, headers=headers)
+    assert response.status_code == 200
+    assert len(response.json()["items"]) == 1
+    etag = response.headers["ETag"]
+    assert etag.isascii() and etag.count('"') == 2
+
+    revalidated = client.get(
+        "/todos/search", params={"q": q}, headers={**headers, "If-None-Match": etag}
+    )
+    assert revalidated.status_code == 304
+
+
+def test_search_sees_updates_and_deletes(client, db, test_user, test_todo):
+    headers = auth_headers(test_user)
+    params = {"q": "renamed"}
+    assert (
+        client.get("/todos/search", params=params, headers=headers).json()["items"]
+        == []
+    )
+
+    client.put(
+        f"/todos/todo/{test_todo.id}",
+        params={
+            "title": "renamed todo",
+            "description": "updated",
+            "priority": 2,
+            "complete": False,
+        },
+        headers=headers,
+    )
+    found = client.get("/todos/search", params=params, headers=headers).json()
+    assert [todo["id"] for todo in found["items"]] == [test_todo.id]
+
+    client.delete(f"/todos/todo/{test_todo.id}", headers=headers)
+    assert (
+        client.get("/todos/search", params=params, headers=headers).json()["items"]
+        == []
+    )
+
+
+def test_search_ignores_query_syntax(client, test_user, test_todo):
+    response = client.get(
+        "/todos/search", params={"q": '"* OR NEAR('}, headers=auth_headers(test_user)
+    )
+    assert response.status_code == 200
+    assert response.json() == {"items": [], "next_cursor": None}
+
+
+def _token(user) -> str:
+    return auth_headers(user)["Authorization"].removeprefix("Bearer ")
+
+
+def test_websocket_pushes_todo_events(client, test_user, admin_user, test_todo):
+    with client.websocket_connect(f"/todos/ws?token={_token(test_user)}") as ws:
+        created = client.post(
+            "/todos/todo",
+            headers=auth_headers(test_user),
+            json={"title": "pushed", "description": "live", "priority": 2},
+        ).json()
+        event = ws.receive_json()
+        assert event["type"] == "created"
+        assert event["ids"] == [created["id"]]
+        assert event["todos"][0]["title"] == "pushed"
+
+        client.delete(f"/admin/todo/{test_todo.id}", headers=auth_headers(admin_user))
+        assert ws.receive_json() == {
+            "type": "deleted",
+            "owner_id": test_user.id,
+            "ids": [test_todo.id],
+        }
+
+
+def test_websocket_rejects_bad_token(client):
+    with pytest.raises(WebSocketDisconnect):
+        with client.websocket_connect("/todos/ws?token=nope") as ws:
+            ws.receive_json()
+
+
+def test_changes_returns_deltas_after_cursor(client, test_user, admin_user):
+    headers = auth_headers(test_user)
+    cursor = client.get("/todos/changes", headers=headers).json()["next_cursor"]
+    payload = {"title": "Sync me", "description": "desc", "priority": 2}
+    todo_id = client.post("/todos/todo", json=payload, headers=headers).json()["id"]
+    client.post("/todos/todo", json=payload, headers=auth_headers(admin_user))
+
+    page = client.get(
+        "/todos/changes", params={"since": cursor}, headers=headers
+    ).json()
+    assert [(c["todo_id"], c["op"]) for c in page["changes"]] == [(todo_id, "upsert")]
+    assert page["changes"][0]["todo"]["title"] == "Sync me"
+    assert not page["resync_required"]
+
+    client.delete(f"/todos/todo/{todo_id}", headers=headers)
+    page = client.get(
+        "/todos/changes", params={"since": page["next_cursor"]}, headers=headers
+    ).json()
+    assert page["changes"] == [{"todo_id": todo_id, "op": "delete", "todo": None}]
+
+    response = client.get("/todos/changes", params={"since": "??"}, headers=headers)
+    assert response.status_code == 400
+
+
+def test_import_runs_in_background_and_reports_progress(client, test_user, admin_user):
+    headers = auth_headers(test_user)
+    body = "title,description,priority\nImported,desc,3\nBad,desc,0\n"
+    response = client.post(
+        "/todos/imports",
+        content=body,
+        headers={**headers, "Content-Type": "text/csv"},
+    )
+    assert response.status_code == 202
+    location = response.headers["Location"]
+
+    # TestClient chạy background task xong rồi mới trả response
+    job = client.get(location, headers=headers).json()
+    assert job["status"] == "completed"
+    assert (job["rows_imported"], job["rows_failed"]) == (1, 1)
+    assert job["errors"][0]["row"] == 2
+    titles = [
+        todo["title"] for todo in client.get("/todos/", headers=headers).json()["items"]
+    ]
+    assert titles == ["Imported"]
+
+    assert client.get(location, headers=auth_headers(admin_user)).status_code == 404
+    response = client.post("/todos/imports", content=body, headers=headers)
+    assert response.status_code == 415
+    response = client.post(
+        "/todos/imports", params={"format": "jsonl"}, content=b"", headers=headers
+    )
+    assert response.status_code == 400
+
+
+def test_idempotency_key_replays_create_and_bulk(client, db, test_user):
+    headers = {**auth_headers(test_user), "Idempotency-Key": "create-1"}
+    payload = {"title": "Only once", "description": "desc", "priority": 2}
+    first = client.post("/todos/todo", json=payload, headers=headers)
+    retry = client.post("/todos/todo", json=payload, headers=headers)
+    assert first.status_code == retry.status_code == 201
+    assert retry.json() == first.json()
+    assert retry.headers["Idempotent-Replayed"] == "true"
+    assert db.query(Todos).filter(Todos.owner_id == test_user.id).count() == 1
+
+    # Cùng key nhưng request khác => 422, không tạo gì thêm
+    response = client.post(
+        "/todos/todo", json={**payload, "priority": 3}, headers=headers
+    )
+    assert response.status_code == 422
+
+    bulk_headers = {**auth_headers(test_user), "Idempotency-Key": "bulk-1"}
+    for _ in range(2):
+        response = client.post("/todos/bulk", json=[payload] * 2, headers=bulk_headers)
+        assert response.status_code == 201
+    assert db.query(Todos).filter(Todos.owner_id == test_user.id).count() == 3
@@ -1,4 +1,40 @@
 # Auto-generated test for app.api.v1.users
+from test.conftest import TEST_PASSWORD, auth_headers
+
 
 def test_placeholder():
     assert True
+
+
+def test_change_password(client, test_user):
+    headers = auth_headers(test_user)
+    response = client.put(
+        "/user/password",
+        json={"password": TEST_PASSWORD, "new_password": "newpassword"},
+        headers=headers,
+    )
+    assert response.status_code == 204
+
+    response = client.post(
+        "/auth/token",
+        data={"username": test_user.username, "password": "newpassword"},
+    )
+    assert response.status_code == 200
+
+
+def test_change_password_rejects_wrong_current_password(client, test_user):
+    response = client.put(
+        "/user/password",
+        json={"password": "wrong", "new_password": "newpassword"},
+        headers=auth_headers(test_user),
+    )
+    assert response.status_code == 401
+
+
+def test_change_password_retry_with_idempotency_key(client, test_user):
+    headers = {**auth_headers(test_user), "Idempotency-Key": "password-1"}
+    body = {"password": TEST_PASSWORD, "new_password": "newpassword"}
+    for _ in range(2):
+        # Lần retry không kiểm tra lại mật khẩu cũ (đã đổi) mà trả lại 204
+        response = client.put("/user/password", json=body, headers=headers)
+        assert response.status_code == 204
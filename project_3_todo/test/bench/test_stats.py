@@ -0,0 +1,24 @@
+from bench.stats import compare, percentile, summarize
+
+
+def test_percentile_nearest_rank():
+    values = [float(value) for value in range(1, 101)]
+    assert percentile(values, 50) == 50.0
+    assert percentile(values, 99) == 99.0
+    assert percentile([], 95) == 0.0
+
+
+def test_summarize_reports_rps_and_percentiles():
+    report = summarize({"GET /todos/": [0.01] * 10}, {"GET /todos/": 1}, elapsed=2.0)
+    route = report["routes"]["GET /todos/"]
+    assert route["rps"] == 5.0
+    assert route["errors"] == 1
+    assert round(route["p95_ms"], 6) == 10.0
+
+
+def test_compare_flags_regressions_beyond_threshold():
+    baseline = {"routes": {"GET /todos/": {"p95_ms": 10.0, "rps": 100.0}}}
+    ok = {"routes": {"GET /todos/": {"p95_ms": 10.5, "rps": 95.0}}}
+    slow = {"routes": {"GET /todos/": {"p95_ms": 20.0, "rps": 50.0}}}
+    assert compare(ok, baseline, threshold_pct=10) == []
+    assert len(compare(slow, baseline, threshold_pct=10)) == 2
@@ -0,0 +1,99 @@
+import os
+import tempfile
+
+# Cấu hình DB test trước khi import app (engine được tạo lúc import)
+_TEST_DIR = tempfile.mkdtemp(prefix="todoapp-test-")
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{_TEST_DIR}/test.db")
+# Schema được tạo lại cho từng test (xem _reset_db)
+os.environ.setdefault("RUN_MIGRATIONS_ON_STARTUP", "0")
+
+import pytest  # noqa: E402
+from fastapi.testclient import TestClient  # noqa: E402
+
+from app.core.config import ACCESS_TOKEN_EXPIRE_DELTA  # noqa: E402
+from app.core.database import Base, SessionLocal, engine  # noqa: E402
+from app.core.idempotency import idempotency_store  # noqa: E402
+from app.core.read_routing import read_your_writes  # noqa: E402
+from app.core.token_cache import token_cache  # noqa: E402
+from app.main import app  # noqa: E402
+from app.models import Todos, Users  # noqa: E402
+from app.core.security import bcrypt_context  # noqa: E402
+from app.services.auth_service import create_access_token  # noqa: E402
+from app.services.todo_service import todo_cache, todo_cache_stats  # noqa: E402
+
+TEST_PASSWORD = "testpassword"
+
+
+@pytest.fixture(autouse=True)
+def _reset_db():
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    token_cache.clear()
+    todo_cache.clear()
+    todo_cache_stats.reset()
+    read_your_writes.clear()
+    idempotency_store.clear()
+    yield
+
+
+@pytest.fixture
+def db():
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+@pytest.fixture
+def client():
+    with TestClient(app) as test_client:
+        yield test_client
+
+
+def _make_user(db, username: str, role: str) -> Users:
+    user = Users(
+        username=username,
+        email=f"{username}@example.com",
+        first_name=username,
+        last_name="Test",
+        hashed_password=bcrypt_context.hash(TEST_PASSWORD),
+        role=role,
+        is_active=True,
+    )
+    db.add(user)
+    db.commit()
+    db.refresh(user)
+    return user
+
+
+@pytest.fixture
+def test_user(db):
+    return _make_user(db, "alice", "user")
+
+
+@pytest.fixture
+def admin_user(db):
+    return _make_user(db, "root", "admin")
+
+
+@pytest.fixture
+def test_todo(db, test_user):
+    todo = Todos(
+        title="Learn FastAPI",
+        description="So I can build powerful web APIs",
+        priority=3,
+        complete=False,
+        owner_id=test_user.id,
+    )
+    db.add(todo)
+    db.commit()
+    db.refresh(todo)
+    return todo
+
+
+def auth_headers(user: Users) -> dict:
+    token = create_access_token(
+        user.username, user.id, user.role, ACCESS_TOKEN_EXPIRE_DELTA
+    )
+    return {"Authorization": f"Bearer {token}"}
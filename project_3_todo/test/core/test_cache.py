@@ -0,0 +1,75 @@
+import threading
+import time
+
+from app.core.cache import CacheStats, MemoryCache, RedisCache
+
+
+class LocalRedis:
+    """Stand-in tối giản cho redis-py, đủ cho RedisCache."""
+
+    def __init__(self):
+        self.data = {}
+
+    def get(self, key):
+        value, expires_at = self.data.get(key, (None, None))
+        if expires_at is not None and expires_at <= time.monotonic():
+            del self.data[key]
+            return None
+        return value
+
+    def set(self, key, value, ex=None):
+        expires_at = time.monotonic() + ex if ex else None
+        self.data[key] = (
+            value.encode() if isinstance(value, str) else value,
+            expires_at,
+        )
+
+    def delete(self, *keys):
+        for key in keys:
+            self.data.pop(key, None)
+
+    def flushdb(self):
+        self.data.clear()
+
+
+class ThreadRecordingRedis(LocalRedis):
+    """LocalRedis ghi lại thread đã gọi get / set."""
+
+    def __init__(self):
+        super().__init__()
+        self.threads = set()
+
+    def get(self, key):
+        self.threads.add(threading.get_ident())
+        return super().get(key)
+
+    def set(self, key, value, ex=None):
+        self.threads.add(threading.get_ident())
+        super().set(key, value, ex)
+
+
+
+def test_memory_cache_expires_and_evicts():
+    cache = MemoryCache(max_size=2)
+    cache.set("a", 1, ttl=60)
+    cache.set("b", 2, ttl=0)
+    assert cache.get("b") is None
+    cache.set("c", 3, ttl=60)
+    cache.set("d", 4, ttl=60)
+    assert cache.get("a") is None
+    assert cache.get("d") == 4
+
+
+def test_redis_cache_roundtrip_with_local_stand_in():
+    cache = RedisCache(LocalRedis())
+    cache.set("todos:1:item:1", {"id": 1, "title": "x"}, ttl=60)
+    assert cache.get("todos:1:item:1") == {"id": 1, "title": "x"}
+    cache.delete("todos:1:item:1")
+    assert cache.get("todos:1:item:1") is None
+
+
+def test_cache_stats_hit_rate():
+    stats = CacheStats()
+    stats.record(hit=True)
+    stats.record(hit=False)
+    assert stats.as_dict() == {"hits": 1, "misses": 1, "hit_rate": 0.5}
@@ -0,0 +1,18 @@
+import pytest
+
+from app.core.database import to_async_url
+
+
+def test_to_async_url_maps_known_drivers():
+    assert (
+        to_async_url("sqlite:///./todosapp.db") == "sqlite+aiosqlite:///./todosapp.db"
+    )
+    assert (
+        to_async_url("postgresql://u:p@localhost/todos")
+        == "postgresql+asyncpg://u:p@localhost/todos"
+    )
+
+
+def test_to_async_url_rejects_unknown_backend():
+    with pytest.raises(ValueError):
+        to_async_url("mysql://u:p@localhost/todos")
@@ -0,0 +1,86 @@
+import asyncio
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+
+from app.core import engine_profile
+from app.core.database import create_profiled_engine
+from app.core.engine_profile import (
+    get_engine_profile,
+    run_sqlite_maintenance,
+    sqlite_maintenance_loop,
+)
+
+
+def _pragma(engine, name: str):
+    with engine.connect() as connection:
+        return connection.exec_driver_sql(f"PRAGMA {name}").scalar()
+
+
+def test_tuned_sqlite_profile_applies_pragmas_on_connect(tmp_path):
+    engine = create_profiled_engine(f"sqlite:///{tmp_path}/tuned.db", "tuned")
+    try:
+        assert _pragma(engine, "journal_mode") == "wal"
+        assert _pragma(engine, "synchronous") == 1  # NORMAL
+        assert _pragma(engine, "busy_timeout") == 5000
+        assert _pragma(engine, "temp_store") == 2  # MEMORY
+        assert _pragma(engine, "cache_size") == -64000
+    finally:
+        engine.dispose()
+
+
+def test_default_sqlite_profile_keeps_rollback_journal(tmp_path):
+    engine = create_profiled_engine(f"sqlite:///{tmp_path}/default.db", "default")
+    try:
+        assert _pragma(engine, "journal_mode") == "delete"
+    finally:
+        engine.dispose()
+
+
+def test_postgres_tuned_profile_carries_pool_and_statement_settings():
+    profile = get_engine_profile("postgresql://user:pw@localhost/todos", "tuned")
+    assert profile.engine_kwargs["pool_pre_ping"] is True
+    assert "pool_recycle" in profile.engine_kwargs
+    assert any(
+        s.startswith("SET statement_timeout") for s in profile.connect_statements
+    )
+
+
+def test_unknown_profile_is_rejected():
+    with pytest.raises(ValueError):
+        get_engine_profile("sqlite://", "turbo")
+
+
+def test_maintenance_truncates_wal(tmp_path):
+    engine = create_profiled_engine(f"sqlite:///{tmp_path}/wal.db", "tuned")
+    try:
+        with engine.begin() as connection:
+            connection.execute(text("CREATE TABLE t (x INTEGER)"))
+            connection.execute(text("INSERT INTO t VALUES (1)"))
+        run_sqlite_maintenance(engine)
+        assert (tmp_path / "wal.db-wal").stat().st_size == 0
+    finally:
+        engine.dispose()
+
+
+def test_maintenance_loop_survives_failures(monkeypatch, caplog):
+    calls = []
+
+    def flaky_maintenance(engine):
+        calls.append(engine)
+        if len(calls) == 1:
+            raise OperationalError(
+                "PRAGMA optimize", {}, Exception("database is locked")
+            )
+
+    monkeypatch.setattr(engine_profile, "run_sqlite_maintenance", flaky_maintenance)
+
+    async def run_until_retried():
+        task = asyncio.create_task(sqlite_maintenance_loop("engine", 0))
+        while len(calls) < 2:
+            await asyncio.sleep(0.01)
+        task.cancel()
+
+    asyncio.run(asyncio.wait_for(run_until_retried(), 5))
+    assert "SQLite maintenance failed" in caplog.text
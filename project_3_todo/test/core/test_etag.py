@@ -0,0 +1,19 @@
+from app.core.etag import etag_digest, etag_matches, make_etag
+
+
+def test_make_etag_is_quoted():
+    assert make_etag("todos", 1, 7) == '"todos-1-7"'
+
+
+def test_etag_matches_lists_weak_and_wildcard():
+    etag = make_etag("todos", 1, 7)
+    assert etag_matches('"other", W/"todos-1-7"', etag)
+    assert etag_matches("*", etag)
+    assert not etag_matches('"todos-1-6"', etag)
+    assert not etag_matches(None, etag)
+
+
+def test_etag_digest_is_header_safe():
+    digest = etag_digest('say "hi"', "sữa", 10, None)
+    assert digest.isascii() and digest.isalnum()
+    assert digest != etag_digest('say "hi"', "sữa", 20, None)
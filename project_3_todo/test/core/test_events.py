@@ -0,0 +1,181 @@
+import asyncio
+import queue
+import threading
+
+from app.core.events import (
+    DROPPED,
+    EventBroker,
+    RedisEventBackend,
+    format_sse,
+    sse_stream,
+)
+
+
+class LocalPubSubHub:
+    """Stand-in tối giản cho redis-py pub/sub (publish + psubscribe)."""
+
+    def __init__(self):
+        self.listeners = []
+
+    def publish(self, channel, data):
+        for prefix, inbox in list(self.listeners):
+            if channel.startswith(prefix):
+                inbox.put(
+                    {"type": "pmessage", "channel": channel.encode(), "data": data}
+                )
+
+    def pubsub(self, ignore_subscribe_messages=True):
+        return LocalPubSub(self)
+
+
+class LocalPubSub:
+    def __init__(self, hub):
+        self.hub = hub
+        self.inbox = queue.Queue()
+
+    def psubscribe(self, pattern):
+        self.hub.listeners.append((pattern.rstrip("*"), self.inbox))
+
+    def listen(self):
+        while (message := self.inbox.get()) is not None:
+            yield message
+
+    def close(self):
+        self.inbox.put(None)
+
+
+async def _next(subscription, timeout=1):
+    return await asyncio.wait_for(subscription.get(), timeout)
+
+
+def test_fan_out_only_to_subscribers_of_the_channel():
+    async def scenario():
+        broker = EventBroker()
+        first = broker.subscribe("todos:1")
+        second = broker.subscribe("todos:1")
+        other = broker.subscribe("todos:2")
+        broker.publish("todos:1", {"type": "created", "ids": [1]})
+        assert (await _next(first))["ids"] == [1]
+        assert (await _next(second))["ids"] == [1]
+        assert other.queue.empty()
+        first.close()
+        assert broker.subscriber_count("todos:1") == 1
+
+    asyncio.run(scenario())
+
+
+def test_publish_from_worker_thread_is_delivered_on_loop():
+    async def scenario():
+        broker = EventBroker()
+        subscription = broker.subscribe("todos:1")
+        thread = threading.Thread(
+            target=broker.publish, args=("todos:1", {"type": "deleted", "ids": [3]})
+        )
+        thread.start()
+        thread.join()
+        assert (await _next(subscription))["type"] == "deleted"
+
+    asyncio.run(scenario())
+
+
+def test_slow_consumer_is_dropped_without_blocking_publisher():
+    async def scenario():
+        broker = EventBroker(queue_size=2)
+        slow = broker.subscribe("todos:1")
+        for index in range(3):
+            broker.publish("todos:1", {"type": "created", "ids": [index]})
+        await asyncio.sleep(0)
+        assert await _next(slow) is DROPPED
+        assert broker.subscriber_count() == 0
+
+    asyncio.run(scenario())
+
+
+def test_thousands_of_idle_subscribers():
+    async def scenario():
+        broker = EventBroker()
+        subscriptions = [broker.subscribe(f"todos:{i}") for i in range(5000)]
+        assert broker.subscriber_count() == 5000
+        broker.publish("todos:4999", {"type": "created", "ids": [1]})
+        assert (await _next(subscriptions[-1]))["ids"] == [1]
+        assert all(s.queue.empty() for s in subscriptions[:-1])
+
+    asyncio.run(scenario())
+
+
+def test_redis_backend_fans_out_across_workers():
+    hub = LocalPubSubHub()
+    publisher = EventBroker(RedisEventBackend(hub))
+    subscriber = EventBroker(RedisEventBackend(hub))
+
+    async def scenario():
+        subscription = subscriber.subscribe("todos:1")
+        publisher.publish("todos:1", {"type": "updated", "ids": [7]})
+        assert await _next(subscription) == {"type": "updated", "ids": [7]}
+
+    try:
+        asyncio.run(scenario())
+    finally:
+        subscriber.close()
+
+
+def test_sse_stream_sends_events_heartbeats_and_stops_when_dropped():
+    async def scenario():
+        broker = EventBroker(queue_size=1)
+        subscription = broker.subscribe("todos:1")
+        stream = sse_stream(subscription, heartbeat_seconds=0.01)
+        assert await anext(stream) == ": connected\n\n"
+        assert await anext(stream) == ": keepalive\n\n"
+
+        event = {"type": "created", "ids": [1]}
+        broker.publish("todos:1", event)
+        await asyncio.sleep(0)
+        assert await anext(stream) == format_sse(event)
+
+        for index in range(2):
+            broker.publish("todos:1", {"type": "created", "ids": [index]})
+        await asyncio.sleep(0)
+        assert (await anext(stream)).startswith("event: dropped")
+        assert [chunk async for chunk in stream] == []
+        assert broker.subscriber_count() == 0
+
+    asyncio.run(scenario())
+
+
+class FlakyPubSubHub(LocalPubSubHub):
+    """Lần subscribe đầu: một message lỗi rồi mất kết nối."""
+
+    def __init__(self):
+        super().__init__()
+        self.subscriptions = 0
+
+    def pubsub(self, ignore_subscribe_messages=True):
+        self.subscriptions += 1
+        if self.subscriptions == 1:
+            return FlakyPubSub(self)
+        return LocalPubSub(self)
+
+
+class FlakyPubSub(LocalPubSub):
+    def listen(self):
+        yield {"type": "pmessage", "channel": b"todoapp:events:todos:1", "data": "{"}
+        raise ConnectionError("Connection reset by peer")
+
+
+def test_redis_listener_logs_and_resubscribes(caplog):
+    hub = FlakyPubSubHub()
+    broker = EventBroker(RedisEventBackend(hub, retry_seconds=0.01))
+
+    async def scenario():
+        subscription = broker.subscribe("todos:1")
+        while hub.subscriptions < 2 or len(hub.listeners) < 2:
+            await asyncio.sleep(0.01)
+        hub.publish("todoapp:events:todos:1", '{"type": "updated", "ids": [7]}')
+        assert await _next(subscription) == {"type": "updated", "ids": [7]}
+
+    try:
+        asyncio.run(scenario())
+    finally:
+        broker.close()
+    assert "Dropping malformed event on todoapp:events:todos:1" in caplog.text
+    assert "Redis event listener failed" in caplog.text
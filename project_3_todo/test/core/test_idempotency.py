@@ -0,0 +1,124 @@
+import asyncio
+import threading
+from types import SimpleNamespace
+
+import pytest
+from fastapi import HTTPException
+
+from app.core.cache import MemoryCache, RedisCache
+from app.core.idempotency import (
+    IdempotencyStore,
+    encode_response,
+    request_fingerprint,
+)
+from app.schemas.todo import TodoResponse
+from test.core.test_cache import ThreadRecordingRedis
+
+
+def _store() -> IdempotencyStore:
+    return IdempotencyStore(MemoryCache(10), ttl=60)
+
+
+def test_retry_replays_stored_result_without_calling_again():
+    store = _store()
+    calls = []
+
+    async def call():
+        calls.append(1)
+        return {"id": len(calls)}
+
+    async def scenario():
+        first = await store.run("k", "fp", call, dict)
+        second = await store.run("k", "fp", call, dict)
+        return first, second
+
+    assert asyncio.run(scenario()) == (({"id": 1}, False), ({"id": 1}, True))
+    assert len(calls) == 1
+
+
+def test_key_reused_for_different_request_is_rejected():
+    store = _store()
+
+    async def call():
+        return {"id": 1}
+
+    asyncio.run(store.run("k", "fp", call, dict))
+    with pytest.raises(HTTPException) as exc_info:
+        asyncio.run(store.run("k", "other", call, dict))
+    assert exc_info.value.status_code == 422
+
+
+def test_concurrent_duplicates_share_the_first_result():
+    store = _store()
+    calls = []
+
+    async def call():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return {"id": 1}
+
+    async def scenario():
+        return await asyncio.gather(
+            *[store.run("k", "fp", call, dict) for _ in range(5)]
+        )
+
+    results = asyncio.run(scenario())
+    assert len(calls) == 1
+    assert [replayed for _, replayed in results] == [False, True, True, True, True]
+
+
+def test_failed_request_is_not_stored_and_waiting_duplicate_runs_itself():
+    store = _store()
+    attempts = []
+
+    async def call():
+        attempts.append(1)
+        await asyncio.sleep(0.02)
+        if len(attempts) == 1:
+            raise HTTPException(status_code=404)
+        return {"id": 1}
+
+    async def scenario():
+        return await asyncio.gather(
+            store.run("k", "fp", call, dict),
+            store.run("k", "fp", call, dict),
+            return_exceptions=True,
+        )
+
+    first, second = asyncio.run(scenario())
+    assert isinstance(first, HTTPException)
+    assert second == ({"id": 1}, False)
+    assert len(attempts) == 2
+
+
+def test_fingerprint_and_encoding():
+    assert request_fingerprint("POST", "/a", "", b"x") != request_fingerprint(
+        "POST", "/a", "x", b""
+    )
+    todo = SimpleNamespace(
+        id=1, title="t", description="d", priority=1, complete=False, owner_id=2
+    )
+    assert encode_response(list[TodoResponse], [todo])[0]["owner_id"] == 2
+    assert encode_response(None, object()) is None
+
+
+def test_redis_backend_io_runs_off_the_event_loop():
+    client = ThreadRecordingRedis()
+    store = IdempotencyStore(RedisCache(client), ttl=60)
+    calls = []
+
+    async def call():
+        calls.append(1)
+        await asyncio.sleep(0.02)
+        return {"id": 1}
+
+    async def scenario():
+        results = await asyncio.gather(
+            *[store.run("k", "fp", call, dict) for _ in range(3)]
+        )
+        return threading.get_ident(), results
+
+    loop_thread, results = asyncio.run(scenario())
+    assert client.threads and loop_thread not in client.threads
+    assert len(calls) == 1
+    assert [replayed for _, replayed in results] == [False, True, True]
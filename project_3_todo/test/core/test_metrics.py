@@ -0,0 +1,45 @@
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+
+from app.core.metrics import Histogram, instrument_engines, metrics
+from test.conftest import auth_headers
+
+
+def test_histogram_buckets_are_cumulative_in_output():
+    histogram = Histogram((0.1, 1.0))
+    for value in (0.05, 0.5, 5.0):
+        histogram.observe(value)
+    assert histogram.counts == [1, 1]
+    assert histogram.count == 3
+
+
+def test_metrics_endpoint_reports_route_templates_and_db_queries(
+    client, test_user, test_todo
+):
+    metrics.reset()
+    headers = auth_headers(test_user)
+    client.get(f"/todos/todo/{test_todo.id}", headers=headers)
+    client.get("/todos/todo/999", headers=headers)
+
+    body = client.get("/metrics").text
+    route = 'method="GET",route="/todos/todo/{todo_id}"'
+    assert f'http_requests_total{{{route},status="2xx"}} 1' in body
+    assert f'http_requests_total{{{route},status="4xx"}} 1' in body
+    assert f'http_request_duration_seconds_bucket{{{route},le="+Inf"}} 2' in body
+    assert f"http_request_duration_seconds_count{{{route}}} 2" in body
+
+    db_queries = next(
+        line
+        for line in body.splitlines()
+        if line.startswith(f"db_queries_total{{{route}")
+    )
+    assert int(db_queries.rsplit(" ", 1)[1]) >= 2
+
+
+def test_failing_statement_does_not_leak_start_time(db):
+    instrument_engines()
+    connection = db.connection()
+    with pytest.raises(OperationalError):
+        db.execute(text("SELECT * FROM missing_table"))
+    assert connection.info.get("query_started") == []
@@ -0,0 +1,43 @@
+from alembic.autogenerate import compare_metadata
+from alembic.migration import MigrationContext
+from sqlalchemy import Column, Integer, MetaData, String, Table, create_engine, inspect
+
+from app.core.database import Base
+from app.core.migrations import run_migrations
+from app.models.todo_search import include_object
+
+
+def test_upgrade_head_matches_models(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path}/migrated.db")
+    run_migrations(engine)
+
+    with engine.connect() as connection:
+        context = MigrationContext.configure(
+            connection, opts={"include_object": include_object}
+        )
+        diff = compare_metadata(context, Base.metadata)
+    assert diff == []
+
+
+def test_legacy_create_all_database_is_stamped_and_upgraded(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path}/legacy.db")
+    # Schema cũ do create_all tạo, chưa có alembic_version và index mới
+    legacy = MetaData()
+    Table("users", legacy, Column("id", Integer, primary_key=True))
+    Table(
+        "todos",
+        legacy,
+        Column("id", Integer, primary_key=True),
+        Column("owner_id", Integer),
+        Column("priority", Integer),
+        Column("complete", Integer),
+        Column("title", String),
+        Column("description", String),
+    )
+    legacy.create_all(engine)
+
+    run_migrations(engine)
+
+    indexes = {index["name"] for index in inspect(engine).get_indexes("todos")}
+    assert "ix_todos_owner_id_id" in indexes
+    assert "alembic_version" in inspect(engine).get_table_names()
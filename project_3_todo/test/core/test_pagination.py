@@ -0,0 +1,23 @@
+import pytest
+from fastapi import HTTPException
+
+from app.core.pagination import decode_cursor, encode_cursor
+
+
+def test_cursor_roundtrip():
+    cursor = encode_cursor("priority", [2, 15])
+    assert decode_cursor(cursor, "priority", 2) == [2, 15]
+
+
+@pytest.mark.parametrize(
+    "cursor, order_by, size",
+    [
+        ("not-base64!", "id", 1),
+        (encode_cursor("priority", [2, 15]), "id", 1),
+        (encode_cursor("id", ["x"]), "id", 1),
+    ],
+)
+def test_invalid_cursor_is_rejected(cursor, order_by, size):
+    with pytest.raises(HTTPException) as exc:
+        decode_cursor(cursor, order_by, size)
+    assert exc.value.status_code == 400
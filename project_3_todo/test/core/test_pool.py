@@ -0,0 +1,69 @@
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, exc
+
+from app.core.config import DB_POOL_SIZE
+from app.core.pool import InstrumentedQueuePool, pool_status, prewarm_pool
+from app.main import app
+
+
+@pytest.fixture
+def small_engine(tmp_path):
+    engine = create_engine(
+        f"sqlite:///{tmp_path}/pool.db",
+        poolclass=InstrumentedQueuePool,
+        pool_size=1,
+        max_overflow=1,
+        pool_timeout=0.05,
+    )
+    yield engine
+    engine.dispose()
+
+
+def test_pool_stats_track_overflow_and_timeouts(small_engine):
+    first = small_engine.connect()
+    second = small_engine.connect()  # overflow
+    with pytest.raises(exc.TimeoutError):
+        small_engine.connect()
+
+    status = pool_status(small_engine)
+    assert status["checked_out"] == 2
+    assert status["overflow"] == 1
+    assert status["overflow_events"] == 1
+    assert status["timeouts"] == 1
+    assert status["wait_seconds_max"] >= 0
+    first.close()
+    second.close()
+
+
+def test_prewarm_opens_connections_up_front(tmp_path):
+    engine = create_engine(
+        f"sqlite:///{tmp_path}/warm.db", poolclass=InstrumentedQueuePool, pool_size=3
+    )
+    try:
+        assert prewarm_pool(engine, 3) == 3
+        status = pool_status(engine)
+        assert status["idle"] == 3
+        assert status["checked_out"] == 0
+    finally:
+        engine.dispose()
+
+
+def test_stats_survive_dispose(small_engine):
+    small_engine.connect().close()
+    small_engine.dispose()
+    assert pool_status(small_engine)["checkouts"] == 1
+
+
+def test_ready_reports_warm_pool(client):
+    response = client.get("/ready")
+    assert response.status_code == 200
+    body = response.json()
+    assert body["status"] == "ready"
+    assert body["pool"]["idle"] + body["pool"]["checked_out"] >= DB_POOL_SIZE
+
+
+def test_not_ready_before_startup():
+    response = TestClient(app).get("/ready")
+    assert response.status_code == 503
+    assert response.json()["status"] == "starting"
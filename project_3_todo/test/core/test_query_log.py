@@ -0,0 +1,82 @@
+import logging
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+
+from app.core import query_log
+from app.core.query_log import (
+    QueryLogMiddleware,
+    assert_max_queries,
+    statement_shape,
+    track_queries,
+)
+from app.main import app
+from app.services import todo_service
+from test.conftest import auth_headers
+
+
+def test_statement_shape_collapses_in_lists_and_whitespace():
+    assert statement_shape("SELECT *\n  FROM todos WHERE id IN (?, ?, ?)") == (
+        "SELECT * FROM todos WHERE id IN (?)"
+    )
+    assert statement_shape("SELECT 1 WHERE id IN (?)") == "SELECT 1 WHERE id IN (?)"
+
+
+def test_tracker_reports_repeated_shapes(db):
+    query_log.install()
+    with track_queries() as tracker:
+        for todo_id in range(4):
+            db.execute(text("SELECT :id"), {"id": todo_id})
+        db.execute(text("SELECT 1"))
+
+    assert tracker.count == 5
+    assert tracker.repeated_shapes(3) == {"SELECT ?": 4}
+    assert tracker.repeated_shapes(4) == {}
+
+
+def test_failing_statement_does_not_leak_start_time(db):
+    query_log.install()
+    connection = db.connection()
+    with pytest.raises(OperationalError):
+        db.execute(text("SELECT * FROM missing_table"))
+    assert connection.info.get("query_log_started") == []
+
+
+def test_assert_max_queries_fails_with_statements(db):
+    with pytest.raises(AssertionError, match="at most 1 queries, got 2"):
+        with assert_max_queries(1):
+            db.execute(text("SELECT 1"))
+            db.execute(text("SELECT 2"))
+
+
+def test_slow_query_logs_params_and_calling_service(db, test_todo, caplog, monkeypatch):
+    query_log.install()
+    monkeypatch.setattr(query_log, "SLOW_QUERY_THRESHOLD_MS", 0)
+    with caplog.at_level(logging.WARNING, logger="app.query_log"):
+        todo_service.get_todo_by_id(db, test_todo.owner_id, test_todo.id)
+
+    message = caplog.records[-1].getMessage()
+    assert "Slow query" in message
+    assert "todo_service.get_todo_model:" in message
+    assert f"params=({test_todo.id}, {test_todo.owner_id}" in message
+
+
+def test_middleware_flags_n_plus_one(client, test_user, test_todo, caplog):
+    query_log.install()
+    flagged = TestClient(QueryLogMiddleware(app, threshold=0))
+    with caplog.at_level(logging.WARNING, logger="app.query_log"):
+        flagged.get("/todos/", headers=auth_headers(test_user))
+
+    messages = [record.getMessage() for record in caplog.records]
+    assert any("Possible N+1 in GET /todos/" in message for message in messages)
+
+
+def test_read_endpoints_stay_within_query_budget(client, test_user, test_todo):
+    headers = auth_headers(test_user)
+    # version + page; lần hai: version + cache hit
+    with assert_max_queries(3):
+        assert client.get("/todos/", headers=headers).status_code == 200
+    with assert_max_queries(2):
+        assert client.get("/todos/", headers=headers).status_code == 200
@@ -0,0 +1,37 @@
+from app.core.rate_limit import GCRARateLimiter
+
+
+def test_allows_burst_up_to_limit_then_rejects():
+    limiter = GCRARateLimiter(limit=3, window_seconds=3, max_keys=100)
+    results = [limiter.hit("k", now=100.0) for _ in range(4)]
+    assert [result.allowed for result in results] == [True, True, True, False]
+    assert [result.remaining for result in results[:3]] == [2, 1, 0]
+    assert results[3].retry_after == 1.0
+    assert results[3].headers()["Retry-After"] == "1"
+
+
+def test_capacity_refills_over_time():
+    limiter = GCRARateLimiter(limit=2, window_seconds=2, max_keys=100)
+    limiter.hit("k", now=0.0)
+    limiter.hit("k", now=0.0)
+    assert not limiter.hit("k", now=0.5).allowed
+    assert limiter.hit("k", now=1.0).allowed
+
+
+def test_keys_are_independent():
+    limiter = GCRARateLimiter(limit=1, window_seconds=60, max_keys=100)
+    assert limiter.hit("a", now=0.0).allowed
+    assert limiter.hit("b", now=0.0).allowed
+    assert not limiter.hit("a", now=0.0).allowed
+
+
+def test_idle_and_excess_keys_are_evicted():
+    limiter = GCRARateLimiter(limit=10, window_seconds=10, max_keys=2)
+    limiter.hit("a", now=0.0)
+    limiter.hit("b", now=0.0)
+    limiter.hit("c", now=0.0)
+    assert len(limiter) == 2
+
+    # Sau khi bucket đầy lại, key cũ không còn giữ state
+    limiter.hit("d", now=100.0)
+    assert len(limiter) == 1
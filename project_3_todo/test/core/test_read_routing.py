@@ -0,0 +1,26 @@
+from app.core.config import READ_YOUR_WRITES_COOKIE
+from app.core.read_routing import ReadYourWrites, cookie_is_sticky
+
+
+def test_write_makes_user_sticky_for_window():
+    routing = ReadYourWrites(window_seconds=5, max_users=10)
+    routing.mark_write(1, now=100)
+    assert routing.is_sticky(1, now=104)
+    assert not routing.is_sticky(2, now=104)
+    assert not routing.is_sticky(1, now=105)
+    assert not routing.is_sticky(None, now=100)
+
+
+def test_sticky_map_is_bounded():
+    routing = ReadYourWrites(window_seconds=5, max_users=2)
+    for user_id in (1, 2, 3):
+        routing.mark_write(user_id, now=100)
+    assert not routing.is_sticky(1, now=101)
+    assert routing.is_sticky(3, now=101)
+
+
+def test_cookie_stickiness():
+    assert cookie_is_sticky({READ_YOUR_WRITES_COOKIE: "110"}, now=100)
+    assert not cookie_is_sticky({READ_YOUR_WRITES_COOKIE: "90"}, now=100)
+    assert not cookie_is_sticky({READ_YOUR_WRITES_COOKIE: "garbage"}, now=100)
+    assert not cookie_is_sticky({}, now=100)
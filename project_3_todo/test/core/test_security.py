@@ -0,0 +1,44 @@
+import asyncio
+import threading
+
+import pytest
+from fastapi import HTTPException
+
+from app.core.security import (
+    HashingExecutor,
+    ahash_password,
+    averify_password,
+    hash_password,
+    verify_password,
+)
+
+
+def test_hash_and_verify_roundtrip():
+    hashed = hash_password("secret123")
+    assert verify_password("secret123", hashed)
+    assert not verify_password("wrong", hashed)
+
+
+def test_async_hash_and_verify_roundtrip():
+    async def roundtrip():
+        hashed = await ahash_password("secret123")
+        return await averify_password("secret123", hashed)
+
+    assert asyncio.run(roundtrip())
+
+
+def test_saturated_executor_returns_503():
+    executor = HashingExecutor("thread", workers=1, max_pending=1)
+    release = threading.Event()
+    try:
+        future = executor.submit(release.wait)
+        with pytest.raises(HTTPException) as exc:
+            executor.submit(release.wait)
+        assert exc.value.status_code == 503
+        release.set()
+        future.result()
+        # Slot được trả lại sau khi job xong
+        assert executor.submit(lambda: "ok").result() == "ok"
+    finally:
+        release.set()
+        executor.shutdown()
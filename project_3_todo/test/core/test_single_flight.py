@@ -0,0 +1,99 @@
+import asyncio
+
+import pytest
+from fastapi import HTTPException
+
+from app.core.metrics import metrics
+from app.core.single_flight import SingleFlight
+
+
+def _slow_call(calls: list, result="value", delay=0.05, error=None):
+    async def call():
+        calls.append(1)
+        await asyncio.sleep(delay)
+        if error is not None:
+            raise error
+        return result
+
+    return call
+
+
+def test_concurrent_identical_calls_run_once():
+    flights, calls = SingleFlight(), []
+    metrics.reset()
+
+    async def scenario():
+        call = _slow_call(calls)
+        return await asyncio.gather(
+            *[flights.do("read", ("read", 1), 1, call) for _ in range(5)]
+        )
+
+    assert asyncio.run(scenario()) == ["value"] * 5
+    assert len(calls) == 1
+    assert metrics.single_flight == {("read", "executed"): 1, ("read", "collapsed"): 4}
+    assert flights.in_flight() == 0
+
+
+def test_different_keys_and_sequential_calls_are_not_collapsed():
+    flights, calls = SingleFlight(), []
+
+    async def scenario():
+        call = _slow_call(calls, delay=0.01)
+        await asyncio.gather(
+            flights.do("read", ("read", 1), 1, call),
+            flights.do("read", ("read", 2), 2, call),
+        )
+        await flights.do("read", ("read", 1), 1, call)
+
+    asyncio.run(scenario())
+    assert len(calls) == 3
+
+
+def test_exception_is_shared_with_waiting_calls():
+    flights, calls = SingleFlight(), []
+
+    async def scenario():
+        call = _slow_call(calls, error=HTTPException(status_code=404))
+        return await asyncio.gather(
+            *[flights.do("read", ("read", 1), 1, call) for _ in range(3)],
+            return_exceptions=True,
+        )
+
+    results = asyncio.run(scenario())
+    assert len(calls) == 1
+    assert all(isinstance(result, HTTPException) for result in results)
+
+
+def test_forget_starts_a_new_flight_after_a_write():
+    flights, calls = SingleFlight(), []
+
+    async def scenario():
+        call = _slow_call(calls)
+        first = asyncio.create_task(flights.do("read", ("read", 1), 1, call))
+        await asyncio.sleep(0)
+        # Owner vừa ghi => lời gọi sau không dùng kết quả của lời gọi trước
+        flights.forget(1)
+        second = asyncio.create_task(flights.do("read", ("read", 1), 1, call))
+        await asyncio.gather(first, second)
+
+    asyncio.run(scenario())
+    assert len(calls) == 2
+    assert flights.in_flight() == 0
+
+
+def test_waiting_call_retries_when_leader_is_cancelled():
+    flights, calls = SingleFlight(), []
+
+    async def scenario():
+        call = _slow_call(calls)
+        leader = asyncio.create_task(flights.do("read", ("read", 1), 1, call))
+        await asyncio.sleep(0)
+        follower = asyncio.create_task(flights.do("read", ("read", 1), 1, call))
+        await asyncio.sleep(0.01)
+        leader.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await leader
+        return await follower
+
+    assert asyncio.run(scenario()) == "value"
+    assert len(calls) == 2
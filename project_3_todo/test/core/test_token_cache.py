@@ -0,0 +1,48 @@
+import time
+from datetime import timedelta
+
+from app.core.token_cache import VerifiedTokenCache, token_cache
+from app.services.auth_service import create_access_token
+from test.conftest import auth_headers
+
+
+def test_entries_expire_at_token_exp():
+    cache = VerifiedTokenCache(max_size=10, max_ttl=300)
+    cache.set("token", {"id": 1}, exp=time.time() - 1)
+    assert cache.get("token") is None
+    assert cache.stats()["misses"] == 1
+
+
+def test_cache_is_bounded_lru():
+    cache = VerifiedTokenCache(max_size=2, max_ttl=300)
+    cache.set("a", {"id": 1})
+    cache.set("b", {"id": 2})
+    assert cache.get("a") == {"id": 1}
+    cache.set("c", {"id": 3})
+    assert cache.get("b") is None
+    assert cache.get("a") == {"id": 1}
+    assert cache.stats() == {"size": 2, "hits": 2, "misses": 1}
+
+
+def test_repeated_token_is_served_from_cache(client, test_user):
+    headers = auth_headers(test_user)
+    assert client.get("/todos/", headers=headers).status_code == 200
+    assert client.get("/todos/", headers=headers).status_code == 200
+    assert token_cache.stats()["hits"] >= 1
+
+    body = client.get("/metrics").text
+    hits = token_cache.stats()["hits"]
+    assert f'cache_requests_total{{cache="token",result="hit"}} {hits}' in body
+
+
+def test_tampered_and_expired_tokens_are_rejected(client, test_user):
+    headers = auth_headers(test_user)
+    assert client.get("/todos/", headers=headers).status_code == 200
+    tampered = {"Authorization": headers["Authorization"][:-2] + "xx"}
+    assert client.get("/todos/", headers=tampered).status_code == 401
+
+    expired = create_access_token(
+        test_user.username, test_user.id, test_user.role, timedelta(seconds=-1)
+    )
+    response = client.get("/todos/", headers={"Authorization": f"Bearer {expired}"})
+    assert response.status_code == 401
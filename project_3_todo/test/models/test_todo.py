@@ -1,4 +1,62 @@
 # Auto-generated test for app.models.todo
+from contextlib import contextmanager
+
+import pytest
+from sqlalchemy import event
+
+from app.core.database import engine
+from app.core.pagination import encode_cursor
+from app.services import admin_service, todo_service
+
+ADMIN = {"id": 0, "role": "admin"}
+
+# Các query nóng: phải đi qua index, không được SCAN cả bảng todos
+HOT_QUERIES = {
+    "get_all_todos": lambda db, uid, tid: todo_service.get_all_todos(db, uid),
+    "get_todo_by_id": lambda db, uid, tid: todo_service.get_todo_by_id(db, uid, tid),
+    "page_by_id": lambda db, uid, tid: todo_service.get_todos_page(
+        db, uid, 10, encode_cursor("id", [tid])
+    ),
+    "page_by_priority": lambda db, uid, tid: todo_service.get_todos_page(
+        db, uid, 10, encode_cursor("priority", [1, tid]), "priority"
+    ),
+    "admin_page_by_priority": lambda db, uid, tid: (
+        admin_service.get_todos_page_as_admin(
+            ADMIN, db, 10, encode_cursor("priority", [1, tid]), "priority"
+        )
+    ),
+}
+
 
 def test_placeholder():
     assert True
+
+
+@contextmanager
+def captured_selects():
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, many):
+        if statement.lstrip().upper().startswith("SELECT"):
+            statements.append((statement, parameters))
+
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)
+
+
+@pytest.mark.parametrize("name", sorted(HOT_QUERIES))
+def test_hot_query_uses_index(db, test_todo, name):
+    with captured_selects() as statements:
+        HOT_QUERIES[name](db, test_todo.owner_id, test_todo.id)
+    assert statements
+
+    for statement, parameters in statements:
+        plan = db.connection().exec_driver_sql(
+            f"EXPLAIN QUERY PLAN {statement}", parameters
+        )
+        details = [row[-1] for row in plan]
+        scans = [detail for detail in details if detail.startswith("SCAN todos")]
+        assert not scans, f"{name} falls back to a table scan: {details}"
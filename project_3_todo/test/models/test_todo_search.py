@@ -0,0 +1,38 @@
+from sqlalchemy import insert
+
+from app.models import Todos
+from app.services import todo_service
+
+
+def _search_ids(db, user_id: int, q: str) -> list[int]:
+    page = todo_service.search_todos(db, user_id, q, limit=100)
+    return [todo["id"] for todo in page["items"]]
+
+
+def test_bulk_core_inserts_are_indexed_by_triggers(db, test_user):
+    db.execute(
+        insert(Todos),
+        [
+            {
+                "title": f"report {index}",
+                "description": "quarterly",
+                "priority": 1,
+                "complete": False,
+                "owner_id": test_user.id,
+            }
+            for index in range(3)
+        ],
+    )
+    db.commit()
+    assert len(_search_ids(db, test_user.id, "quarter")) == 3
+
+
+def test_search_probes_fts_index_instead_of_scanning_todos(db, test_user, test_todo):
+    plan = db.connection().exec_driver_sql(
+        "EXPLAIN QUERY PLAN SELECT todos.id FROM todos "
+        "JOIN todos_fts ON todos_fts.rowid = todos.id "
+        "WHERE todos_fts MATCH 'owner_id:1 AND \"test\"*'"
+    )
+    details = [row[-1] for row in plan]
+    assert any("VIRTUAL TABLE INDEX" in detail for detail in details)
+    assert not any(detail.startswith("SCAN todos ") for detail in details)
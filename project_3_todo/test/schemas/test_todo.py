@@ -1,4 +1,19 @@
 # Auto-generated test for app.schemas.todo
+from app.models import Todos
+from app.schemas import TodoPage, TodoResponse
+
 
 def test_placeholder():
     assert True
+
+
+def test_todo_page_validates_orm_objects_and_dicts():
+    todo = Todos(
+        id=1, title="t" * 3, description="d" * 3, priority=1, complete=False, owner_id=1
+    )
+    page = TodoPage.model_validate(
+        {"items": [todo, TodoResponse.model_validate(todo).model_dump()]},
+        from_attributes=True,
+    )
+    assert [item.id for item in page.items] == [1, 1]
+    assert page.next_cursor is None
@@ -1,4 +1,12 @@
 # Auto-generated test for app.schemas.user
+from app.models import Users
+from app.schemas import UserResponse
+
 
 def test_placeholder():
     assert True
+
+
+def test_user_response_excludes_hashed_password():
+    user = Users(id=1, username="alice", email="a@example.com", hashed_password="x")
+    assert "hashed_password" not in UserResponse.model_validate(user).model_dump()
@@ -1,4 +1,32 @@
 # Auto-generated test for app.services.admin_service
+import pytest
+
+from app.services import admin_service
+
 
 def test_placeholder():
     assert True
+
+
+@pytest.mark.parametrize("use_orjson", [True, False])
+@pytest.mark.parametrize("export_format", ["ndjson", "csv"])
+def test_export_chunks_are_always_bytes(monkeypatch, use_orjson, export_format):
+    if use_orjson:
+        pytest.importorskip("orjson")
+    else:
+        monkeypatch.setattr(admin_service, "orjson", None)
+    rows = [(1, "sữa", "desc", 3, False, 1)]
+    chunks = [
+        admin_service.export_header(export_format),
+        admin_service.format_export_rows(rows, export_format),
+    ]
+    assert all(isinstance(chunk, bytes) for chunk in chunks)
+    assert "sữa" in b"".join(chunks).decode()
+
+
+def test_ndjson_export_does_not_depend_on_orjson(monkeypatch):
+    pytest.importorskip("orjson")
+    rows = [(1, "sữa", None, 3, True, 1)]
+    with_orjson = admin_service.format_export_rows(rows, "ndjson")
+    monkeypatch.setattr(admin_service, "orjson", None)
+    assert admin_service.format_export_rows(rows, "ndjson") == with_orjson
@@ -0,0 +1,112 @@
+import asyncio
+import threading
+
+import pytest
+from fastapi import HTTPException
+
+from app.core.cache import RedisCache
+from app.core.database import SessionLocal, get_async_sessionmaker
+from app.core.events import EventBroker, RedisEventBackend
+from app.core.metrics import metrics
+from app.schemas.todo import TodoRequest
+from app.services import async_todo_service, todo_service
+from test.core.test_cache import ThreadRecordingRedis
+
+
+def _run(coro_fn):
+    async def runner():
+        async with get_async_sessionmaker()() as session:
+            return await coro_fn(session)
+
+    return asyncio.run(runner())
+
+
+def test_get_all_todos_with_async_session(test_user, test_todo):
+    todos = _run(lambda s: async_todo_service.get_all_todos(s, test_user.id))
+    assert [todo["id"] for todo in todos] == [test_todo.id]
+
+
+def test_create_todo_with_async_session(test_user):
+    todo_data = TodoRequest(
+        title="Async todo", description="Created via AsyncSession", priority=1
+    )
+    todo = _run(lambda s: async_todo_service.create_todo(s, test_user.id, todo_data))
+    assert todo.id is not None
+    assert todo.owner_id == test_user.id
+
+
+def test_missing_todo_raises_404_with_async_session(test_user):
+    with pytest.raises(HTTPException) as exc:
+        _run(lambda s: async_todo_service.get_todo_by_id(s, test_user.id, 999))
+    assert exc.value.status_code == 404
+
+
+def test_sync_session_runs_in_threadpool(db, test_user, test_todo):
+    todos = asyncio.run(async_todo_service.get_all_todos(db, test_user.id))
+    assert [todo["id"] for todo in todos] == [test_todo.id]
+
+
+@pytest.mark.parametrize("mode", ["sync", "async"])
+def test_concurrent_reads_share_one_query(mode, test_user, test_todo):
+    make_session = SessionLocal if mode == "sync" else get_async_sessionmaker()
+    sessions = [make_session() for _ in range(4)]
+    metrics.reset()
+
+    async def concurrent_reads():
+        try:
+            return await asyncio.gather(
+                *[
+                    async_todo_service.get_todos_page(session, test_user.id, 10)
+                    for session in sessions
+                ]
+            )
+        finally:
+            for session in sessions:
+                closed = session.close()
+                if mode == "async":
+                    await closed
+
+    pages = asyncio.run(concurrent_reads())
+    assert all(page == pages[0] for page in pages)
+    assert metrics.single_flight == {
+        ("get_todos_page", "executed"): 1,
+        ("get_todos_page", "collapsed"): 3,
+    }
+
+
+def test_redis_cache_io_stays_off_the_event_loop(monkeypatch, test_user, test_todo):
+    client = ThreadRecordingRedis()
+    monkeypatch.setattr(todo_service, "todo_cache", RedisCache(client))
+    todo_data = TodoRequest(title="Async todo", description="desc", priority=1)
+
+    async def read_and_write(session):
+        loop_thread = threading.get_ident()
+        await async_todo_service.get_todo_by_id(session, test_user.id, test_todo.id)
+        await async_todo_service.create_todo(session, test_user.id, todo_data)
+        return loop_thread
+
+    loop_thread = _run(read_and_write)
+    assert client.threads and loop_thread not in client.threads
+
+
+class ThreadRecordingPublisher:
+    def __init__(self):
+        self.threads = set()
+
+    def publish(self, channel, data):
+        self.threads.add(threading.get_ident())
+
+
+def test_redis_publish_stays_off_the_event_loop(monkeypatch, test_user):
+    client = ThreadRecordingPublisher()
+    monkeypatch.setattr(
+        todo_service, "event_broker", EventBroker(RedisEventBackend(client))
+    )
+    todo_data = TodoRequest(title="Async todo", description="desc", priority=1)
+
+    async def create(session):
+        await async_todo_service.create_todo(session, test_user.id, todo_data)
+        return threading.get_ident()
+
+    loop_thread = _run(create)
+    assert client.threads and loop_thread not in client.threads
@@ -0,0 +1,156 @@
+import csv
+import json
+
+import pytest
+
+from app.models import TodoChanges, Todos, TodoStats
+from app.services import todo_import_service, todo_service
+
+
+def _write(tmp_path, name: str, content) -> str:
+    path = tmp_path / name
+    if isinstance(content, bytes):
+        path.write_bytes(content)
+    else:
+        path.write_text(content, encoding="utf-8")
+    return str(path)
+
+
+def _todo(title: str, priority: int = 2, **extra) -> dict:
+    return {"title": title, "description": "desc", "priority": priority, **extra}
+
+
+def test_records_are_parsed_and_validated_per_row(tmp_path):
+    lines = [
+        json.dumps(_todo("good")),
+        "",
+        "{not json",
+        "[1, 2]",
+        json.dumps(_todo("no", priority=9)),
+    ]
+    # Byte không phải UTF-8 chỉ làm hỏng dòng chứa nó
+    content = "\n".join(lines).encode() + b"\n\xff\xfe\n"
+    path = _write(tmp_path, "todos.jsonl", content)
+    records = list(todo_import_service.iter_import_records(path, "jsonl"))
+    items, errors = todo_import_service.validate_import_chunk(records)
+
+    assert [item.title for item in items] == ["good"]
+    # Dòng trống không được đánh số
+    assert [row for row, _ in errors] == [2, 3, 4, 5]
+    assert errors[0][1].startswith("Invalid JSON")
+    assert errors[1][1] == "Expected a JSON object"
+    assert errors[2][1].startswith("title:") and "priority:" in errors[2][1]
+    assert errors[3][1].startswith("Invalid JSON")
+
+
+def test_csv_uses_header_and_defaults_for_empty_cells(tmp_path):
+    content = (
+        "﻿title,description,priority,complete\nfirst,desc,1,\nsecond,desc,5,true\n"
+    )
+    path = _write(tmp_path, "todos.csv", content)
+    records = list(todo_import_service.iter_import_records(path, "csv"))
+    items, errors = todo_import_service.validate_import_chunk(records)
+
+    assert errors == []
+    assert [(item.title, item.priority, item.complete) for item in items] == [
+        ("first", 1, False),
+        ("second", 5, True),
+    ]
+
+
+def test_run_import_inserts_in_chunks_and_tracks_progress(db, test_user, tmp_path):
+    uid = test_user.id
+    lines = [json.dumps(_todo(f"todo {i}", priority=1 + i % 2)) for i in range(5)]
+    lines.insert(2, json.dumps(_todo("x")))
+    path = _write(tmp_path, "todos.jsonl", "\n".join(lines))
+    job = todo_import_service.create_import(db, uid, "jsonl", 1)
+    assert job["status"] == "pending"
+
+    todo_import_service.run_import(job["id"], path, chunk_size=2)
+
+    job = todo_import_service.get_import(db, uid, job["id"])
+    assert job["status"] == "completed" and job["finished_at"] is not None
+    assert (job["rows_processed"], job["rows_imported"], job["rows_failed"]) == (
+        6,
+        5,
+        1,
+    )
+    assert [error["row"] for error in job["errors"]] == [3]
+    assert db.query(Todos).filter(Todos.owner_id == uid).count() == 5
+    assert db.query(TodoChanges).filter(TodoChanges.owner_id == uid).count() == 5
+    assert {(row.priority, row.count) for row in db.query(TodoStats)} == {
+        (1, 3),
+        (2, 2),
+    }
+    # File tạm được xóa sau khi import xong
+    assert not (tmp_path / "todos.jsonl").exists()
+
+
+@pytest.fixture
+def small_csv_fields():
+    previous = csv.field_size_limit(100)
+    yield
+    csv.field_size_limit(previous)
+
+
+def test_csv_bad_rows_are_reported_and_skipped(tmp_path, small_csv_fields):
+    content = (
+        b"title,description,priority\n"
+        b"first,desc,1\n"
+        b"bad \xff byte,desc,1\n"
+        b"too long," + b"x" * 200 + b",1\n"
+        b"last,desc,2\n"
+    )
+    path = _write(tmp_path, "todos.csv", content)
+    records = list(todo_import_service.iter_import_records(path, "csv"))
+    items, errors = todo_import_service.validate_import_chunk(records)
+
+    assert [item.title for item in items] == ["first", "last"]
+    assert errors[0] == (2, "Invalid UTF-8")
+    assert errors[1][0] == 3 and errors[1][1].startswith("Invalid CSV")
+
+
+def test_run_import_publishes_created_todos(db, test_user, tmp_path, monkeypatch):
+    events = []
+    monkeypatch.setattr(
+        todo_import_service,
+        "publish_todo_event",
+        lambda *args: events.append(args),
+    )
+    path = _write(tmp_path, "todos.jsonl", json.dumps(_todo("imported")))
+    job = todo_import_service.create_import(db, test_user.id, "jsonl", 1)
+
+    todo_import_service.run_import(job["id"], path)
+
+    # Cùng dạng với event "created" của POST /todos/todo và bulk create
+    [(owner_id, event_type, ids, todos)] = events
+    todo = db.query(Todos).filter(Todos.owner_id == test_user.id).one()
+    assert (owner_id, event_type, ids) == (test_user.id, "created", [todo.id])
+    assert todos == [todo_service.todo_to_dict(todo)]
+
+
+def test_run_import_keeps_committed_chunks_when_job_fails(
+    db, test_user, tmp_path, monkeypatch
+):
+    uid = test_user.id
+    rows = "".join(f"todo {i},desc,2\n" for i in range(1000))
+    path = _write(tmp_path, "todos.csv", f"title,description,priority\n{rows}")
+    job = todo_import_service.create_import(db, uid, "csv", 1)
+
+    insert_chunk = todo_import_service.insert_import_chunk
+    calls = []
+
+    def fail_on_third_chunk(*args):
+        calls.append(args)
+        if len(calls) == 3:
+            raise RuntimeError("disk I/O error")
+        return insert_chunk(*args)
+
+    monkeypatch.setattr(todo_import_service, "insert_import_chunk", fail_on_third_chunk)
+    todo_import_service.run_import(job["id"], path, chunk_size=100)
+
+    # Hai chunk đầu đã được commit
+    job = todo_import_service.get_import(db, uid, job["id"])
+    assert job["status"] == "failed" and job["error"] == "disk I/O error"
+    imported = db.query(Todos).filter(Todos.owner_id == uid).count()
+    assert imported == 200 and job["rows_imported"] == imported
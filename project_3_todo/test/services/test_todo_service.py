@@ -1,4 +1,328 @@
 # Auto-generated test for app.services.todo_service
+from datetime import timedelta
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import text
+from sqlalchemy.dialects import postgresql
+
+from app.core import query_log
+from app.core.cache import MemoryCache, RedisCache
+from app.core.metrics import metrics
+from app.core.query_log import track_queries
+from app.models import TodoStats
+from app.models.todo_change import TodoChangeWatermarks, utcnow
+from app.schemas import TodoBulkUpdateItem, TodoRequest
+from app.services import admin_service, todo_service
+from test.core.test_cache import LocalRedis
+
 
 def test_placeholder():
     assert True
+
+
+@pytest.fixture(params=["memory", "redis"])
+def cache_backend(request, monkeypatch):
+    backend = (
+        MemoryCache(100) if request.param == "memory" else RedisCache(LocalRedis())
+    )
+    monkeypatch.setattr(todo_service, "todo_cache", backend)
+    return backend
+
+
+def test_reads_are_served_from_cache(cache_backend, db, test_user, test_todo):
+    todo_service.get_todo_by_id(db, test_user.id, test_todo.id)
+    todo_service.get_all_todos(db, test_user.id)
+    todo_service.get_todo_by_id(db, test_user.id, test_todo.id)
+    todo_service.get_all_todos(db, test_user.id)
+    assert todo_service.todo_cache_stats.as_dict()["hits"] == 2
+    body = metrics.render()
+    assert 'cache_requests_total{cache="todo",result="hit"} 2' in body
+    assert 'cache_requests_total{cache="todo",result="miss"} 2' in body
+
+
+def test_writes_invalidate_cached_reads(cache_backend, db, test_user, test_todo):
+    assert todo_service.get_todo_by_id(db, test_user.id, test_todo.id)["priority"] == 3
+    assert len(todo_service.get_all_todos(db, test_user.id)) == 1
+
+    update = TodoRequest(title="Updated", description="Updated todo", priority=5)
+    todo_service.update_todo(db, test_user.id, test_todo.id, update)
+    assert todo_service.get_todo_by_id(db, test_user.id, test_todo.id)["priority"] == 5
+
+    todo_service.create_todo(db, test_user.id, update)
+    assert len(todo_service.get_all_todos(db, test_user.id)) == 2
+
+    todo_service.delete_todo(db, test_user.id, test_todo.id)
+    assert len(todo_service.get_all_todos(db, test_user.id)) == 1
+    with pytest.raises(HTTPException):
+        todo_service.get_todo_by_id(db, test_user.id, test_todo.id)
+
+
+def test_read_racing_a_write_cannot_repopulate_item(
+    cache_backend, db, test_user, test_todo
+):
+    uid, todo_id = test_user.id, test_todo.id
+    stale = todo_service.todo_to_dict(test_todo)
+    update = TodoRequest(title="Updated", description="Updated todo", priority=5)
+
+    def load_then_concurrent_write():
+        # Lần đọc đã lấy dòng cũ, lần ghi commit + invalidate trước khi set cache
+        todo_service.update_todo(db, uid, todo_id, update)
+        return stale
+
+    todo_service._cached(db, uid, None, ("item", todo_id), load_then_concurrent_write)
+    assert todo_service.get_todo_by_id(db, uid, todo_id)["priority"] == 5
+
+
+def test_cache_is_keyed_by_version_shared_with_other_workers(
+    cache_backend, db, test_user, test_todo
+):
+    uid, todo_id = test_user.id, test_todo.id
+    assert todo_service.get_todo_by_id(db, uid, todo_id)["priority"] == 3
+
+    # Worker khác ghi: không gọi invalidate_todo_cache trong process này
+    db.execute(text("UPDATE todos SET priority = 5 WHERE id = :id"), {"id": todo_id})
+    todo_service.bump_todos_version(db, uid)
+    db.commit()
+
+    version = todo_service.get_todos_version(db, uid)
+    assert todo_service.get_todo_by_id(db, uid, todo_id, version)["priority"] == 5
+    assert todo_service.get_todo_by_id(db, uid, todo_id)["priority"] == 5
+
+
+def test_admin_delete_invalidates_owner_cache(cache_backend, db, test_user, test_todo):
+    assert len(todo_service.get_all_todos(db, test_user.id)) == 1
+    admin_service.delete_todo_as_admin({"role": "admin"}, test_todo.id, db)
+    assert todo_service.get_all_todos(db, test_user.id) == []
+
+
+def _stats_snapshot(db) -> set:
+    return {
+        (row.owner_id, row.priority, row.complete, row.count)
+        for row in db.query(TodoStats)
+    }
+
+
+def test_stats_are_maintained_incrementally(db, test_user, admin_user):
+    uid = test_user.id
+    low = TodoRequest(title="low", description="desc", priority=1)
+    high = TodoRequest(title="high", description="desc", priority=5, complete=True)
+
+    first = todo_service.create_todo(db, uid, low)
+    todo_service.create_todo(db, uid, low)
+    todo_service.update_todo(db, uid, first.id, high)
+    created = todo_service.bulk_create_todos(db, uid, [low, high, high])
+    todo_service.bulk_update_todos(
+        db,
+        uid,
+        [
+            TodoBulkUpdateItem(id=created[0]["id"], **high.model_dump()),
+            TodoBulkUpdateItem(id=created[0]["id"], **low.model_dump()),
+            TodoBulkUpdateItem(id=9999, **low.model_dump()),
+        ],
+    )
+    todo_service.bulk_delete_todos(db, uid, [created[1]["id"], 9999])
+    todo_service.delete_todo(db, uid, first.id)
+    admin_service.delete_todo_as_admin({"role": "admin"}, created[2]["id"], db)
+
+    assert _stats_snapshot(db) == {(uid, 1, False, 2)}
+    todo_service.rebuild_todo_stats(db)
+    assert _stats_snapshot(db) == {(uid, 1, False, 2)}
+
+
+def test_rebuild_recomputes_from_todos(db, test_user, test_todo):
+    # test_todo được thêm thẳng vào database, không qua service
+    assert _stats_snapshot(db) == set()
+    assert todo_service.rebuild_todo_stats(db) == 1
+    assert _stats_snapshot(db) == {(test_user.id, test_todo.priority, False, 1)}
+
+
+def _sync(db, user_id: int, since=None, limit=500):
+    page = todo_service.get_todo_changes(db, user_id, since, limit)
+    ops = {change["todo_id"]: change["op"] for change in page["changes"]}
+    return page, ops
+
+
+def test_change_log_collapses_to_latest_state(db, test_user, admin_user):
+    uid = test_user.id
+    data = TodoRequest(title="sync", description="desc", priority=2)
+
+    page, ops = _sync(db, uid)
+    assert ops == {} and not page["has_more"]
+    cursor = page["next_cursor"]
+
+    kept = todo_service.create_todo(db, uid, data)
+    gone = todo_service.create_todo(db, uid, data)
+    todo_service.update_todo(db, uid, kept.id, data)
+    todo_service.delete_todo(db, uid, gone.id)
+    todo_service.create_todo(db, admin_user.id, data)
+
+    page, ops = _sync(db, uid, cursor)
+    # Todo tạo rồi xóa trong cùng khoảng => tombstone, todo của user khác bị loại
+    assert ops == {kept.id: "upsert", gone.id: "delete"}
+    assert page["changes"][0]["todo"]["title"] == "sync"
+    assert _sync(db, uid, page["next_cursor"])[1] == {}
+
+    # limit nhỏ: đi hết log qua nhiều trang
+    page, ops = _sync(db, uid, cursor, limit=1)
+    assert page["has_more"] and len(ops) == 1
+
+
+def test_compaction_forces_stale_cursors_to_resync(db, test_user):
+    uid = test_user.id
+    data = TodoRequest(title="sync", description="desc", priority=2)
+    stale = _sync(db, uid)[0]["next_cursor"]
+    todo = todo_service.create_todo(db, uid, data)
+    fresh = _sync(db, uid)[0]["next_cursor"]
+
+    assert todo_service.compact_todo_changes(db, utcnow() + timedelta(hours=1)) == 1
+
+    page, ops = _sync(db, uid, stale)
+    assert page["resync_required"] and ops == {}
+    # Cursor mới sau resync (và cursor đã qua watermark) tiếp tục bình thường
+    for cursor in (page["next_cursor"], fresh):
+        page, ops = _sync(db, uid, cursor)
+        assert not page["resync_required"] and ops == {}
+
+    todo_service.delete_todo(db, uid, todo.id)
+    assert _sync(db, uid, fresh)[1] == {todo.id: "delete"}
+
+
+def test_compaction_watermark_never_moves_backwards(db, test_user):
+    uid = test_user.id
+    data = TodoRequest(title="sync", description="desc", priority=2)
+    old = todo_service.create_todo(db, uid, data)
+    db.execute(
+        text("UPDATE todo_changes SET changed_at = :at WHERE todo_id = :id"),
+        {"at": utcnow() - timedelta(days=2), "id": old.id},
+    )
+    db.commit()
+    todo_service.create_todo(db, uid, data)
+
+    # Lần compact với retention ngắn hơn (chạy song song) đã commit trước
+    db.add(TodoChangeWatermarks(owner_id=uid, compacted_through=1000))
+    db.commit()
+    assert todo_service.compact_todo_changes(db, utcnow() - timedelta(days=1)) == 1
+    assert db.get(TodoChangeWatermarks, uid).compacted_through == 1000
+
+
+def test_single_statement_writes_decide_404_from_returning(db, test_user, admin_user):
+    uid = test_user.id
+    data = TodoRequest(title="mine", description="desc", priority=2)
+    todo = todo_service.create_todo(db, uid, data)
+    todo_id = todo.id
+    version = todo_service.get_todos_version(db, uid)
+
+    # Todo của người khác => 404, không ghi gì (version giữ nguyên)
+    for write in (
+        lambda: todo_service.update_todo(db, admin_user.id, todo_id, data),
+        lambda: todo_service.delete_todo(db, admin_user.id, todo_id),
+    ):
+        with pytest.raises(HTTPException) as exc_info:
+            write()
+        assert exc_info.value.status_code == 404
+        db.rollback()
+    assert todo_service.get_todos_version(db, uid) == version
+
+    query_log.install()
+    updated = todo_service.update_todo(
+        db, uid, todo_id, TodoRequest(title="new", description="desc", priority=4)
+    )
+    assert (updated["title"], updated["priority"]) == ("new", 4)
+    assert _stats_snapshot(db) == {(uid, 4, False, 1)}
+
+    # Xóa: DELETE ... RETURNING, không SELECT todo trước
+    other_id = todo_service.create_todo(db, uid, data).id
+    for delete in (
+        lambda: todo_service.delete_todo(db, uid, todo_id),
+        lambda: admin_service.delete_todo_as_admin({"role": "admin"}, other_id, db),
+    ):
+        with track_queries() as tracker:
+            delete()
+        todo_statements = [
+            s for s in tracker.statements if "todos" in s.split("WHERE")[0]
+        ]
+        assert len(todo_statements) == 1
+        assert todo_statements[0].startswith("DELETE FROM todos")
+        assert "RETURNING" in todo_statements[0]
+    assert _stats_snapshot(db) == set()
+
+
+def test_bulk_update_takes_write_lock_before_reading_old_values(
+    db, test_user, admin_user
+):
+    uid = test_user.id
+    data = TodoRequest(title="mine", description="desc", priority=2)
+    todo_id = todo_service.create_todo(db, uid, data).id
+    item = TodoBulkUpdateItem(id=todo_id, **data.model_dump() | {"priority": 5})
+
+    # Không có todo nào của owner => không bump version
+    result = todo_service.bulk_update_todos(db, admin_user.id, [item])
+    assert result == [{"id": todo_id, "status": "not_found"}]
+    assert todo_service.get_todos_version(db, admin_user.id) == 0
+
+    query_log.install()
+    version = todo_service.get_todos_version(db, uid)
+    with track_queries() as tracker:
+        todo_service.bulk_update_todos(db, uid, [item])
+    # Bump (giữ write lock) trước SELECT giá trị cũ
+    assert tracker.statements[0].startswith("INSERT INTO todo_versions")
+    assert todo_service.get_todos_version(db, uid) == version + 1
+    assert _stats_snapshot(db) == {(uid, 5, False, 1)}
+
+
+def test_update_takes_write_lock_before_reading_old_values(db, test_user):
+    uid = test_user.id
+    data = TodoRequest(title="mine", description="desc", priority=2)
+    todo_id = todo_service.create_todo(db, uid, data).id
+    version = todo_service.get_todos_version(db, uid)
+
+    query_log.install()
+    with track_queries() as tracker:
+        todo_service.update_todo(
+            db, uid, todo_id, TodoRequest(title="new", description="desc", priority=4)
+        )
+    # Bump (giữ write lock) trước SELECT giá trị cũ => đúng một lần bump
+    assert tracker.statements[0].startswith("INSERT INTO todo_versions")
+    assert sum("todo_versions" in s for s in tracker.statements) == 1
+    assert todo_service.get_todos_version(db, uid) == version + 1
+
+    # Todo đã bị xóa => 404, version giữ nguyên
+    todo_service.delete_todo(db, uid, todo_id)
+    version = todo_service.get_todos_version(db, uid)
+    with pytest.raises(HTTPException) as exc_info:
+        todo_service.update_todo(db, uid, todo_id, data)
+    assert exc_info.value.status_code == 404
+    assert todo_service.get_todos_version(db, uid) == version
+
+
+def test_postgres_update_returns_old_values_in_one_statement():
+    stmt = todo_service.update_todo_with_old_statement(1, 2, {"priority": 3})
+    sql = str(stmt.compile(dialect=postgresql.dialect()))
+    assert sql.startswith('WITH "old" AS')
+    assert "FOR UPDATE" in sql and 'FROM "old"' in sql
+    assert '"old".priority AS old_priority' in sql
+
+
+def test_search_checks_owner_on_the_todo_row(db, test_user, admin_user):
+    data = TodoRequest(title="milk", description="admin only", priority=1)
+    other = todo_service.create_todo(db, admin_user.id, data)
+    # Index lệch với bảng todos (vd. bị sửa tay): owner trong FTS là alice
+    row = {"id": other.id, "admin": admin_user.id, "alice": test_user.id}
+    db.execute(
+        text(
+            "INSERT INTO todos_fts(todos_fts, rowid, title, description, owner_id) "
+            "VALUES ('delete', :id, 'milk', 'admin only', :admin)"
+        ),
+        row,
+    )
+    db.execute(
+        text(
+            "INSERT INTO todos_fts(rowid, title, description, owner_id) "
+            "VALUES (:id, 'milk', 'admin only', :alice)"
+        ),
+        row,
+    )
+    db.commit()
+
+    assert todo_service.search_todos(db, test_user.id, "milk", 10)["items"] == []